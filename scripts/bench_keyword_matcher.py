@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+import argparse
+import json
+import random
+import time
+
+from ultimate_crawler.relevance.keyword_matcher import KeywordMatcher
+
+WINE_WORDS = ["vin", "wine", "vino", "葡萄酒", "cépage", "merlot", "cabernet", "tannins", "millésime", "terroir"]
+
+
+def _keywords(n: int, rng: random.Random):
+    letters = "abcdefghijklmnopqrstuvwxyzéè"
+    words = list(WINE_WORDS)
+    while len(words) < n:
+        words.append("".join(rng.choice(letters) for _ in range(rng.randint(4, 12))))
+    return words[:n]
+
+
+def _docs(n: int, chars: int, rng: random.Random):
+    vocab = [
+        "le", "de", "la", "et", "vin", "vinyl", "divine", "rouge", "match", "stade", "wine", "the", "of",
+        "merlot", "fût", "chêne", "这款葡萄酒很好", "football", "score", "terroir", "prix", "livraison",
+    ]
+    for _ in range(n):
+        words = []
+        size = 0
+        while size < chars:
+            w = rng.choice(vocab)
+            words.append(w)
+            size += len(w) + 1
+        yield " ".join(words)
+
+
+def _count_scan(keywords, text):
+    # ancien KeywordRelevanceFilter : un str.count par mot-clé, sans frontières
+    t = text.lower()
+    return sum(t.count(kw) for kw in keywords)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="KeywordMatcher engines (one regex per keyword, Aho-Corasick automaton) "
+                    "vs one str.count per keyword."
+    )
+    parser.add_argument("-k", "--keywords", type=int, nargs="+", default=[4, 7, 16, 32, 64, 100, 1000, 5000],
+                        help="Keyword list sizes.")
+    parser.add_argument("-n", "--num-docs", type=int, default=200, help="Number of documents.")
+    parser.add_argument("--chars", type=int, default=20000, help="Characters per document.")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    docs = list(_docs(args.num_docs, args.chars, rng))
+    for k in args.keywords:
+        keywords = _keywords(k, rng)
+        t = time.time()
+        hits_count = sum(_count_scan(keywords, d) for d in docs)
+        res = {
+            "keywords": k,
+            "count_docs_per_s": round(len(docs) / (time.time() - t), 1),
+            "hits_count": hits_count,  # sous-chaînes : "vin" dans "vinyl", "divine"
+        }
+        for engine in ("regex", "automaton"):
+            t = time.time()
+            matcher = KeywordMatcher(keywords, engine=engine)
+            build_s = time.time() - t
+            t = time.time()
+            hits = sum(sum(matcher.count_ids(d)) for d in docs)
+            res[f"{engine}_build_s"] = round(build_s, 3)
+            res[f"{engine}_docs_per_s"] = round(len(docs) / (time.time() - t), 1)
+            res[f"hits_{engine}"] = hits  # mots entiers
+        res["auto"] = KeywordMatcher(keywords).engine
+        print(json.dumps(res))
+
+
+if __name__ == "__main__":
+    main()
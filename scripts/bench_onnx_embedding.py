@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ultimate_crawler.config.loader import load_job_config
+
+
+def _rss_mb() -> float:
+    # pic de RSS du process (Linux : ru_maxrss en Kio)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _synthetic_docs(n: int):
+    paras = [
+        "Le vin rouge de Bordeaux assemble merlot et cabernet sauvignon, élevé en fût de chêne.",
+        "This Napa Valley wine shows dark fruit, firm tannins and a long oak-driven finish.",
+        "El vino de Rioja se elabora con tempranillo y envejece en barricas de roble americano.",
+        "葡萄酒的酿造需要经过发酵、陈酿和装瓶等多个步骤。",
+        "Le match de football s'est terminé sur un score nul après prolongations.",
+        "The new smartphone has a faster processor and a larger battery than last year.",
+    ]
+    for i in range(n):
+        k = 1 + i % 7
+        yield " ".join(paras[(i + j) % len(paras)] for j in range(k)) + f" ({i})"
+
+
+def _load_docs(path: Path, n: int):
+    docs = []
+    if path.is_file():
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                text = json.loads(line).get("text")
+                if text:
+                    docs.append(text)
+                if len(docs) >= n:
+                    break
+    return docs
+
+
+def _run_one(backend: str, args, docs, out: Path) -> dict:
+    from ultimate_crawler.relevance.embedding_model import EmbeddingRelevanceModel, snippet_of
+
+    cfg = load_job_config(args.config)
+    rcfg = cfg.relevance
+    base = _rss_mb()
+    t = time.time()
+    encoder = None
+    if backend == "onnx":
+        from ultimate_crawler.relevance.onnx_encoder import OnnxSentenceEncoder
+
+        encoder = OnnxSentenceEncoder(
+            args.onnx or rcfg.onnx_model_path,
+            threads=rcfg.onnx_threads if args.threads is None else args.threads,
+            pad_bucket=rcfg.onnx_pad_bucket,
+        )
+    elif args.threads:
+        import torch
+
+        torch.set_num_threads(args.threads)
+    model = EmbeddingRelevanceModel(rcfg.embedding_model_name, cfg.keywords, encoder=encoder)
+    load_s = time.time() - t
+
+    # chauffe
+    model.score_batch(docs[: args.batch])
+    t = time.time()
+    scores = []
+    for i in range(0, len(docs), args.batch):
+        scores.extend(model.score_batch(docs[i:i + args.batch]))
+    elapsed = time.time() - t
+    rss_mb = _rss_mb() - base
+    np.save(out, np.asarray(scores, dtype=np.float64))
+    # vecteurs des documents (hors chrono) : cosinus torch / ONNX document par document
+    snippets = [snippet_of(d) for d in docs]
+    np.save(
+        out.with_suffix(".emb.npy"),
+        np.vstack([model.embed(snippets[i:i + args.batch]) for i in range(0, len(snippets), args.batch)]),
+    )
+    return {
+        "backend": backend,
+        "docs": len(docs),
+        "load_s": round(load_s, 1),
+        "docs_per_s": round(len(docs) / elapsed, 1),
+        "ms_per_doc": round(1000 * elapsed / len(docs), 2),
+        "rss_mb": round(rss_mb, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Parity (same pages kept) and throughput: torch vs ONNX int8 embedding backends "
+                    "(one subprocess per backend)."
+    )
+    parser.add_argument("-c", "--config", required=True, help="Job config YAML (model, keywords, threshold).")
+    parser.add_argument("--docs", help="JSONL with a 'text' field (default: the job's raw pages file).")
+    parser.add_argument("-n", "--num-docs", type=int, default=500, help="Number of documents.")
+    parser.add_argument("--batch", type=int, default=32, help="Documents per score_batch call.")
+    parser.add_argument("--onnx", help="ONNX model path (default: relevance.onnx_model_path).")
+    parser.add_argument("--threads", type=int, help="Inference threads for both backends.")
+    parser.add_argument("--threshold", type=float,
+                        help="Keep/drop threshold for the agreement (default: relevance.relevance_threshold).")
+    parser.add_argument("--min-cosine", type=float, default=0.98, help="Parity: min torch/ONNX embedding cosine.")
+    parser.add_argument("--max-abs-diff", type=float, default=0.05, help="Parity: max |score difference|.")
+    parser.add_argument("--max-flip-rate", type=float, default=0.01, help="Parity: max share of keep/drop flips.")
+    parser.add_argument("--_child", help=argparse.SUPPRESS)
+    parser.add_argument("--_out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    cfg = load_job_config(args.config)
+    docs_path = Path(args.docs) if args.docs else cfg.output.dir / cfg.output.raw_pages_file
+    docs = _load_docs(docs_path, args.num_docs) or list(_synthetic_docs(args.num_docs))
+
+    if args._child:
+        print(json.dumps(_run_one(args._child, args, docs, Path(args._out))))
+        return
+
+    print(f"{len(docs)} documents from {docs_path if docs_path.is_file() else 'synthetic texts'}")
+    scores, embs = {}, {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in ("torch", "onnx"):
+            out = Path(tmp) / f"{backend}.npy"
+            cmd = [sys.executable, __file__, *sys.argv[1:], "--_child", backend, "--_out", str(out)]
+            res = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            print(res.stdout.strip().splitlines()[-1])
+            scores[backend] = np.load(out)
+            embs[backend] = np.load(out.with_suffix(".emb.npy"))
+
+    ref, new = scores["torch"], scores["onnx"]
+    # vecteurs normalisés : produit scalaire = cosinus
+    cos = np.sum(embs["torch"] * embs["onnx"], axis=1)
+    threshold = cfg.relevance.relevance_threshold if args.threshold is None else args.threshold
+    diff = np.abs(ref - new)
+    flips = int(np.sum((ref >= threshold) != (new >= threshold)))
+    parity = {
+        "cosine_mean": round(float(cos.mean()), 4),
+        "cosine_p01": round(float(np.percentile(cos, 1)), 4),
+        "cosine_min": round(float(cos.min()), 4),
+        "max_abs_diff": round(float(diff.max()), 4),
+        "mean_abs_diff": round(float(diff.mean()), 4),
+        "pearson": round(float(np.corrcoef(ref, new)[0, 1]), 4),
+        "spearman": round(float(np.corrcoef(np.argsort(np.argsort(ref)), np.argsort(np.argsort(new)))[0, 1]), 4),
+        "threshold": threshold,
+        "kept_torch": int(np.sum(ref >= threshold)),
+        "kept_onnx": int(np.sum(new >= threshold)),
+        "flips": flips,
+        "agreement": round(1.0 - flips / len(ref), 4),
+    }
+    print(json.dumps(parity))
+
+    ok = (
+        parity["cosine_min"] >= args.min_cosine
+        and parity["max_abs_diff"] <= args.max_abs_diff
+        and flips <= args.max_flip_rate * len(ref)
+    )
+    print("PARITY OK" if ok else "PARITY FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+import argparse
+import json
+import time
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+
+from ultimate_crawler.crawl.page import Page
+from ultimate_crawler.crawl.parser import html_to_text
+
+BASE_URL = "https://www.example-wine-shop.com/catalogue/index.html"
+
+
+def _synthetic_pages(n: int, links_per_page: int):
+    para = (
+        "Le vin rouge de Bordeaux assemble merlot et cabernet sauvignon ; "
+        "la vinification en fût de chêne lui donne sa structure tannique. "
+    )
+    for i in range(n):
+        nav = "".join(
+            f'<li><a href="/catalogue/vins-rouges/page-{i}-{j}.html">Vin rouge {j}</a></li>'
+            for j in range(links_per_page)
+        )
+        body = "".join(f"<p>{para * 3} ({i}.{k})</p>" for k in range(12))
+        yield (
+            f"<!DOCTYPE html><html><head><title>Page {i}</title></head><body>"
+            f"<nav><ul>{nav}</ul></nav><article><h1>Bordeaux {i}</h1>{body}</article>"
+            f'<footer><a href="https://other.example.org/">ailleurs</a></footer></body></html>'
+        )
+
+
+def _html_files(directory: Path):
+    for path in sorted(directory.glob("*.htm*")):
+        yield path.read_text(encoding="utf-8", errors="replace")
+
+
+def _two_parses(html: str):
+    # ancien chemin : arbre BeautifulSoup pour les liens, puis trafilatura reparse
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "lxml")
+    base_domain = urlparse(BASE_URL).netloc
+    links = set()
+    for a in soup.find_all("a", href=True):
+        parsed = urlparse(urljoin(BASE_URL, a["href"].strip()))
+        if parsed.scheme in ("http", "https") and parsed.netloc == base_domain:
+            a.get_text(" ", strip=True)
+            if a.parent is not None:
+                a.parent.get_text(" ", strip=True)
+            links.add(parsed._replace(fragment="").geturl())
+    return len(links), html_to_text(html, url=BASE_URL)
+
+
+def _one_parse(html: str):
+    page = Page(BASE_URL, html)
+    return len(page.links()), page.text()
+
+
+def _bench(fn, pages) -> dict:
+    t = time.process_time()
+    nlinks = nchars = 0
+    for html in pages:
+        n, text = fn(html)
+        nlinks += n
+        nchars += len(text or "")
+    cpu = time.process_time() - t
+    return {"cpu_ms_per_page": round(cpu * 1000 / len(pages), 2), "links": nlinks, "text_chars": nchars}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="CPU per page: BeautifulSoup links + trafilatura (two parses) vs Page (one lxml parse)."
+    )
+    parser.add_argument("-n", "--pages", type=int, default=300, help="Number of synthetic pages.")
+    parser.add_argument("--links", type=int, default=150, help="Links per synthetic page.")
+    parser.add_argument("--html-dir", help="Benchmark real pages (*.html files) instead of synthetic ones.")
+    args = parser.parse_args()
+
+    if args.html_dir:
+        pages = list(_html_files(Path(args.html_dir)))
+    else:
+        pages = list(_synthetic_pages(args.pages, args.links))
+
+    # chauffe (imports, caches de trafilatura)
+    _two_parses(pages[0])
+    _one_parse(pages[0])
+
+    before = _bench(_two_parses, pages)
+    after = _bench(_one_parse, pages)
+    print(json.dumps({"pages": len(pages), "two_parses": before, "page": after}))
+    print(
+        f"CPU saved per page: {before['cpu_ms_per_page'] - after['cpu_ms_per_page']:.2f} ms "
+        f"({1 - after['cpu_ms_per_page'] / before['cpu_ms_per_page']:.0%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
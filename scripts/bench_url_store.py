@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+
+def _rss_mb() -> float:
+    # pic de RSS du process (Linux : ru_maxrss en Kio)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _urls(n: int):
+    for i in range(n):
+        yield f"https://www.example-wine-shop.com/catalogue/vins-rouges/bordeaux/page-{i}.html?ref=nav"
+
+
+def _run_one(kind: str, n: int, fp_rate: float) -> dict:
+    from ultimate_crawler.crawl.url_store import BloomURLStore, URLStateStore
+
+    base = _rss_mb()
+    if kind == "set_str":
+        store = set()
+        add = store.add
+    elif kind == "hash":
+        store = URLStateStore()
+        add = store.add
+    elif kind == "bloom":
+        store = BloomURLStore(n, fp_rate)
+        add = store.add
+    else:
+        raise ValueError(kind)
+
+    t = time.time()
+    for url in _urls(n):
+        add(url)
+    insert_s = time.time() - t
+
+    t = time.time()
+    hits = sum(1 for url in _urls(min(n, 1_000_000)) if url in store)
+    lookup_s = time.time() - t
+
+    return {
+        "store": kind,
+        "urls": n,
+        "rss_mb": round(_rss_mb() - base, 1),
+        "store_mb": round(store.nbytes / (1024 * 1024), 1) if hasattr(store, "nbytes") else None,
+        "bytes_per_url": round((_rss_mb() - base) * 1024 * 1024 / n, 1),
+        "insert_s": round(insert_s, 1),
+        "lookup_1M_s": round(lookup_s, 1),
+        "hits": hits,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Memory / speed benchmark of the seen-URL stores (one subprocess per store)."
+    )
+    parser.add_argument("-n", "--urls", type=int, default=10_000_000, help="Number of URLs.")
+    parser.add_argument("--fp-rate", type=float, default=0.001, help="Bloom false-positive rate.")
+    parser.add_argument(
+        "--stores",
+        default="set_str,hash,bloom",
+        help="Comma-separated stores to benchmark (set_str, hash, bloom).",
+    )
+    parser.add_argument("--_child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args._child:
+        print(json.dumps(_run_one(args._child, args.urls, args.fp_rate)))
+        return
+
+    for kind in args.stores.split(","):
+        out = subprocess.run(
+            [sys.executable, __file__, "-n", str(args.urls), "--fp-rate", str(args.fp_rate), "--_child", kind],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        print(out.stdout.strip())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+import argparse
+import json
+
+from ultimate_crawler.config.loader import load_job_config
+from ultimate_crawler.relevance.keyword_filter import KeywordRelevanceFilter
+
+
+def _prf(pred, labels):
+    tp = sum(1 for p, y in zip(pred, labels) if p and y)
+    fp = sum(1 for p, y in zip(pred, labels) if p and not y)
+    fn = sum(1 for p, y in zip(pred, labels) if not p and y)
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": round(precision, 3), "recall": round(recall, 3), "f1": round(f1, 3)}
+
+
+def _substring_score(keywords, text):
+    # score d'avant KeywordMatcher : un str.count par mot-clé, plafonné à 10 occurrences
+    t = text.lower()
+    return min(1.0, sum(t.count(kw.rstrip("*")) for kw in keywords) / 10.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Calibrate keyword_saturation and cascade_keyword_reject on labelled pages "
+                    "(JSONL: 'text', 'label' 1 = relevant / 0)."
+    )
+    parser.add_argument("-c", "--config", required=True, help="Job config YAML (keywords, relevance_threshold).")
+    parser.add_argument("--labelled", required=True, help="Labelled JSONL.")
+    parser.add_argument("--keywords", nargs="+", help="Keyword list to evaluate (default: the job's).")
+    parser.add_argument("--max-reject-loss", type=float, default=0.01,
+                        help="Cascade: max share of relevant pages rejected by the keyword stage.")
+    args = parser.parse_args()
+
+    cfg = load_job_config(args.config)
+    keywords = args.keywords or cfg.keywords
+    threshold = cfg.relevance.relevance_threshold
+    texts, labels = [], []
+    with open(args.labelled, "r", encoding="utf-8") as f:
+        for line in f:
+            d = json.loads(line)
+            texts.append(d["text"])
+            labels.append(int(d["label"]))
+    n_pos = sum(labels)
+    print(f"{len(texts)} pages, {n_pos} relevant | keywords={keywords} | relevance_threshold={threshold}")
+
+    kf = KeywordRelevanceFilter(keywords)
+    dens = [kf.density(t) for t in texts]
+
+    # score ~ densité / saturation : seul le seuil de densité (threshold * saturation) décide
+    best = None
+    for cut in sorted(set(d for d in dens if d > 0)):
+        m = _prf([d >= cut for d in dens], labels)
+        if best is None or m["f1"] > best[1]["f1"]:
+            best = (cut, m)
+    cut, metrics = best
+    saturation = cut / threshold
+
+    # rejet de la cascade : plus grande densité sous laquelle on perd au plus max_reject_loss des pages pertinentes
+    pos = sorted(d for d, y in zip(dens, labels) if y)
+    reject_density = pos[int(args.max_reject_loss * len(pos))] if pos else 0.0
+    rejected_neg = sum(1 for d, y in zip(dens, labels) if not y and d < reject_density)
+
+    print(json.dumps({
+        "substring_score@threshold": _prf([_substring_score(keywords, t) >= threshold for t in texts], labels),
+        "density_cut_per_1000_chars": round(cut, 3),
+        "density@cut": metrics,
+        "keyword_saturation": round(saturation, 2),
+        "cascade_keyword_reject": round(reject_density / saturation, 4),
+        "cascade_relevant_rejected": sum(1 for d in pos if d < reject_density),
+        "cascade_irrelevant_rejected": f"{rejected_neg}/{len(texts) - n_pos}",
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from ultimate_crawler.io.logging_setup import setup_logging
+from ultimate_crawler.relevance.onnx_encoder import ENCODER_CONFIG, TOKENIZER_FILE, OnnxSentenceEncoder
+
+logger = logging.getLogger(__name__)
+
+# textes de contrôle par défaut : langues et longueurs variées, dans et hors sujet
+PARITY_TEXTS = [
+    "vin",
+    "Le vin rouge de Bordeaux assemble merlot et cabernet sauvignon, élevé en fût de chêne.",
+    "This Napa Valley wine shows dark fruit, firm tannins and a long oak-driven finish.",
+    "El vino de Rioja se elabora con tempranillo y envejece en barricas de roble americano.",
+    "Der Riesling von der Mosel ist mineralisch, mit lebendiger Säure und Noten von Pfirsich.",
+    "葡萄酒的酿造需要经过发酵、陈酿和装瓶等多个步骤。",
+    "ワインは温度管理が重要で、赤ワインは十六度前後で提供されることが多い。",
+    "Le match de football s'est terminé sur un score nul après prolongations.",
+    "The new smartphone has a faster processor and a larger battery than last year.",
+    "Livraison gratuite dès 50 € d'achat. Retours sous 30 jours. Paiement sécurisé.",
+    " ".join(
+        [
+            "Les vendanges ont commencé début septembre dans la vallée du Rhône, sur des syrahs",
+            "et des grenaches bien mûrs. Après une fermentation longue en cuve béton, le vin est",
+            "élevé douze mois en demi-muids avant la mise en bouteille, sans collage ni filtration.",
+        ]
+        * 12
+    ),
+]
+
+
+def check_parity(st, model_path: Path, texts, min_cosine: float) -> dict:
+    """
+    Cosinus, texte par texte, entre les vecteurs normalisés de torch
+    (sentence-transformers) et du modèle ONNX `model_path`.
+    """
+    ref = np.asarray(st.encode(texts, normalize_embeddings=True))
+    new = OnnxSentenceEncoder(str(model_path)).encode(texts, normalize_embeddings=True)
+    cos = np.sum(ref * new, axis=1)
+    return {
+        "texts": len(texts),
+        "cosine_mean": round(float(cos.mean()), 4),
+        "cosine_min": round(float(cos.min()), 4),
+        "ok": bool(cos.min() >= min_cosine),
+    }
+
+
+def _size_mb(path: Path) -> float:
+    # poids éventuellement à part (données externes : model.onnx.data)
+    return sum(p.stat().st_size for p in path.parent.glob(path.name + "*")) / (1024 * 1024)
+
+
+def _load_texts(path: Path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [t for t in (json.loads(line).get("text") for line in f) if t]
+
+
+def export(model_name: str, out_dir: Path, opset: int, quantize: bool, parity_texts, min_cosine: float) -> bool:
+    # dépendances de l'export seulement (pas du crawl) : torch, sentence-transformers, onnx
+    # (+ onnxscript pour l'exporteur dynamo, par défaut depuis torch 2.9)
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    st = SentenceTransformer(model_name, device="cpu")
+    transformer = st[0]
+    pooling = st[1] if len(st) > 1 else None
+    # sentence-transformers < 5 : pooling_mode_mean_tokens, ensuite : pooling_mode == "mean"
+    mean = getattr(pooling, "pooling_mode_mean_tokens", False) or getattr(pooling, "pooling_mode", None) == "mean"
+    if pooling is None or not mean:
+        raise ValueError(f"{model_name}: only mean-pooling sentence-transformers models are supported")
+    auto_model = transformer.auto_model.eval()
+    tokenizer = st.tokenizer
+    if not getattr(tokenizer, "is_fast", False):
+        raise ValueError(f"{model_name}: a fast tokenizer (tokenizer.json) is required")
+
+    class LastHiddenState(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask):
+            return self.model(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+
+    sample = tokenizer(["Le vin de Bordeaux", "wine"], padding=True, return_tensors="pt")
+    fp32_path = out_dir / "model.onnx"
+    logger.info("Exporting %s to %s (opset %d)", model_name, fp32_path, opset)
+    with torch.no_grad():
+        torch.onnx.export(
+            LastHiddenState(auto_model),
+            (sample["input_ids"], sample["attention_mask"]),
+            str(fp32_path),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "seq"},
+                "attention_mask": {0: "batch", 1: "seq"},
+                "last_hidden_state": {0: "batch", 1: "seq"},
+            },
+            opset_version=opset,
+        )
+
+    tokenizer.backend_tokenizer.save(str(out_dir / TOKENIZER_FILE))
+    enc_cfg = {"model_name": model_name, "max_seq_length": st.max_seq_length, "pooling": "mean"}
+    with open(out_dir / ENCODER_CONFIG, "w", encoding="utf-8") as f:
+        json.dump(enc_cfg, f, indent=2)
+
+    models = [fp32_path]
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        int8_path = out_dir / "model.int8.onnx"
+        logger.info("Quantizing to %s (dynamic int8)", int8_path)
+        quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+        logger.info(
+            "Model size: %.1f MB (fp32) -> %.1f MB (int8)",
+            _size_mb(fp32_path),
+            _size_mb(int8_path),
+        )
+        models.append(int8_path)
+
+    # parité avec torch, gardée à côté du modèle (relue et loggée au chargement ;
+    # ici pas encore écrite : pas d'avertissement "no parity recorded")
+    logging.getLogger("ultimate_crawler.relevance.onnx_encoder").setLevel(logging.ERROR)
+    enc_cfg["parity"] = {}
+    for path in models:
+        parity = check_parity(st, path, parity_texts, min_cosine)
+        enc_cfg["parity"][path.name] = parity
+        logger.info("Parity %s vs torch: %s", path.name, parity)
+    with open(out_dir / ENCODER_CONFIG, "w", encoding="utf-8") as f:
+        json.dump(enc_cfg, f, indent=2)
+    return all(p["ok"] for p in enc_cfg["parity"].values())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export a sentence-transformers model to ONNX (+ dynamic int8) for embedding_backend: onnx."
+    )
+    parser.add_argument(
+        "-m", "--model",
+        default="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+        help="sentence-transformers model name or path.",
+    )
+    parser.add_argument("-o", "--out", required=True, help="Output directory (model.onnx, model.int8.onnx, tokenizer).")
+    parser.add_argument("--opset", type=int, default=18, help="ONNX opset (18: native opset of the dynamo exporter).")
+    parser.add_argument("--no-quantize", action="store_true", help="Only export the fp32 model.")
+    parser.add_argument("--parity-texts", help="JSONL with a 'text' field for the parity check (default: built-in).")
+    parser.add_argument("--min-cosine", type=float, default=0.98,
+                        help="Parity: min torch/ONNX embedding cosine (exit code 1 below).")
+    args = parser.parse_args()
+
+    setup_logging(level=logging.INFO)
+    texts = _load_texts(Path(args.parity_texts)) if args.parity_texts else PARITY_TEXTS
+    ok = export(args.model, Path(args.out), args.opset, not args.no_quantize, texts, args.min_cosine)
+    if not ok:
+        logger.error("Parity check failed (cosine < %.3f), see %s", args.min_cosine, Path(args.out) / ENCODER_CONFIG)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
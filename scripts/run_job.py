@@ -20,6 +20,11 @@ def main():
         action="store_true",
         help="Enable debug logging"
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume from the job's last checkpoint (output.dir/checkpoint_file)"
+    )
     args = parser.parse_args()
 
     # Logging
@@ -39,16 +44,20 @@ def main():
         cfg.limits.memory_limit_mb,
     )
 
-    seed_urls = build_seed_urls(cfg)
-    if not seed_urls:
-        logger.warning("No seeds found. Check config (keywords / seeds / search API).")
-        return
+    runner = JobRunner(cfg, resume=args.resume)
+    if runner.resuming:
+        # la frontier du checkpoint remplace les seeds
+        seed_urls = []
+    else:
+        seed_urls = build_seed_urls(cfg)
+        if not seed_urls:
+            logger.warning("No seeds found. Check config (keywords / seeds / search API).")
+            return
 
-    logger.info("Seeds found: %d", len(seed_urls))
-    for u in seed_urls[:10]:
-        logger.debug("Seed: %s", u)
+        logger.info("Seeds found: %d", len(seed_urls))
+        for u in seed_urls[:10]:
+            logger.debug("Seed: %s", u)
 
-    runner = JobRunner(cfg)
     runner.run(seed_urls)
 
     logger.info("Job finished.")
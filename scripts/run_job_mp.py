@@ -25,6 +25,11 @@ def main():
         action="store_true",
         help="Enable debug logs."
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume each shard from its last checkpoint (same number of workers)."
+    )
     args = parser.parse_args()
 
     level = logging.DEBUG if args.debug else logging.INFO
@@ -34,7 +39,7 @@ def main():
     cfg = load_job_config(args.config)
     logger.info("=== Distributed Job: %s ===", cfg.job_name)
 
-    run_distributed_job(cfg, num_workers=args.workers)
+    run_distributed_job(cfg, num_workers=args.workers, resume=args.resume)
 
 
 if __name__ == "__main__":
@@ -12,23 +12,116 @@ class LimitsConfig:
     max_pages: int
     memory_limit_mb: int
     max_pages_per_domain: int
+    max_depth: Optional[int] = None   # profondeur max depuis les seeds (None = illimitée)
+    queue_slack: float = 2.0          # URLs en file par domaine, en multiple du budget restant
 
 
 @dataclass
 class CrawlerConfig:
     user_agent: str
-    max_concurrent_requests: int
     request_timeout: int
     obey_robots_txt: bool
-    politeness_delay: float
+    politeness_delay: float  # délai entre deux requêtes vers un même host
+    politeness_lookahead: int = 10000  # nb max d'URLs en attente dans les files par host
+    max_concurrent_requests: int = 16
+    max_requests_per_host: int = 1         # plafond AIMD de requêtes en vol par host
+    max_retries: int = 2                   # nouveaux essais sur erreur transitoire / 429 / 5xx
+    retry_backoff: float = 2.0             # backoff de base (s), exponentiel + jitter
+    circuit_failure_threshold: int = 5     # échecs consécutifs avant ouverture du circuit
+    circuit_open_seconds: float = 300.0    # pause d'un host au circuit ouvert (s)
+    circuit_max_opens: int = 3             # ouvertures consécutives avant abandon du host
+    use_playwright: bool = False
+    playwright_contexts: int = 2           # contexts navigateur réutilisés
+    playwright_max_pages: int = 4          # pages chargées en parallèle
+    playwright_idle_timeout: float = 3.0   # attente max de networkidle après load (s)
+    playwright_block_resources: bool = True  # bloque images / polices / médias / trackers
+    fetch_engine: str = "sync"  # "sync" | "async"
+    http2: bool = False  # multiplexage HTTP/2 (fetch_engine: async, pip install httpx[http2])
+    tls_verify: bool = True
+    max_body_bytes: int = 5_000_000   # au-delà, la réponse est abandonnée
+    fetch_deadline: float = 30.0      # durée max totale d'un fetch (s), en plus du timeout socket
+    stream_parse: bool = True         # parse HTML incrémental pendant le téléchargement (sans pool de parse)
+    allowed_content_types: List[str] = field(
+        default_factory=lambda: ["text/html", "application/xhtml+xml"]
+    )
+    pool_max_connections: int = 100   # connexions keep-alive au total (httpx) / pools de hosts conservés (requests)
+    pool_max_per_host: int = 4        # connexions (requêtes HTTP/2) simultanées par host
+    keepalive_expiry: float = 30.0    # fermeture des connexions inactives (s, httpx)
+    dns_cache_ttl: float = 0.0        # TTL max du cache DNS (s), 0 = désactivé (sinon : socket.getaddrinfo du process)
+    http_cache_dir: Optional[str] = None  # ex: "data/cache/http" (revalidation ETag / Last-Modified)
+    http_cache_max_mb: float = 1024.0     # au-delà, les entrées les plus anciennes sont supprimées
+    robots_cache_dir: Optional[str] = None  # ex: "data/cache/robots" (partagé entre runs et shards)
+    robots_cache_ttl: float = 86400.0       # durée de validité d'un robots.txt (s)
+    robots_prefetch_workers: int = 8        # fetchs de robots.txt en parallèle, en tâche de fond
+    robots_max_crawl_delay: float = 30.0    # plafond appliqué au Crawl-delay des sites (s)
+    sitemap_discovery: bool = True          # URLs des sitemaps (robots.txt, /sitemap.xml) en frontier
+    sitemap_max_files: int = 20             # fichiers sitemap lus par domaine (index compris)
+    sitemap_half_life_days: float = 365.0   # priorité de fraîcheur (<lastmod>) divisée par 2 par demi-vie
+    sitemap_workers: int = 4                # domaines dont les sitemaps sont lus en parallèle
 
 
 @dataclass
 class RelevanceConfig:
     min_chars: int
     relevance_threshold: float
-    model: str  # "keyword" | "embedding"
+    model: str  # "keyword" | "embedding" | "clfdoc_hybrid" | "cascade"
     embedding_model_name: Optional[str] = None
+    clfdoc_model_path: Optional[str] = None
+    clfdoc_vectorizer_path: Optional[str] = None
+    clfdoc_positive_label: str = "wine"
+    clfdoc_alpha: float = 0.5
+    keyword_saturation: float = 5.7  # keyword : occurrences pour 1000 caractères donnant un score de 1
+    batch_size: int = 32          # embedding / clfdoc_hybrid : documents notés ensemble (1 = un par un)
+    batch_max_wait: float = 0.01  # attente max pour compléter un batch (s)
+    embedding_cache_dir: Optional[str] = None  # ex: "data/cache/embeddings" (partagé entre runs)
+    embedding_cache_max_mb: float = 2048.0     # au-delà, les segments les plus anciens sont supprimés
+    embedding_cache_lru: int = 10_000          # vecteurs gardés en mémoire devant les segments
+    embedding_backend: str = "torch"           # "torch" (sentence-transformers) | "onnx" (onnxruntime, CPU)
+    onnx_model_path: Optional[str] = None      # ex: "models/minilm-onnx/model.int8.onnx" (scripts/export_onnx_embedding.py)
+    onnx_threads: int = 0                      # threads onnxruntime par encode (0 = tous les cœurs)
+    onnx_pad_bucket: int = 16                  # padding arrondi au multiple de N tokens
+    # cascade : étages du moins cher au plus cher, le dernier tranche sur relevance_threshold
+    cascade_stages: List[str] = field(default_factory=lambda: ["keyword", "clfdoc", "embedding"])
+    cascade_keyword_reject: Optional[float] = 0.05  # score < : rejet (0.05 = moins d'une occurrence pour 3500 caractères)
+    cascade_keyword_accept: Optional[float] = None  # score >= : acceptation (None = jamais)
+    cascade_clfdoc_reject: Optional[float] = 0.05
+    cascade_clfdoc_accept: Optional[float] = 0.95
+    cascade_embedding_reject: Optional[float] = None
+    cascade_embedding_accept: Optional[float] = None
+
+
+@dataclass
+class FrontierConfig:
+    backend: str = "memory"          # "memory" | "disk" | "best_first"
+    memory_budget_mb: float = 256.0  # au-delà, les URLs en file débordent sur disque
+    segment_urls: int = 50_000       # URLs par segment sur disque
+    spill_dir: Optional[str] = None  # défaut : <output.dir>/frontier
+    priority_buckets: int = 100      # best_first : niveaux de priorité
+    parent_weight: float = 0.6       # best_first : poids du score de la page parente vs ancre/URL
+    seen_store: str = "hash"         # URLs vues : "hash" (empreintes 64 bits, exact) | "bloom"
+    bloom_capacity: int = 10_000_000  # bloom : nb d'URLs prévu
+    bloom_fp_rate: float = 0.001     # bloom : taux de faux positifs (URL nouvelle ignorée)
+
+
+@dataclass
+class URLFilterConfig:
+    enabled: bool = True
+    extra_blocked_extensions: List[str] = field(default_factory=list)  # en plus de url_filter.BLOCKED_EXTENSIONS
+    extra_trap_patterns: List[str] = field(default_factory=list)       # regex en plus de url_filter.TRAP_PATTERNS
+    max_url_length: int = 1024        # caractères
+    max_path_segments: int = 15       # /a/b/c -> 3 segments
+    max_segment_repeats: int = 2      # un même segment au-delà : boucle de liens relatifs
+    max_query_combinations: int = 100  # jeux de paramètres distincts par gabarit de chemin
+
+
+@dataclass
+class PipelineConfig:
+    enabled: bool = True                   # false : parse, score et écriture dans la boucle de crawl
+    parse_processes: Optional[int] = None  # processus parse + trafilatura + langdetect (None = nb de cœurs - 1, 0 = threads)
+    parse_queue: int = 64                  # pages fetchées en attente de parse
+    score_workers: int = 1                 # threads de scoring (modèle de pertinence partagé)
+    score_queue: int = 64                  # pages parsées en attente de score
+    write_queue: int = 256                 # pages gardées en attente d'écriture
 
 
 @dataclass
@@ -36,6 +129,8 @@ class OutputConfig:
     dir: Path
     raw_pages_file: str
     filtered_docs_file: str
+    checkpoint_file: Optional[str] = "checkpoint.bin"  # dans output.dir, None = désactivé
+    checkpoint_interval: float = 300.0                 # secondes entre deux checkpoints
 
 
 @dataclass
@@ -48,6 +143,9 @@ class JobConfig:
     relevance: RelevanceConfig
     output: OutputConfig
     seeds: List[str] = field(default_factory=list)
+    frontier: FrontierConfig = field(default_factory=FrontierConfig)
+    url_filter: URLFilterConfig = field(default_factory=URLFilterConfig)
+    pipeline: PipelineConfig = field(default_factory=PipelineConfig)
 
 
 def load_job_config(path: str) -> JobConfig:
@@ -58,11 +156,16 @@ def load_job_config(path: str) -> JobConfig:
     limits = LimitsConfig(**cfg["limits"])
     crawler = CrawlerConfig(**cfg["crawler"])
     relevance = RelevanceConfig(**cfg["relevance"])
+    frontier = FrontierConfig(**cfg.get("frontier", {}))
+    url_filter = URLFilterConfig(**cfg.get("url_filter", {}))
+    pipeline = PipelineConfig(**cfg.get("pipeline", {}))
     out_cfg = cfg["output"]
     output = OutputConfig(
         dir=Path(out_cfg["dir"]),
         raw_pages_file=out_cfg["raw_pages_file"],
         filtered_docs_file=out_cfg["filtered_docs_file"],
+        checkpoint_file=out_cfg.get("checkpoint_file", "checkpoint.bin"),
+        checkpoint_interval=out_cfg.get("checkpoint_interval", 300.0),
     )
 
     seeds = cfg.get("seeds", [])
@@ -76,4 +179,7 @@ def load_job_config(path: str) -> JobConfig:
         relevance=relevance,
         output=output,
         seeds=seeds,
+        frontier=frontier,
+        url_filter=url_filter,
+        pipeline=pipeline,
     )
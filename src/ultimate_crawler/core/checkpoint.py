@@ -0,0 +1,127 @@
+# src/ultimate_crawler/core/checkpoint.py
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"UCCKPT\x00\x01"
+
+# URLs en attente : une ligne "priorité<TAB>url" par URL, par blocs compressés
+URLS_PER_CHUNK = 20_000
+
+
+class CheckpointWriter:
+    """
+    Fichier de checkpoint binaire, écrit de façon atomique (fichier
+    temporaire + fsync + os.replace : un crash pendant l'écriture laisse
+    le checkpoint précédent intact).
+
+    Format : MAGIC puis des sections nommées, chacune étant une suite de
+    blocs zlib préfixés par leur taille (u32), terminée par un bloc vide.
+    Les gros volumes (frontier, store d'URLs) sont écrits en flux, bloc
+    par bloc, sans tout matérialiser en mémoire.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._tmp = self.path.with_suffix(self.path.suffix + f".tmp{os.getpid()}")
+        self._f: BinaryIO = open(self._tmp, "wb")
+        self._f.write(MAGIC)
+
+    def section(self, name: str, chunks: Iterable[bytes]):
+        name_b = name.encode("utf-8")
+        self._f.write(struct.pack("<H", len(name_b)))
+        self._f.write(name_b)
+        for chunk in chunks:
+            if not chunk:
+                continue
+            data = zlib.compress(chunk, 6)
+            self._f.write(struct.pack("<I", len(data)))
+            self._f.write(data)
+        self._f.write(struct.pack("<I", 0))
+
+    def json(self, name: str, obj):
+        self.section(name, [json.dumps(obj, ensure_ascii=False).encode("utf-8")])
+
+    def urls(self, name: str, items: Iterable[Tuple[str, float]]):
+        self.section(name, _encode_urls(items))
+
+    def commit(self):
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._f.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self):
+        self._f.close()
+        self._tmp.unlink(missing_ok=True)
+
+
+def _encode_urls(items: Iterable[Tuple[str, float]]) -> Iterator[bytes]:
+    lines: List[str] = []
+    for url, priority in items:
+        lines.append(f"{priority:.4g}\t{url}")
+        if len(lines) >= URLS_PER_CHUNK:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class CheckpointReader:
+    """
+    Lecture d'un fichier écrit par CheckpointWriter. Seul l'index des
+    sections est lu à l'ouverture ; les blocs sont décompressés à la demande.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._f: BinaryIO = open(self.path, "rb")
+        if self._f.read(len(MAGIC)) != MAGIC:
+            self._f.close()
+            raise ValueError(f"Not a crawl checkpoint: {self.path}")
+        self._index: Dict[str, List[Tuple[int, int]]] = {}
+        while True:
+            head = self._f.read(2)
+            if not head:
+                break
+            (n,) = struct.unpack("<H", head)
+            name = self._f.read(n).decode("utf-8")
+            blocks = self._index[name] = []
+            while True:
+                (size,) = struct.unpack("<I", self._f.read(4))
+                if size == 0:
+                    break
+                blocks.append((self._f.tell(), size))
+                self._f.seek(size, os.SEEK_CUR)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def chunks(self, name: str) -> Iterator[bytes]:
+        for offset, size in self._index.get(name, []):
+            self._f.seek(offset)
+            yield zlib.decompress(self._f.read(size))
+
+    def bytes(self, name: str) -> bytes:
+        return b"".join(self.chunks(name))
+
+    def json(self, name: str):
+        return json.loads(self.bytes(name).decode("utf-8"))
+
+    def urls(self, name: str) -> Iterator[Tuple[str, float]]:
+        for chunk in self.chunks(name):
+            for line in chunk.decode("utf-8").splitlines():
+                priority, _, url = line.partition("\t")
+                yield url, float(priority)
+
+    def close(self):
+        self._f.close()
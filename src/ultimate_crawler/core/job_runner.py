@@ -1,68 +1,138 @@
 # src/ultimate_crawler/core/job_runner.py
 
 import json
+import math
+import multiprocessing as mp
+import os
+import time
+from collections import defaultdict
+from dataclasses import asdict
+from itertools import chain
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
 import logging
 
-from ..config.loader import JobConfig
-from ..crawl.frontier import Frontier
+from ..config.loader import JobConfig, PipelineConfig
+from ..crawl.frontier import Frontier, build_frontier
+from ..crawl.url_store import build_url_store
 from ..crawl.scheduler import Scheduler
-from ..crawl.fetcher import Fetcher
-from ..crawl.parser import html_to_text
+from ..crawl.politeness import PolitenessScheduler
+from ..crawl.rate_control import HostRateController
+from ..crawl.fetcher import Fetcher, FetchResult
+from ..crawl.async_fetcher import AsyncFetcher
+from ..crawl.page import Page, StreamingPage
 from ..crawl.robots import RobotsManager
-from ..crawl.links import extract_links_same_domain
-from ..relevance.language import detect_lang
+from ..crawl.sitemaps import SitemapManager
+from ..crawl.url_filter import URLFilter
+from ..crawl.links import Link, LinkScorer
 from ..relevance.keyword_filter import KeywordRelevanceFilter
+from ..relevance.embedding_cache import EmbeddingCache
 from ..relevance.embedding_model import EmbeddingRelevanceModel
+from ..relevance.onnx_encoder import OnnxSentenceEncoder
 from ..relevance.embedding_filter import EmbeddingRelevanceFilter
 from ..relevance.clfdoc_model import ClfDocConfig, ClfDocModel
 from ..relevance.clfdoc_filter import HybridRelevanceFilter
+from ..relevance.cascade import CascadeRelevanceFilter, CascadeStage
 from ..io.writers import RotatingJSONLWriter
+from .checkpoint import CheckpointReader, CheckpointWriter
+from .pipeline import PageJob, Pipeline, Stage, analyze_html, analyze_page
 from .metrics import CrawlMetrics
 from .utils import estimate_bytes
 
 logger = logging.getLogger(__name__)
 
+# intervalle de réveil quand seuls des robots.txt sont attendus (s)
+ROBOTS_POLL_INTERVAL = 0.05
+# intervalle de relève des liens des pages en cours de téléchargement (s)
+
 
 class JobRunner:
-    def __init__(self, cfg: JobConfig):
+    def __init__(self, cfg: JobConfig, resume: bool = False):
         self.cfg = cfg
 
         logger.info("Initializing JobRunner for job=%s", cfg.job_name)
 
-        self.fetcher = Fetcher(cfg.crawler)
-        self.robots = RobotsManager(cfg.crawler.user_agent)
-        self.scheduler = Scheduler(cfg.limits.max_pages_per_domain)
+        if cfg.crawler.fetch_engine == "sync":
+            self.fetcher = Fetcher(cfg.crawler)
+        elif cfg.crawler.fetch_engine == "async":
+            logger.info(
+                "Using AsyncFetcher (max_concurrent_requests=%d)",
+                cfg.crawler.max_concurrent_requests,
+            )
+            self.fetcher = AsyncFetcher(cfg.crawler)
+        else:
+            raise ValueError(f"Unknown fetch engine: {cfg.crawler.fetch_engine}")
+        self.robots = RobotsManager(cfg.crawler, self.fetcher.fetch_robots)
+        # par domaine, on ne garde des sitemaps que ce que le budget peut absorber
+        self.sitemaps: Optional[SitemapManager] = None
+        if cfg.crawler.sitemap_discovery:
+            self.sitemaps = SitemapManager(
+                cfg.crawler,
+                self.fetcher.fetch_sitemap,
+                max_urls=math.ceil(cfg.limits.max_pages_per_domain * cfg.limits.queue_slack),
+            )
+        # URLs admises dont le robots.txt du domaine est en cours de fetch
+        self._robots_wait: Dict[str, List[Tuple[str, float]]] = defaultdict(list)
+        self._robots_waiting = 0
+        self.scheduler = Scheduler(
+            cfg.limits.max_pages_per_domain,
+            max_depth=cfg.limits.max_depth,
+            queue_slack=cfg.limits.queue_slack,
+        )
+        self.rate = HostRateController(
+            max_per_host=cfg.crawler.max_requests_per_host,
+            max_retries=cfg.crawler.max_retries,
+            backoff_base=cfg.crawler.retry_backoff,
+            failure_threshold=cfg.crawler.circuit_failure_threshold,
+            open_seconds=cfg.crawler.circuit_open_seconds,
+            max_opens=cfg.crawler.circuit_max_opens,
+        )
+        self.politeness = PolitenessScheduler(
+            cfg.crawler.politeness_delay,
+            concurrency=self.rate.concurrency,
+        )
 
+        # batchs d'embeddings : remplis par les threads concurrents du stage de score
+        batch_size = cfg.relevance.batch_size if cfg.pipeline.enabled else 1
         if cfg.relevance.model == "keyword":
             logger.info("Using KeywordRelevanceFilter")
-            self.relevance = KeywordRelevanceFilter(cfg.keywords)
+            self.relevance = KeywordRelevanceFilter(cfg.keywords, saturation=cfg.relevance.keyword_saturation)
 
         elif cfg.relevance.model == "embedding":
             logger.info(
                 "Using EmbeddingRelevanceFilter with model=%s",
                 cfg.relevance.embedding_model_name
             )
-            emb_model = EmbeddingRelevanceModel(cfg.relevance.embedding_model_name, cfg.keywords)
-            self.relevance = EmbeddingRelevanceFilter(emb_model)
+            emb_model = self._embedding_model()
+            self.relevance = EmbeddingRelevanceFilter(
+                emb_model,
+                batch_size=batch_size,
+                max_wait=cfg.relevance.batch_max_wait,
+            )
 
         elif cfg.relevance.model == "clfdoc_hybrid":
             logger.info(
                 "Using HybridRelevanceFilter (embedding + clfdoc), emb_model=%s",
                 cfg.relevance.embedding_model_name,
             )
-            emb_model = EmbeddingRelevanceModel(cfg.relevance.embedding_model_name, cfg.keywords)
+            emb_model = self._embedding_model()
+            clf_model = self._clfdoc_model()
 
-            clf_cfg = ClfDocConfig(
-                model_path=cfg.relevance.clfdoc_model_path,
-                vectorizer_path=cfg.relevance.clfdoc_vectorizer_path,
-                positive_label=getattr(cfg.relevance, "clfdoc_positive_label", "wine"),
+            alpha = getattr(cfg.relevance, "clfdoc_alpha", 0.5)
+            self.relevance = HybridRelevanceFilter(
+                emb_model,
+                clf_model,
+                alpha=alpha,
+                batch_size=batch_size,
+                max_wait=cfg.relevance.batch_max_wait,
             )
-            clf_model = ClfDocModel(clf_cfg)
 
-            alpha = getattr(cfg.relevance, "clfdoc_alpha", 0.5)
-            self.relevance = HybridRelevanceFilter(emb_model, clf_model, alpha=alpha)
+        elif cfg.relevance.model == "cascade":
+            logger.info("Using CascadeRelevanceFilter (%s)", " -> ".join(cfg.relevance.cascade_stages))
+            self.relevance = self._cascade_filter(batch_size)
 
         else:
             raise ValueError(f"Unknown relevance model: {cfg.relevance.model}")
@@ -71,19 +141,150 @@ class JobRunner:
         out_dir.mkdir(parents=True, exist_ok=True)
         logger.info("Output directory: %s", out_dir)
 
-        self.raw_writer = RotatingJSONLWriter(out_dir / cfg.output.raw_pages_file)
-        self.filtered_writer = RotatingJSONLWriter(out_dir / cfg.output.filtered_docs_file)
+        self._checkpoint_path = out_dir / cfg.output.checkpoint_file if cfg.output.checkpoint_file else None
+        self._last_checkpoint = time.monotonic()
+        self._resume_from: Optional[CheckpointReader] = None
+        offsets: Dict[str, int] = {}
+        if resume:
+            if self._checkpoint_path is not None and self._checkpoint_path.exists():
+                self._resume_from = CheckpointReader(self._checkpoint_path)
+                offsets = self._resume_from.json("state")["writers"]
+                logger.info("Resuming from checkpoint %s", self._checkpoint_path)
+            else:
+                logger.warning("No checkpoint to resume from in %s, starting from scratch", out_dir)
+
+        # en reprise, les lignes écrites après le checkpoint sont retirées
+        self.raw_writer = RotatingJSONLWriter(
+            out_dir / cfg.output.raw_pages_file, resume_offset=offsets.get("raw")
+        )
+        self.filtered_writer = RotatingJSONLWriter(
+            out_dir / cfg.output.filtered_docs_file, resume_offset=offsets.get("filtered")
+        )
+
+        self.link_scorer = LinkScorer(cfg.keywords, parent_weight=cfg.frontier.parent_weight)
+        # liens du parse incrémental envoyés en frontier dès la fin du fetch,
+        # avant le pipeline, donc sans le score de la page parente : pas pour
+        # la frontier best-first, qui en dépend
+        self._publish_links = cfg.crawler.stream_parse and cfg.frontier.backend != "best_first"
 
         self.metrics = CrawlMetrics()
-        self.visited_urls: set[str] = set()
+        # URLs vues (en file / fetchées), partagé avec la frontier
+        self.url_store = build_url_store(cfg.frontier)
         self.domains_seen: set[str] = set()
+        self.url_filter = URLFilter(cfg.url_filter)
+
+        # parse / score / écriture en stages, en parallèle du fetch
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self.pipeline = self._build_pipeline(cfg.pipeline)
+
+    def _embedding_model(self) -> EmbeddingRelevanceModel:
+        rcfg = self.cfg.relevance
+        encoder = None
+        # les vecteurs diffèrent d'un backend à l'autre : entrées de cache séparées
+        cache_name = rcfg.embedding_model_name
+        if rcfg.embedding_backend == "onnx":
+            if not rcfg.onnx_model_path:
+                raise ValueError("onnx_model_path must be set in config for embedding_backend: onnx.")
+            encoder = OnnxSentenceEncoder(
+                rcfg.onnx_model_path,
+                threads=rcfg.onnx_threads,
+                pad_bucket=rcfg.onnx_pad_bucket,
+            )
+            cache_name = f"{rcfg.embedding_model_name}@{Path(rcfg.onnx_model_path).stem}"
+        elif rcfg.embedding_backend != "torch":
+            raise ValueError(f"Unknown embedding backend: {rcfg.embedding_backend}")
+        cache = None
+        if rcfg.embedding_cache_dir and rcfg.embedding_model_name:
+            cache = EmbeddingCache(
+                rcfg.embedding_cache_dir,
+                cache_name,
+                max_mb=rcfg.embedding_cache_max_mb,
+                lru_entries=rcfg.embedding_cache_lru,
+            )
+        return EmbeddingRelevanceModel(rcfg.embedding_model_name, self.cfg.keywords, cache=cache, encoder=encoder)
+
+    def _clfdoc_model(self) -> ClfDocModel:
+        rcfg = self.cfg.relevance
+        return ClfDocModel(
+            ClfDocConfig(
+                model_path=rcfg.clfdoc_model_path,
+                vectorizer_path=rcfg.clfdoc_vectorizer_path,
+                positive_label=getattr(rcfg, "clfdoc_positive_label", "wine"),
+            )
+        )
+
+    def _cascade_filter(self, batch_size: int) -> CascadeRelevanceFilter:
+        rcfg = self.cfg.relevance
+        stages = []
+        closers = []
+        for name in rcfg.cascade_stages:
+            if name == "keyword":
+                score_batch = KeywordRelevanceFilter(self.cfg.keywords, saturation=rcfg.keyword_saturation).score_batch
+            elif name == "clfdoc":
+                score_batch = self._clfdoc_model().score_batch
+            elif name == "embedding":
+                emb_model = self._embedding_model()
+                score_batch = emb_model.score_batch
+                closers.append(emb_model.close)
+            else:
+                raise ValueError(f"Unknown cascade stage: {name}")
+            stages.append(
+                CascadeStage(
+                    name,
+                    score_batch,
+                    reject_below=getattr(rcfg, f"cascade_{name}_reject"),
+                    accept_at=getattr(rcfg, f"cascade_{name}_accept"),
+                )
+            )
+        return CascadeRelevanceFilter(
+            stages,
+            rcfg.relevance_threshold,
+            alpha=rcfg.clfdoc_alpha,
+            batch_size=batch_size,
+            max_wait=rcfg.batch_max_wait,
+            closers=closers,
+        )
+
+    def _build_pipeline(self, pcfg: PipelineConfig) -> Pipeline:
+        processes = 0
+        # scoring par batchs : chaque thread attend le score de sa page,
+        # il en faut assez pour remplir un batch
+        score_workers = max(pcfg.score_workers, getattr(self.relevance, "batch_size", 1))
+        if pcfg.enabled:
+            processes = pcfg.parse_processes
+            if processes is None:
+                # un seul cœur : parse dans les threads du stage (un pool n'y gagne rien)
+                processes = max(0, (os.cpu_count() or 1) - 1)
+            if processes > 0:
+                # spawn : pas de fork d'un processus qui a déjà des threads (fetch, robots)
+                self._parse_pool = ProcessPoolExecutor(
+                    max_workers=processes,
+                    mp_context=mp.get_context("spawn"),
+                )
+            logger.info(
+                "Staged pipeline: %d parse processes, %d score workers, queues parse=%d score=%d write=%d",
+                processes,
+                score_workers,
+                pcfg.parse_queue,
+                pcfg.score_queue,
+                pcfg.write_queue,
+            )
+        stages = [
+            # un thread par processus : chacun attend le résultat de sa page
+            Stage("parse", self._parse_stage, max(1, processes), pcfg.parse_queue),
+            Stage("score", self._score_stage, score_workers, pcfg.score_queue),
+            # writers non thread-safe : un seul thread d'écriture
+            Stage("write", self._write_stage, 1, pcfg.write_queue),
+        ]
+        return Pipeline(stages, threaded=pcfg.enabled)
 
     def _memory_limit_reached(self) -> bool:
         mb = self.metrics.total_bytes_written / (1024 * 1024)
         return mb >= self.cfg.limits.memory_limit_mb
 
-    def _global_limits_reached(self) -> bool:
-        if self.metrics.pages_fetched >= self.cfg.limits.max_pages:
+    def _global_limits_reached(self, in_flight: int = 0) -> bool:
+        # les fetchs en vol comptent comme des pages déjà fetchées
+        if self.metrics.pages_fetched + in_flight >= self.cfg.limits.max_pages:
             logger.info("Stopping: max_pages reached (%d)", self.cfg.limits.max_pages)
             return True
         if self._memory_limit_reached():
@@ -98,128 +299,594 @@ class JobRunner:
             return True
         return False
 
+    def _admit(self, url: str, priority: float = 0.0) -> bool:
+        """
+        Filtre une URL sortie de la frontier : True si elle peut passer
+        dans les files par host. Une URL refusée libère sa place dans le
+        budget du scheduler ; une URL qui attend robots.txt la garde.
+        """
+        obey_robots = self.cfg.crawler.obey_robots_txt
+        if not self.url_store.mark_fetched(url):
+            reason = "Already visited"
+        elif self.rate.is_dead(self.politeness.host_of(url)):
+            reason = "Host circuit dead"
+        elif not self.scheduler.can_crawl(url):
+            reason = "Domain page limit reached"
+        elif obey_robots and self._wait_for_robots(url, priority):
+            return False
+        elif obey_robots and not self.robots.allowed(url):
+            reason = "Disallowed by robots.txt"
+        else:
+            self._discover_sitemaps(url)
+            return True
+        logger.debug("%s, skipping: %s", reason, url)
+        self.scheduler.dequeue(url, discard=True)
+        return False
+
+    def _wait_for_robots(self, url: str, priority: float) -> bool:
+        """
+        robots.txt du domaine pas encore connu : l'URL attend son domaine
+        (voir _release_robots_waiting) et on rend True.
+        """
+        if self.robots.prefetch(url):
+            return False
+        self._robots_wait[self.robots.base_of(url)].append((url, priority))
+        self._robots_waiting += 1
+        return True
+
+    def _release_robots_waiting(self):
+        """
+        Domaines dont robots.txt vient d'arriver : applique le Crawl-delay
+        et passe leurs URLs en attente au PolitenessScheduler.
+        """
+        for base in self.robots.drain_ready():
+            host = self.politeness.host_of(base)
+            crawl_delay = self.robots.crawl_delay(base + "/")
+            if crawl_delay is not None:
+                delay = min(max(crawl_delay, self.cfg.crawler.politeness_delay),
+                            self.cfg.crawler.robots_max_crawl_delay)
+                logger.debug("Crawl-delay %.1f s for %s (using %.1f s)", crawl_delay, host, delay)
+                self.politeness.set_delay(host, delay)
+            self._discover_sitemaps(base + "/")
+
+            urls = self._robots_wait.pop(base, [])
+            self._robots_waiting -= len(urls)
+            for url, priority in urls:
+                if self.robots.allowed(url):
+                    self.politeness.push(url, priority)
+                else:
+                    logger.debug("Disallowed by robots.txt, skipping: %s", url)
+                    self.scheduler.dequeue(url, discard=True)
+
+    def _discover_sitemaps(self, url: str):
+        """
+        Première URL admise d'un domaine : lance la lecture de ses
+        sitemaps (ceux de robots.txt s'il est suivi), au rythme de
+        politesse du host (Crawl-delay compris, déjà appliqué si robots.txt
+        est suivi).
+        """
+        if self.sitemaps is None:
+            return
+        base = self.robots.base_of(url)
+        if self.sitemaps.started(base):
+            return
+        declared = self.robots.sitemaps(url) if self.cfg.crawler.obey_robots_txt else []
+        delay = self.politeness.delay_for(self.politeness.host_of(base))
+        self.sitemaps.discover(base, declared, delay)
+
+    def _release_sitemap_urls(self, frontier: Frontier):
+        """
+        URLs des sitemaps lus depuis le dernier appel : en frontier, par
+        fraîcheur décroissante, dans la limite du budget du domaine.
+        Elles comptent comme liées depuis la page d'accueil (profondeur 1).
+        """
+        if self.sitemaps is None:
+            return
+        for base, entries in self.sitemaps.drain_ready():
+            added = 0
+            for url, freshness in entries:
+                if url in self.url_store or not self.url_filter.allowed(url):
+                    continue
+                if not self.scheduler.can_enqueue(url, 1):
+                    break
+                if frontier.add(url, self.link_scorer.priority(Link(url), freshness)):
+                    self.scheduler.enqueue(url, 1)
+                    added += 1
+            logger.info("Sitemaps: %d URLs enqueued for %s", added, base)
+
+    def _wait_time(self) -> Optional[float]:
+        """
+        Comme PolitenessScheduler.wait_time, en tenant compte des
+        robots.txt et des sitemaps encore attendus, et des pages encore
+        dans le pipeline (leurs liens ne sont pas encore en frontier).
+        """
+        delay = self.politeness.wait_time()
+        if (
+            self.robots.pending()
+            or (self.sitemaps is not None and self.sitemaps.pending())
+            or self.pipeline.pending()
+        ):
+            return ROBOTS_POLL_INTERVAL if delay is None else min(delay, ROBOTS_POLL_INTERVAL)
+        return delay
+
+    def _next_url(self, frontier: Frontier) -> Optional[str]:
+        """
+        Rend la prochaine URL crawlable dont le host est éligible
+        (politesse), ou None si aucun host n'est prêt pour l'instant.
+        Les URLs de la frontier sont admises (pas encore vues, autorisées
+        par robots.txt et le scheduler) dans les files par host du
+        PolitenessScheduler, dans la limite de politeness_lookahead.
+        """
+        self._release_robots_waiting()
+        self._release_sitemap_urls(frontier)
+        self._drain_pipeline(frontier)
+        while True:
+            url = self.politeness.pop()
+            if url is not None:
+                if self.scheduler.can_crawl(url):
+                    self.scheduler.dequeue(url)
+                    return url
+                # budget du domaine épuisé entre-temps : pas de fetch, pas de délai
+                logger.debug("Domain page limit reached, skipping: %s", url)
+                self.politeness.release(url, delay=0.0)
+                self.scheduler.dequeue(url, discard=True)
+                continue
+
+            waiting = len(self.politeness) + self._robots_waiting
+            if len(frontier) == 0 or waiting >= self.cfg.crawler.politeness_lookahead:
+                return None
+            item = frontier.pop_with_priority()
+            if item is None:
+                continue
+            url, priority = item
+            if self._admit(url, priority):
+                self.politeness.push(url, priority)
+
+    @property
+    def resuming(self) -> bool:
+        return self._resume_from is not None
+
     def run(self, seed_urls):
-        logger.info("Starting crawl with %d seed URLs", len(seed_urls))
+        frontier = build_frontier(self.cfg.frontier, self.cfg.output.dir, self.url_store)
+        if self._resume_from is not None:
+            self._restore_checkpoint(frontier)
+        else:
+            logger.info("Starting crawl with %d seed URLs", len(seed_urls))
+            for url in seed_urls:
+                if frontier.add(url, priority=1.0):
+                    self.scheduler.enqueue(url)
+        self._last_checkpoint = time.monotonic()
+
+        if isinstance(self.fetcher, AsyncFetcher):
+            self._run_concurrent(frontier)
+        else:
+            self._run_sequential(frontier)
+
+        self._drain_pipeline(frontier, wait=True)
+        self.metrics.finish()
+        self._save_checkpoint(frontier)
+        self._collect_network_metrics()
+        frontier.close()
+        self.pipeline.close()
+        if hasattr(self.relevance, "close"):
+            self.relevance.close()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+        self.robots.close()
+        if self.sitemaps is not None:
+            self.sitemaps.close()
+        self.fetcher.close()
+        self.raw_writer.close()
+        self.filtered_writer.close()
+
+        logger.info(
+            "Crawl finished: pages_fetched=%d, pages_kept=%d (harvest=%.1f%%), domains_seen=%d, "
+            "bytes_written=%.2f MB, duration=%.1f s",
+            self.metrics.pages_fetched,
+            self.metrics.pages_kept,
+            100.0 * self.metrics.harvest_rate,
+            len(self.domains_seen),
+            self.metrics.total_bytes_written / (1024 * 1024),
+            self.metrics.duration_sec,
+        )
+        logger.info(
+            "Admission: links refused by domain budget=%d, by max_depth=%d",
+            self.scheduler.refused_budget,
+            self.scheduler.refused_depth,
+        )
+        logger.info("URL filter: rejected %s", self.url_filter.summary())
+        if isinstance(self.relevance, CascadeRelevanceFilter):
+            logger.info("Relevance cascade exits: %s", self.relevance.summary())
+        logger.info(
+            "Network: requests=%d, connections_opened=%d, pool_hit_rate=%.1f%%, dns_hits=%d, dns_misses=%d",
+            self.metrics.requests_sent,
+            self.metrics.connections_opened,
+            100.0 * self.metrics.pool_hit_rate,
+            self.metrics.dns_hits,
+            self.metrics.dns_misses,
+        )
+
+    def _pending_admitted(self, in_flight: Iterable[str]) -> Iterator[Tuple[str, float]]:
+        """
+        URLs sorties de la frontier mais pas encore traitées : files du
+        PolitenessScheduler, attente de robots.txt et fetchs en vol.
+        """
+        waiting = (item for items in self._robots_wait.values() for item in items)
+        return chain(self.politeness.pending(), waiting, ((url, 1.0) for url in in_flight))
+
+    def _maybe_checkpoint(self, frontier: Frontier, in_flight: Iterable[str] = ()):
+        interval = self.cfg.output.checkpoint_interval
+        if interval > 0 and time.monotonic() - self._last_checkpoint >= interval:
+            self._save_checkpoint(frontier, in_flight)
+
+    def _save_checkpoint(self, frontier: Frontier, in_flight: Iterable[str] = ()):
+        """
+        Écrit l'état complet du crawl (frontier, URLs vues, compteurs,
+        offsets des writers) dans un checkpoint binaire atomique.
+        Les pages en cours (en vol, en attente de politesse) sont
+        remises en file à la reprise ; les pages fetchées sont d'abord
+        menées au bout du pipeline, puis les writers sont synchronisés
+        sur disque, pour que leurs offsets soient durables.
+        """
+        self._last_checkpoint = time.monotonic()
+        if self._checkpoint_path is None:
+            return
+        self._drain_pipeline(frontier, wait=True)
+        t = time.monotonic()
+        metrics = asdict(self.metrics)
+        for key in ("start_time", "end_time"):
+            metrics.pop(key)
+        state = {
+            "job_name": self.cfg.job_name,
+            "metrics": metrics,
+            "duration_sec": self.metrics.duration_sec,
+            "domain_counts": dict(self.scheduler.domain_counts),
+            "domains_seen": sorted(self.domains_seen),
+            "writers": {"raw": self.raw_writer.sync(), "filtered": self.filtered_writer.sync()},
+        }
+        ckpt = CheckpointWriter(self._checkpoint_path)
+        try:
+            ckpt.json("state", state)
+            ckpt.urls("frontier", frontier.items())
+            ckpt.urls("admitted", self._pending_admitted(in_flight))
+            self.url_store.save(ckpt, "url_store")
+            self.scheduler.save(ckpt, "scheduler")
+            self.url_filter.save(ckpt, "url_filter")
+        except BaseException:
+            ckpt.abort()
+            raise
+        ckpt.commit()
+        logger.info(
+            "Checkpoint written to %s (%d URLs queued, %.2f s)",
+            self._checkpoint_path,
+            len(frontier),
+            time.monotonic() - t,
+        )
+
+    def _restore_checkpoint(self, frontier: Frontier):
+        ckpt = self._resume_from
+        state = ckpt.json("state")
+
+        # frontier d'abord (elle marque ses URLs dans le store), puis le store complet
+        for url, priority in ckpt.urls("frontier"):
+            if frontier.add(url, priority):
+                self.scheduler.enqueue(url)
+        self.url_store.load(ckpt, "url_store")
+        # déjà admises (robots.txt, budget du domaine) : directement en file par host
+        readmitted = 0
+        for url, priority in ckpt.urls("admitted"):
+            if not (self.cfg.crawler.obey_robots_txt and self._wait_for_robots(url, priority)):
+                self.politeness.push(url, priority)
+            self.scheduler.enqueue(url)
+            readmitted += 1
+        self.scheduler.load(ckpt, "scheduler")
+        self.url_filter.load(ckpt, "url_filter")
+
+        self.scheduler.domain_counts.update(state["domain_counts"])
+        self.domains_seen.update(state["domains_seen"])
+        for key, value in state["metrics"].items():
+            setattr(self.metrics, key, value)
+        self.metrics.start_time = time.time() - state["duration_sec"]
+
+        ckpt.close()
+        self._resume_from = None
+        logger.info(
+            "Resumed crawl: %d pages fetched, %d kept, %d URLs queued, %d re-queued",
+            self.metrics.pages_fetched,
+            self.metrics.pages_kept,
+            len(frontier),
+            readmitted,
+        )
 
-        frontier = Frontier()
-        frontier.extend(seed_urls)
+    def _collect_network_metrics(self):
+        self.metrics.requests_sent = self.fetcher.pool_stats.requests
+        self.metrics.connections_opened = self.fetcher.pool_stats.connections_opened
+        if self.fetcher.dns_cache is not None:
+            self.metrics.dns_hits = self.fetcher.dns_cache.hits
+            self.metrics.dns_misses = self.fetcher.dns_cache.misses
 
-        while len(frontier) > 0:
+    def _run_sequential(self, frontier: Frontier):
+        while True:
             if self._global_limits_reached():
                 break
 
-            url = frontier.pop()
+            url = self._next_url(frontier)
             if url is None:
-                break
-            if url in self.visited_urls:
-                logger.debug("Already visited, skipping: %s", url)
-                continue
-            self.visited_urls.add(url)
-
-            if self.cfg.crawler.obey_robots_txt and not self.robots.allowed(url):
-                logger.debug("Disallowed by robots.txt, skipping: %s", url)
-                continue
-            if not self.scheduler.can_crawl(url):
-                logger.debug("Domain page limit reached, skipping: %s", url)
+                delay = self._wait_time()
+                if delay is None:
+                    break
+                time.sleep(delay)
                 continue
 
             logger.info("Crawling URL [%d fetched so far]: %s", self.metrics.pages_fetched, url)
-            html = self.fetcher.fetch(url)
-            if not html:
-                logger.debug("Empty HTML, skipping: %s", url)
-                continue
-
-            # Découverte de nouveaux liens sur le même domaine
-            discovered = extract_links_same_domain(html, url)
-            if discovered:
-                # Ici, on laisse le scheduler filtrer grossièrement
-                allowed = self.scheduler.filter_urls(discovered)
-                if allowed:
-                    logger.debug(
-                        "Discovered %d links (allowed=%d) from %s",
-                        len(discovered),
-                        len(allowed),
-                        url,
-                    )
-                    frontier.extend(allowed)
-
-            self.metrics.pages_fetched += 1
-            self.scheduler.mark_crawled(url)
-
-            parsed = urlparse(url)
-            self.domains_seen.add(parsed.netloc)
-
-            # Extraction texte
-            text = html_to_text(html, url=url)
-            if not text:
-                logger.debug("No text extracted, skipping: %s", url)
-                continue
-            if len(text) < self.cfg.relevance.min_chars:
-                logger.debug(
-                    "Text too short (%d chars < min_chars=%d), skipping: %s",
-                    len(text),
-                    self.cfg.relevance.min_chars,
+            page = self._after_fetch(url, self.fetcher.fetch_result(url, self._new_page(url)))
+            self._process_page(frontier, url, page)
+            self._maybe_checkpoint(frontier)
+
+    def _run_concurrent(self, frontier: Frontier):
+        """
+        Garde jusqu'à max_concurrent_requests fetchs en vol et traite les
+        pages dans leur ordre d'arrivée.
+        """
+        max_in_flight = max(1, self.cfg.crawler.max_concurrent_requests)
+        in_flight: Dict[Future, str] = {}
+        # pages en cours de téléchargement qui publient leurs liens
+        publishing: Dict[Future, StreamingPage] = {}
+
+        while True:
+            # recalculé à chaque tour : un fetch réessayé rend sa place au budget
+            stopping = False
+            while len(in_flight) < max_in_flight:
+                if self._global_limits_reached(in_flight=len(in_flight)):
+                    stopping = True
+                    break
+                url = self._next_url(frontier)
+                if url is None:
+                    break
+                logger.info(
+                    "Crawling URL [%d fetched so far, %d in flight]: %s",
+                    self.metrics.pages_fetched,
+                    len(in_flight),
                     url,
                 )
+                self.scheduler.reserve(url)
+                page = self._new_page(url, publish_links=self._publish_links)
+                fut = self.fetcher.submit(url, page)
+                in_flight[fut] = url
+                if page is not None and page.publish_links:
+                    publishing[fut] = page
+
+            # on se réveille au plus tard quand le prochain host devient éligible
+            if stopping or len(in_flight) >= max_in_flight:
+                delay = None
+            else:
+                delay = self._wait_time()
+            if not in_flight:
+                if stopping or delay is None:
+                    break
+                time.sleep(delay)
                 continue
 
-            # Langue
-            lang = detect_lang(text)
-            logger.debug("Detected language for %s: %s", url, lang)
-            if self.cfg.languages and lang not in self.cfg.languages:
-                logger.debug(
-                    "Language %s not in allowed list %s, skipping: %s",
-                    lang,
-                    self.cfg.languages,
-                    url,
-                )
-                continue
-
-            # Pertinence
-            score = self.relevance.score(text)
+            done, _ = wait(in_flight, timeout=delay, return_when=FIRST_COMPLETED)
+            for fut in done:
+                url = in_flight.pop(fut)
+                streaming = publishing.pop(fut, None)
+                self.scheduler.release(url)
+                page = self._after_fetch(url, fut.result())
+                # liens publiés gardés jusqu'ici : en frontier seulement si la
+                # page est acceptée (pas de retry, ni d'abandon sur la taille,
+                # le délai ou le Content-Type), sans attendre le pipeline
+                if streaming is not None and page is streaming:
+                    self._enqueue_links(frontier, url, page.drain_links(), 0.0, page.depth)
+                self._process_page(frontier, url, page)
+            self._maybe_checkpoint(frontier, in_flight.values())
+
+    def _new_page(self, url: str, publish_links: bool = False) -> Optional[StreamingPage]:
+        """
+        Page à parser pendant le fetch (stream_parse), None sinon.
+        Avec un pool de parse, pas d'arbre pendant le fetch : le processus
+        du pool parse la page une seule fois (liens, texte, langue) et
+        l'arbre ne peut pas lui être transmis.
+        """
+        if not self.cfg.crawler.stream_parse or self._parse_pool is not None:
+            return None
+        return StreamingPage(url, publish_links=publish_links)
+
+    def _after_fetch(self, url: str, result: FetchResult) -> Optional[Page]:
+        """
+        Applique le contrôle de débit par host (AIMD, retries, circuit
+        breaker) puis libère le host dans le PolitenessScheduler.
+        Rend la page à traiter (None si rien à traiter ou retry planifié),
+        déjà parsée si elle l'a été pendant le fetch.
+        """
+        host = self.politeness.host_of(url)
+        decision = self.rate.on_result(host, result)
+        if decision.retry:
             logger.debug(
-                "Relevance score for %s: %.4f (threshold=%.4f)",
+                "Transient failure for %s (%s), retry in >= %.1f s",
                 url,
-                score,
-                self.cfg.relevance.relevance_threshold,
+                result.error or f"HTTP {result.status}",
+                decision.delay,
             )
-            if score < self.cfg.relevance.relevance_threshold:
-                logger.debug("Score below threshold, skipping: %s", url)
+            self.politeness.push(url, front=True)
+            self.scheduler.requeue(url)
+
+        delay = None
+        if decision.delay is not None:
+            delay = max(decision.delay, self.politeness.delay_for(host))
+        self.politeness.release(url, delay=delay)
+
+        if decision.drop_host:
+            dropped = self.politeness.drop_host(host)
+            for dropped_url in dropped:
+                self.scheduler.dequeue(dropped_url, discard=True)
+            logger.info("Dropped %d queued URLs for failing host %s", len(dropped), host)
+
+        if decision.retry:
+            return None
+        depth = self.scheduler.finish(url)
+        if not result.html:
+            return None
+        page = result.page or Page(url, result.html)
+        page.depth = depth
+        return page
+
+    def _process_page(self, frontier: Frontier, url: str, page: Optional[Page]):
+        if page is None:
+            logger.debug("Empty HTML, skipping: %s", url)
+            return
+
+        self.metrics.pages_fetched += 1
+        self.scheduler.mark_crawled(url)
+
+        parsed = urlparse(url)
+        self.domains_seen.add(parsed.netloc)
+
+        # liens, texte, langue, pertinence et écriture : dans le pipeline
+        self.pipeline.submit(PageJob(page))
+        self._drain_pipeline(frontier)
+
+    def _drain_pipeline(self, frontier: Frontier, wait: bool = False):
+        """
+        Pages sorties du pipeline : leurs liens partent en frontier, avec
+        le score de la page (0 si elle n'a pas été notée).
+        Avec `wait`, attend que toutes les pages soumises soient traitées.
+        """
+        for job in self.pipeline.completed(wait=wait):
+            self._enqueue_links(frontier, job.url, job.links or [], job.score or 0.0, job.depth)
+
+    def _enqueue_links(
+        self,
+        frontier: Frontier,
+        url: str,
+        links: List[Link],
+        parent_score: float,
+        parent_depth: int,
+    ):
+        if not links:
+            return
+        # binaires et pièges écartés par le filtre d'URLs ; le scheduler
+        # refuse ensuite les liens que le budget du domaine (ou la
+        # profondeur max) ne permettra jamais de crawler
+        depth = parent_depth + 1
+        added = 0
+        for link in links:
+            if link.url in self.url_store or not self.url_filter.allowed(link.url):
                 continue
+            if not self.scheduler.can_enqueue(link.url, depth):
+                continue
+            if frontier.add(link.url, self.link_scorer.priority(link, parent_score)):
+                self.scheduler.enqueue(link.url, depth)
+                added += 1
+        if added:
+            logger.debug(
+                "Discovered %d links (enqueued=%d) from %s",
+                len(links),
+                added,
+                url,
+            )
 
-            # RAW
-            raw_obj = {
-                "url": url,
-                "domain": parsed.netloc,
-                "lang": lang,
-                "text": text,
-            }
-            raw_line = json.dumps(raw_obj, ensure_ascii=False) + "\n"
-            self.raw_writer.write(raw_line)
-
-            # FILTERED
-            filt_obj = {
-                "url": url,
-                "domain": parsed.netloc,
-                "lang": lang,
-                "text": text,
-                "score_relevance": score,
-            }
-            filt_line = json.dumps(filt_obj, ensure_ascii=False) + "\n"
-            self.filtered_writer.write(filt_line)
-
-            self.metrics.pages_kept += 1
-            self.metrics.total_bytes_written += estimate_bytes(filt_line)
-
-        self.metrics.finish()
-        self.raw_writer.close()
-        self.filtered_writer.close()
+    def _parse_stage(self, job: PageJob) -> bool:
+        """
+        Stage parse : liens, texte et langue, dans un processus du pool
+        (un seul parse, depuis le HTML) ou dans le thread du stage (depuis
+        l'arbre construit pendant le fetch, s'il existe).
+        """
+        page = job.page
+        min_chars = self.cfg.relevance.min_chars
+        pool = self._parse_pool
+        if pool is not None:
+            # page parsée pendant le fetch avant l'ouverture du pool : liens déjà là
+            with_links = not page.links_ready
+            try:
+                links, job.text, job.lang = pool.submit(
+                    analyze_html, page.url, page.html, min_chars, with_links
+                ).result()
+            except BrokenProcessPool:
+                if self._parse_pool is pool:
+                    logger.error("Parse process pool is broken, parsing in the pipeline threads from now on")
+                    self._parse_pool = None
+            else:
+                job.links = links if with_links else page.links()
+                return True
+        job.links, job.text, job.lang = analyze_page(page, min_chars)
+        return True
+
+    def _score_stage(self, job: PageJob) -> bool:
+        """
+        Stage score : longueur, langue, pertinence. True si la page est
+        gardée (elle passe alors à l'écriture).
+        """
+        url = job.url
+        text = job.text
+        if not text:
+            logger.debug("No text extracted, skipping: %s", url)
+            return False
+        if len(text) < self.cfg.relevance.min_chars:
+            logger.debug(
+                "Text too short (%d chars < min_chars=%d), skipping: %s",
+                len(text),
+                self.cfg.relevance.min_chars,
+                url,
+            )
+            return False
 
-        logger.info(
-            "Crawl finished: pages_fetched=%d, pages_kept=%d, domains_seen=%d, bytes_written=%.2f MB, duration=%.1f s",
-            self.metrics.pages_fetched,
-            self.metrics.pages_kept,
-            len(self.domains_seen),
-            self.metrics.total_bytes_written / (1024 * 1024),
-            self.metrics.duration_sec,
+        # Langue
+        lang = job.lang
+        logger.debug("Detected language for %s: %s", url, lang)
+        if self.cfg.languages and lang not in self.cfg.languages:
+            logger.debug(
+                "Language %s not in allowed list %s, skipping: %s",
+                lang,
+                self.cfg.languages,
+                url,
+            )
+            return False
+
+        # Pertinence
+        score = job.score = self.relevance.score(text)
+        logger.debug(
+            "Relevance score for %s: %.4f (threshold=%.4f)",
+            url,
+            score,
+            self.cfg.relevance.relevance_threshold,
         )
+        if score < self.cfg.relevance.relevance_threshold:
+            logger.debug("Score below threshold, skipping: %s", url)
+            return False
+
+        domain = urlparse(url).netloc
+
+        # RAW
+        raw_obj = {
+            "url": url,
+            "domain": domain,
+            "lang": lang,
+            "text": text,
+        }
+        raw_line = json.dumps(raw_obj, ensure_ascii=False) + "\n"
+
+        # FILTERED
+        filt_obj = {
+            "url": url,
+            "domain": domain,
+            "lang": lang,
+            "text": text,
+            "score_relevance": score,
+        }
+        filt_line = json.dumps(filt_obj, ensure_ascii=False) + "\n"
+
+        job.lines = (raw_line, filt_line)
+        return True
+
+    def _write_stage(self, job: PageJob) -> bool:
+        """
+        Stage écriture (un seul thread) : lignes RAW / FILTERED et compteurs.
+        """
+        raw_line, filt_line = job.lines
+        self.raw_writer.write(raw_line)
+        self.filtered_writer.write(filt_line)
+
+        self.metrics.pages_kept += 1
+        self.metrics.total_bytes_written += estimate_bytes(filt_line)
+        return True
@@ -11,6 +11,10 @@ class CrawlMetrics:
     pages_fetched: int = 0
     pages_kept: int = 0
     total_bytes_written: int = 0
+    requests_sent: int = 0
+    connections_opened: int = 0
+    dns_hits: int = 0
+    dns_misses: int = 0
 
     def finish(self):
         self.end_time = time.time()
@@ -20,3 +24,17 @@ class CrawlMetrics:
         if self.end_time is None:
             return time.time() - self.start_time
         return self.end_time - self.start_time
+
+    @property
+    def harvest_rate(self) -> float:
+        # pages gardées par page fetchée (efficacité du crawl focalisé)
+        if self.pages_fetched == 0:
+            return 0.0
+        return self.pages_kept / self.pages_fetched
+
+    @property
+    def pool_hit_rate(self) -> float:
+        # part des requêtes servies par une connexion keep-alive déjà ouverte
+        if self.requests_sent == 0:
+            return 0.0
+        return max(0.0, 1.0 - self.connections_opened / self.requests_sent)
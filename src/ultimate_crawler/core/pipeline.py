@@ -0,0 +1,192 @@
+# src/ultimate_crawler/core/pipeline.py
+
+from __future__ import annotations
+
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Tuple
+import logging
+
+from ..crawl.links import Link
+from ..crawl.page import Page
+from ..relevance.language import detect_lang
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+@dataclass
+class PageJob:
+    """
+    Page fetchée qui traverse le pipeline (parse -> score -> écriture),
+    complétée stage par stage. Une fois terminé, le job ne garde que ce
+    dont la frontier a besoin (voir release()).
+    """
+    page: Optional[Page]
+    links: Optional[List[Link]] = None
+    text: Optional[str] = None
+    lang: Optional[str] = None
+    score: Optional[float] = None
+    lines: Optional[Tuple[str, str]] = None  # (raw, filtered) si la page est gardée
+    url: str = field(init=False)
+    depth: int = field(init=False)
+
+    def __post_init__(self):
+        self.url = self.page.url
+        self.depth = self.page.depth
+
+    def release(self):
+        """
+        Job terminé : la page (HTML et arbre lxml), le texte et les lignes
+        écrites sont libérés ; restent url, liens, score et profondeur.
+        """
+        self.page = None
+        self.text = None
+        self.lines = None
+
+
+def analyze_page(
+    page: Page, min_chars: int, with_links: bool = True
+) -> Tuple[Optional[List[Link]], Optional[str], Optional[str]]:
+    """
+    Liens (si `with_links`), texte trafilatura et langue (seulement si
+    le texte fait au moins `min_chars`), depuis le même arbre lxml.
+    """
+    links = page.links() if with_links else None
+    text = page.text()
+    lang = detect_lang(text) if text and len(text) >= min_chars else None
+    return links, text, lang
+
+
+def analyze_html(
+    url: str, html: str, min_chars: int, with_links: bool
+) -> Tuple[Optional[List[Link]], Optional[str], Optional[str]]:
+    """
+    analyze_page depuis le HTML brut : tourne dans les processus du
+    stage de parse (arguments et résultat picklables).
+    """
+    return analyze_page(Page(url, html), min_chars, with_links)
+
+
+class Stage:
+    """
+    Stage du pipeline : `workers` threads qui appliquent `fn` aux jobs
+    d'une file bornée à `maxsize`. `fn` rend True pour passer le job au
+    stage suivant, False pour le terminer là.
+    Une file pleine bloque le stage précédent (contre-pression).
+    """
+
+    def __init__(self, name: str, fn: Callable[[PageJob], bool], workers: int, maxsize: int):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.queue: "queue.Queue" = queue.Queue(maxsize=max(1, maxsize))
+        self.next: Optional[Stage] = None
+        self._threads: List[threading.Thread] = []
+
+    def start(self, done: Callable[[PageJob], None]):
+        for i in range(self.workers):
+            t = threading.Thread(
+                target=self._loop,
+                args=(done,),
+                name=f"pipeline-{self.name}-{i}",
+                daemon=True,
+            )
+            t.start()
+            self._threads.append(t)
+
+    def _loop(self, done: Callable[[PageJob], None]):
+        while True:
+            job = self.queue.get()
+            if job is _STOP:
+                return
+            try:
+                forward = self.fn(job)
+            except Exception as e:
+                logger.warning("Pipeline stage %s failed for %s: %r", self.name, job.url, e)
+                forward = False
+            if forward and self.next is not None:
+                self.next.queue.put(job)
+            else:
+                done(job)
+
+    def stop(self):
+        for _ in self._threads:
+            self.queue.put(_STOP)
+        for t in self._threads:
+            t.join()
+
+
+class Pipeline:
+    """
+    Chaîne de stages reliés par des files bornées. Le thread du
+    JobRunner soumet les pages fetchées (submit bloque quand le premier
+    stage est plein) et récupère les jobs terminés via completed().
+
+    Avec `threaded=False`, submit() exécute les stages en ligne, dans le
+    thread appelant (même comportement qu'un traitement séquentiel).
+    """
+
+    def __init__(self, stages: List[Stage], threaded: bool = True):
+        self.stages = stages
+        self.threaded = threaded
+        for stage, nxt in zip(stages, stages[1:]):
+            stage.next = nxt
+        self._completed: "queue.Queue[PageJob]" = queue.Queue()
+        self._pending = 0
+        self._cond = threading.Condition()
+        if threaded:
+            for stage in stages:
+                stage.start(self._done)
+
+    def _done(self, job: PageJob):
+        # la file n'est vidée qu'au prochain tour du JobRunner : sans la
+        # page ni son arbre, les jobs qui s'y accumulent restent légers
+        job.release()
+        self._completed.put(job)
+        with self._cond:
+            self._pending -= 1
+            self._cond.notify_all()
+
+    def submit(self, job: PageJob):
+        with self._cond:
+            self._pending += 1
+        if self.threaded:
+            self.stages[0].queue.put(job)
+            return
+        for stage in self.stages:
+            try:
+                if not stage.fn(job):
+                    break
+            except Exception as e:
+                logger.warning("Pipeline stage %s failed for %s: %r", stage.name, job.url, e)
+                break
+        self._done(job)
+
+    def pending(self) -> int:
+        """
+        Jobs soumis dont le résultat n'a pas encore été rendu par completed().
+        """
+        with self._cond:
+            return self._pending + self._completed.qsize()
+
+    def completed(self, wait: bool = False) -> Iterator[PageJob]:
+        """
+        Jobs terminés depuis le dernier appel. Avec `wait`, attend d'abord
+        que tous les jobs soumis soient terminés.
+        """
+        if wait:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending == 0)
+        while True:
+            try:
+                yield self._completed.get_nowait()
+            except queue.Empty:
+                return
+
+    def close(self):
+        if self.threaded:
+            for stage in self.stages:
+                stage.stop()
@@ -0,0 +1,300 @@
+# src/ultimate_crawler/crawl/async_fetcher.py
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+from urllib.parse import urlparse
+import logging
+
+from ..config.loader import CrawlerConfig
+from .fetcher import (
+    CHUNK_SIZE,
+    ROBOTS_MAX_BYTES,
+    FetchResult,
+    PoolStats,
+    accept_content_length,
+    accept_content_type,
+    accept_status,
+    build_http_cache,
+    decode_body,
+    parse_retry_after,
+)
+from .dns_cache import install_dns_cache
+from .http_cache import HTTPCache
+
+if TYPE_CHECKING:
+    from .page import StreamingPage
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFetcher:
+    """
+    Moteur de fetch asyncio (httpx.AsyncClient).
+    Garde jusqu'à `max_concurrent_requests` requêtes en vol, tous domaines
+    confondus. La boucle asyncio tourne dans un thread dédié : le reste du
+    pipeline reste synchrone et récupère les pages via des futures.
+    La politesse par host est gérée en amont (PolitenessScheduler).
+
+    Le parse des corps (StreamingPage, sitemaps) tourne dans un thread
+    dédié, hors de la boucle : une grosse page ne bloque pas les autres
+    requêtes en vol. Les chunks lui sont passés sans attendre, dans
+    l'ordre (un seul thread), et la fin du corps attend leur parse.
+
+    Avec `http2: true`, les requêtes vers un même host sont multiplexées sur
+    une seule connexion HTTP/2 (négociée via ALPN, repli HTTP/1.1 sinon).
+    httpx annonce et décode brotli / zstd dès que `brotli` / `zstandard`
+    sont installés.
+
+    Nécessite:
+      pip install httpx          (+ httpx[http2] pour HTTP/2)
+    """
+
+    def __init__(self, cfg: CrawlerConfig):
+        self.cfg = cfg
+        try:
+            import httpx  # type: ignore
+        except ImportError:
+            raise RuntimeError("httpx is not installed. Run `pip install httpx`.")
+        self._httpx = httpx
+        if cfg.http2:
+            try:
+                import h2  # type: ignore  # noqa: F401
+            except ImportError:
+                raise RuntimeError("h2 is not installed. Run `pip install httpx[http2]`.")
+        self._playwright_fetcher = None
+        self.cache = build_http_cache(cfg)
+        self.pool_stats = PoolStats()
+        self.dns_cache = install_dns_cache(cfg.dns_cache_ttl)
+
+        self._parse_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-fetcher-parse")
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="async-fetcher",
+            daemon=True,
+        )
+        self._thread.start()
+
+        # client + sémaphore doivent être créés dans la boucle du thread
+        self._run(self._setup()).result()
+        logger.info(
+            "AsyncFetcher initialized with UA=%s, max_concurrent_requests=%d, http2=%s, Accept-Encoding=%s",
+            cfg.user_agent,
+            cfg.max_concurrent_requests,
+            cfg.http2,
+            self._client.headers.get("Accept-Encoding"),
+        )
+
+    def _run(self, coro) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def _setup(self):
+        self._client = self._httpx.AsyncClient(
+            headers={"User-Agent": self.cfg.user_agent},
+            timeout=self.cfg.request_timeout,
+            follow_redirects=True,
+            http2=self.cfg.http2,
+            verify=self.cfg.tls_verify,
+            limits=self._httpx.Limits(
+                max_connections=self.cfg.pool_max_connections,
+                max_keepalive_connections=self.cfg.pool_max_connections,
+                keepalive_expiry=self.cfg.keepalive_expiry,
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(max(1, self.cfg.max_concurrent_requests))
+        # httpx ne limite pas par host : sémaphore par netloc
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        sem = self._host_semaphores.get(host)
+        if sem is None:
+            sem = self._host_semaphores[host] = asyncio.Semaphore(max(1, self.cfg.pool_max_per_host))
+        return sem
+
+    async def _trace(self, event_name: str, info):
+        if event_name == "connection.connect_tcp.complete":
+            self.pool_stats.count_connection()
+
+    def _get_playwright_fetcher(self):
+        if self._playwright_fetcher is None:
+            from .playwright_fetcher import PlaywrightFetcher
+            self._playwright_fetcher = PlaywrightFetcher(self.cfg)
+        return self._playwright_fetcher
+
+    def submit(self, url: str, page: Optional["StreamingPage"] = None) -> "Future[FetchResult]":
+        """
+        Planifie le fetch de `url` et rend la main immédiatement.
+        Si `page` est fourni, le corps y est parsé au fil des chunks,
+        dans le thread de parse (voir StreamingPage).
+        """
+        return self._run(self._fetch(url, page))
+
+    def fetch(self, url: str) -> Optional[str]:
+        """
+        Même contrat que Fetcher.fetch : HTML (str) ou None.
+        """
+        return self.fetch_result(url).html
+
+    def fetch_result(self, url: str, page: Optional["StreamingPage"] = None) -> FetchResult:
+        return self.submit(url, page).result()
+
+    async def _fetch(self, url: str, page: Optional["StreamingPage"] = None) -> FetchResult:
+        async with self._semaphore, self._host_semaphore(url):
+            return await self._fetch_once(url, page)
+
+    async def _fetch_once(self, url: str, page: Optional["StreamingPage"] = None) -> FetchResult:
+        if self.cfg.use_playwright:
+            logger.debug("Using Playwright for %s", url)
+            try:
+                html = await asyncio.wrap_future(self._get_playwright_fetcher().submit(url))
+                return FetchResult(url, html=html)
+            except Exception as e:
+                logger.warning("Playwright fetch failed for %s, fallback to httpx: %r", url, e)
+
+        logger.debug("Fetching URL via httpx: %s", url)
+        result = FetchResult(url)
+        try:
+            await asyncio.wait_for(self._fetch_http(result, page), timeout=self.cfg.fetch_deadline)
+        except asyncio.TimeoutError:
+            logger.info("Deadline (%.1f s) exceeded for %s, aborting.", self.cfg.fetch_deadline, url)
+            result.error = f"deadline of {self.cfg.fetch_deadline:.1f} s exceeded"
+            result.abort = "deadline"
+        except Exception as e:
+            logger.warning("Request error for %s: %r", url, e)
+            result.error = repr(e)
+        return result
+
+    async def _fetch_http(self, result: FetchResult, page: Optional["StreamingPage"] = None):
+        url = result.url
+        cached = await asyncio.to_thread(self.cache.get, url) if self.cache else None
+        headers = HTTPCache.conditional_headers(cached)
+        self.pool_stats.count_request()
+        async with self._client.stream(
+            "GET", url, headers=headers, extensions={"trace": self._trace}
+        ) as resp:
+            result.status = resp.status_code
+            result.http_version = resp.http_version
+            if resp.status_code == 304 and cached is not None:
+                # corps vide : on le lit pour rendre la connexion au pool
+                await resp.aread()
+                result.html = self.cache.not_modified(cached)
+                return
+            if not accept_status(url, resp.status_code):
+                result.retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                return
+            if not accept_content_type(url, resp.headers.get("Content-Type"), self.cfg.allowed_content_types):
+                return
+            if not accept_content_length(url, resp.headers.get("Content-Length"), self.cfg.max_body_bytes):
+                return
+
+            # taille bornée après décompression ; le temps total est borné par wait_for
+            if page is not None:
+                page.start(resp.headers.get("Content-Type"))
+            # sans chunk_size, httpx rend les octets dès leur arrivée (pas de
+            # regroupement par CHUNK_SIZE) : le parse suit le réseau, sans
+            # que la boucle attende chaque chunk
+            buf = bytearray()
+            async for chunk in resp.aiter_bytes():
+                buf += chunk
+                if page is not None:
+                    self._parse_executor.submit(page.feed, chunk)
+                if len(buf) > self.cfg.max_body_bytes:
+                    logger.info("Body > max_body_bytes=%d for %s, aborting.", self.cfg.max_body_bytes, url)
+                    result.abort = "size"
+                    return
+
+        logger.debug("Fetched %s (%d bytes, status=%d, %s)",
+                     url, len(buf), resp.status_code, resp.http_version)
+        result.html = decode_body(bytes(buf), resp.headers.get("Content-Type"))
+        if page is not None:
+            # après les feed() déjà soumis (même thread, ordre FIFO)
+            await asyncio.get_running_loop().run_in_executor(self._parse_executor, page.finish, result.html)
+            result.page = page
+        if self.cache:
+            await asyncio.to_thread(self.cache.put, url, resp.headers, result.html)
+
+    def submit_robots(self, url: str) -> "Future[FetchResult]":
+        return self._run(self._fetch_robots(url))
+
+    def fetch_robots(self, url: str) -> FetchResult:
+        """
+        Même contrat que Fetcher.fetch_robots : texte de robots.txt dans `html`.
+        """
+        return self.submit_robots(url).result()
+
+    async def _fetch_robots(self, url: str) -> FetchResult:
+        result = FetchResult(url)
+        async with self._semaphore, self._host_semaphore(url):
+            try:
+                await asyncio.wait_for(self._fetch_robots_http(result), timeout=self.cfg.fetch_deadline)
+            except asyncio.TimeoutError:
+                result.error = f"deadline of {self.cfg.fetch_deadline:.1f} s exceeded"
+            except Exception as e:
+                logger.debug("robots.txt request error for %s: %r", url, e)
+                result.error = repr(e)
+        return result
+
+    async def _fetch_robots_http(self, result: FetchResult):
+        self.pool_stats.count_request()
+        async with self._client.stream("GET", result.url, extensions={"trace": self._trace}) as resp:
+            result.status = resp.status_code
+            if resp.status_code >= 400:
+                await resp.aread()
+                result.retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                return
+            buf = bytearray()
+            async for chunk in resp.aiter_bytes(CHUNK_SIZE):
+                buf += chunk
+                if len(buf) >= ROBOTS_MAX_BYTES:
+                    break
+        result.html = decode_body(bytes(buf[:ROBOTS_MAX_BYTES]), resp.headers.get("Content-Type"))
+
+    def fetch_sitemap(self, url: str, feed: Callable[[bytes], None]) -> FetchResult:
+        """
+        Même contrat que Fetcher.fetch_sitemap ; `feed` est appelé dans
+        le thread de parse, chunk par chunk, dans l'ordre.
+        """
+        return self._run(self._fetch_sitemap(url, feed)).result()
+
+    async def _fetch_sitemap(self, url: str, feed: Callable[[bytes], None]) -> FetchResult:
+        result = FetchResult(url)
+        async with self._semaphore, self._host_semaphore(url):
+            try:
+                await asyncio.wait_for(self._fetch_sitemap_http(result, feed), timeout=self.cfg.fetch_deadline)
+            except asyncio.TimeoutError:
+                result.error = f"deadline of {self.cfg.fetch_deadline:.1f} s exceeded"
+            except Exception as e:
+                logger.debug("Sitemap request error for %s: %r", url, e)
+                result.error = repr(e)
+        return result
+
+    async def _fetch_sitemap_http(self, result: FetchResult, feed: Callable[[bytes], None]):
+        self.pool_stats.count_request()
+        async with self._client.stream("GET", result.url, extensions={"trace": self._trace}) as resp:
+            result.status = resp.status_code
+            if resp.status_code >= 400:
+                await resp.aread()
+                return
+            last_feed = None
+            async for chunk in resp.aiter_bytes():
+                last_feed = self._parse_executor.submit(feed, chunk)
+            if last_feed is not None:
+                await asyncio.wrap_future(last_feed)
+
+    def close(self):
+        if self._loop.is_closed():
+            return
+        if self.cache:
+            self.cache.log_stats()
+        if self._playwright_fetcher is not None:
+            self._playwright_fetcher.close()
+        self._run(self._client.aclose()).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._parse_executor.shutdown()
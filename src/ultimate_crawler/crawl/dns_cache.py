@@ -0,0 +1,119 @@
+# src/ultimate_crawler/crawl/dns_cache.py
+
+from __future__ import annotations
+
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+_original_getaddrinfo = socket.getaddrinfo
+_installed: Optional["DNSCache"] = None
+_install_lock = threading.Lock()
+
+
+class DNSCache:
+    """
+    Cache de résolution DNS en process, partagé par tous les workers
+    (threads du fetcher sync, boucle asyncio) : on remplace
+    socket.getaddrinfo, utilisé par requests/urllib3 comme par httpx.
+    Le remplacement vaut pour tout le process, pas seulement pour le
+    crawler (autres bibliothèques, application qui embarque le crawler) :
+    désactivé par défaut (dns_cache_ttl: 0). Chromium (Playwright) résout
+    dans son propre process et n'en profite pas.
+
+    Le TTL des enregistrements est respecté si `dnspython` est installé
+    (borné par `max_ttl`) ; sinon chaque entrée vit `max_ttl` secondes.
+    Les échecs ne sont pas mis en cache.
+    """
+
+    def __init__(self, max_ttl: float):
+        self.max_ttl = max_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple, Tuple[float, List]] = {}
+        try:
+            import dns.resolver  # type: ignore
+            self._resolver = dns.resolver.Resolver()
+        except ImportError:
+            self._resolver = None
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        key = (host, port, family, type, proto, flags)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        result, ttl = self._resolve(host, port, family, type, proto, flags)
+        with self._lock:
+            self._entries[key] = (now + ttl, result)
+        return result
+
+    def _resolve(self, host, port, family, type, proto, flags):
+        if self._resolver is not None and isinstance(host, str) and not _is_ip(host):
+            try:
+                return self._resolve_with_ttl(host, port, family, type, proto, flags)
+            except Exception as e:
+                logger.debug("dnspython lookup failed for %s (%r), using getaddrinfo", host, e)
+        return _original_getaddrinfo(host, port, family, type, proto, flags), self.max_ttl
+
+    def _resolve_with_ttl(self, host, port, family, type, proto, flags):
+        rdtypes = []
+        if family in (0, socket.AF_INET):
+            rdtypes.append("A")
+        if family in (0, socket.AF_INET6):
+            rdtypes.append("AAAA")
+
+        result: List = []
+        ttl = self.max_ttl
+        for rdtype in rdtypes:
+            try:
+                answer = self._resolver.resolve(host, rdtype)
+            except Exception:
+                continue
+            ttl = min(ttl, answer.rrset.ttl)
+            for rr in answer:
+                result.extend(_original_getaddrinfo(
+                    rr.address, port, family, type, proto, flags | socket.AI_NUMERICHOST
+                ))
+        if not result:
+            raise socket.gaierror(socket.EAI_NONAME, f"no A/AAAA record for {host}")
+        return result, ttl
+
+
+def _is_ip(host: str) -> bool:
+    for fam in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(fam, host)
+            return True
+        except OSError:
+            continue
+    return False
+
+
+def install_dns_cache(max_ttl: float) -> Optional[DNSCache]:
+    """
+    Installe (une seule fois par process) le cache DNS partagé, en
+    remplaçant socket.getaddrinfo. `max_ttl <= 0` désactive le cache.
+    """
+    global _installed
+    if max_ttl <= 0:
+        return None
+    with _install_lock:
+        if _installed is None:
+            _installed = DNSCache(max_ttl)
+            socket.getaddrinfo = _installed.getaddrinfo
+            logger.info(
+                "DNS cache installed (max_ttl=%.0f s, record TTLs=%s)",
+                max_ttl,
+                _installed._resolver is not None,
+            )
+        return _installed
@@ -1,23 +1,260 @@
 # src/ultimate_crawler/crawl/fetcher.py
 
+import re
+import threading
 import time
-from typing import Optional
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
 import logging
 
 from ..config.loader import CrawlerConfig
+from .dns_cache import install_dns_cache
+from .http_cache import HTTPCache
+
+if TYPE_CHECKING:
+    from .page import StreamingPage
 
 logger = logging.getLogger(__name__)
 
+CHUNK_SIZE = 64 * 1024
+
+# réponses qui méritent un nouvel essai plus tard (surcharge, panne passagère)
+TRANSIENT_STATUSES = {429, 500, 502, 503, 504}
+THROTTLE_STATUSES = {429, 503}
+MAX_RETRY_AFTER = 3600.0
+
+# seuls les 500 premiers Kio de robots.txt sont lus (RFC 9309)
+ROBOTS_MAX_BYTES = 500 * 1024
+
+# <meta charset="..."> ou <meta http-equiv="Content-Type" content="...; charset=...">
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_\-:.]+)', re.IGNORECASE)
+META_SNIFF_BYTES = 4096
+
+
+@dataclass
+class FetchResult:
+    """
+    Résultat détaillé d'un fetch. `html` suit le contrat de fetch()
+    (str ou None) ; le reste sert au contrôle de débit par host.
+    `page` : la StreamingPage passée au fetch, parsée pendant le
+    téléchargement (None si le corps ne l'a pas alimentée : 304, Playwright...).
+    `abort` : fetch abandonné par le crawler ("deadline" : fetch_deadline
+    dépassée, "size" : corps > max_body_bytes) ; définitif, pas de nouvel
+    essai (un hôte "goutte à goutte" garderait sinon son slot
+    (1 + max_retries) x fetch_deadline).
+    `http_version` : protocole négocié ("HTTP/1.1", "HTTP/2"), moteur
+    async seulement.
+    """
+    url: str
+    html: Optional[str] = None
+    status: Optional[int] = None
+    error: Optional[str] = None  # exception réseau / deadline
+    retry_after: Optional[float] = None
+    page: Optional["StreamingPage"] = None
+    abort: Optional[str] = None
+    http_version: Optional[str] = None
+
+    @property
+    def transient(self) -> bool:
+        if self.abort is not None:
+            return False
+        return self.error is not None or self.status in TRANSIENT_STATUSES
+
+    @property
+    def throttled(self) -> bool:
+        return self.status in THROTTLE_STATUSES
+
+
+class FetchDeadlineExceeded(TimeoutError):
+    pass
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After : nombre de secondes ou date HTTP (borné à 1 h).
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return min(float(value), MAX_RETRY_AFTER)
+    try:
+        delay = parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+    return min(max(0.0, delay), MAX_RETRY_AFTER)
+
+
+def accept_status(url: str, status_code: int) -> bool:
+    """
+    Politique commune aux moteurs de fetch : tout code >= 400 est ignoré.
+    """
+    if status_code >= 400:
+        logger.info("HTTP %d for %s, skipping.", status_code, url)
+        return False
+    return True
+
+
+def accept_content_type(url: str, content_type: Optional[str], allowed: List[str]) -> bool:
+    """
+    Rejette, sur les seuls headers, les réponses dont le Content-Type n'est
+    pas dans `allowed` (PDF, images, vidéos...). Sans header, on accepte.
+    """
+    if not content_type or not allowed:
+        return True
+    mime = content_type.split(";", 1)[0].strip().lower()
+    if mime in allowed:
+        return True
+    logger.info("Content-Type %s for %s, skipping.", mime, url)
+    return False
+
+
+def accept_content_length(url: str, content_length: Optional[str], max_bytes: int) -> bool:
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        logger.info("Content-Length %s > max_body_bytes=%d for %s, skipping.", content_length, max_bytes, url)
+        return False
+    return True
+
+
+def body_charset(head: bytes, content_type: Optional[str]) -> Optional[str]:
+    """
+    Charset du Content-Type, sinon du <meta charset> dans les
+    META_SNIFF_BYTES premiers octets du corps (`head`).
+    """
+    for param in (content_type or "").split(";")[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset":
+            charset = value.strip().strip('"\'')
+            if charset:
+                return charset
+    m = META_CHARSET_RE.search(head[:META_SNIFF_BYTES])
+    return m.group(1).decode("ascii") if m else None
+
+
+def decode_body(body: bytes, content_type: Optional[str]) -> str:
+    """
+    Décode le corps : charset du Content-Type, sinon <meta charset>, sinon utf-8.
+    """
+    charset = body_charset(body, content_type)
+    try:
+        return body.decode(charset or "utf-8", errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+def build_http_cache(cfg: CrawlerConfig) -> Optional[HTTPCache]:
+    if not cfg.http_cache_dir:
+        return None
+    return HTTPCache(Path(cfg.http_cache_dir), cfg.http_cache_max_mb)
+
+
+@dataclass
+class PoolStats:
+    """
+    Compteurs pour le taux de réutilisation du pool (voir CrawlMetrics),
+    incrémentés depuis plusieurs threads (boucle de crawl, préchargement
+    des robots.txt, sitemaps).
+    """
+    requests: int = 0
+    connections_opened: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def count_connection(self):
+        with self._lock:
+            self.connections_opened += 1
+
+
+class _CountingAdapter(HTTPAdapter):
+    """
+    HTTPAdapter dont les connexions urllib3 comptent les connexions TCP
+    réellement ouvertes (y compris les reconnexions d'un objet réutilisé).
+    """
+
+    def __init__(self, stats: PoolStats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        stats = self.stats
+
+        def counting(pool_base):
+            class CountingConnection(pool_base.ConnectionCls):
+                def connect(self):
+                    stats.count_connection()
+                    super().connect()
+
+            class CountingPool(pool_base):
+                ConnectionCls = CountingConnection
+
+            return CountingPool
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": counting(HTTPConnectionPool),
+            "https": counting(HTTPSConnectionPool),
+        }
+
 
 class Fetcher:
+    """
+    Fetcher synchrone (requests). `session` sert la boucle de crawl ;
+    fetch_robots / fetch_sitemap, appelés depuis les threads de
+    préchargement, ont chacun une session par thread (requests.Session :
+    cookies et état des adapters non thread-safe).
+    """
+
     def __init__(self, cfg: CrawlerConfig):
         self.cfg = cfg
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": cfg.user_agent})
+        self.pool_stats = PoolStats()
+        self.session = self._new_session()
+        self._local = threading.local()
+        self._sessions_lock = threading.Lock()
+        self._background_sessions: List[requests.Session] = []
+        self.dns_cache = install_dns_cache(cfg.dns_cache_ttl)
         self._playwright_fetcher = None
-        logger.info("Fetcher initialized with UA=%s", cfg.user_agent)
+        self.cache = build_http_cache(cfg)
+        if cfg.http2:
+            logger.warning("http2 is only supported by fetch_engine: async, using HTTP/1.1.")
+        # urllib3 n'annonce que les encodages qu'il sait décoder (br si `brotli` est installé,
+        # zstd via `backports.zstd` avant Python 3.14 ; httpx, lui, passe par `zstandard`)
+        logger.info(
+            "Fetcher initialized with UA=%s, Accept-Encoding=%s",
+            cfg.user_agent,
+            self.session.headers.get("Accept-Encoding"),
+        )
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        session.headers.update({"User-Agent": self.cfg.user_agent})
+        # pool_connections = nb de hosts dont le pool est conservé,
+        # pool_maxsize = connexions keep-alive par host
+        adapter = _CountingAdapter(
+            self.pool_stats,
+            pool_connections=self.cfg.pool_max_connections,
+            pool_maxsize=self.cfg.pool_max_per_host,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _thread_session(self) -> requests.Session:
+        # session propre au thread appelant (robots.txt, sitemaps)
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._new_session()
+            with self._sessions_lock:
+                self._background_sessions.append(session)
+        return session
 
     def _get_playwright_fetcher(self):
         if self._playwright_fetcher is None:
@@ -26,27 +263,184 @@ class Fetcher:
         return self._playwright_fetcher
 
     def fetch(self, url: str) -> Optional[str]:
+        return self.fetch_result(url).html
+
+    def fetch_result(self, url: str, page: Optional["StreamingPage"] = None) -> FetchResult:
+        """
+        Fetch détaillé ; si `page` est fourni, le corps y est parsé au
+        fil des chunks (rendu dans result.page).
+        """
         if getattr(self.cfg, "use_playwright", False):
             logger.debug("Using Playwright for %s", url)
             try:
-                return self._get_playwright_fetcher().fetch(url)
+                return FetchResult(url, html=self._get_playwright_fetcher().fetch(url))
             except Exception as e:
                 logger.warning("Playwright fetch failed for %s, fallback to requests: %r", url, e)
 
         logger.debug("Fetching URL via requests: %s", url)
+        deadline = time.monotonic() + self.cfg.fetch_deadline
+        cached = self.cache.get(url) if self.cache else None
+        self.pool_stats.count_request()
         try:
-            resp = self.session.get(url, timeout=self.cfg.request_timeout)
+            resp = self.session.get(
+                url,
+                timeout=self.cfg.request_timeout,
+                headers=HTTPCache.conditional_headers(cached),
+                stream=True,
+                # par requête : REQUESTS_CA_BUNDLE écraserait session.verify
+                verify=self.cfg.tls_verify,
+            )
         except Exception as e:
             logger.warning("Request error for %s: %r", url, e)
-            return None
+            return FetchResult(url, error=repr(e))
 
-        if resp.status_code >= 400:
-            logger.info("HTTP %d for %s, skipping.", resp.status_code, url)
-            return None
+        result = FetchResult(url, status=resp.status_code)
+        with resp:
+            if resp.status_code == 304 and cached is not None:
+                # corps vide : on le lit pour rendre la connexion au pool
+                resp.content
+                result.html = self.cache.not_modified(cached)
+                return result
+            if not accept_status(url, resp.status_code):
+                result.retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                return result
+            if not accept_content_type(url, resp.headers.get("Content-Type"), self.cfg.allowed_content_types):
+                return result
+            if not accept_content_length(url, resp.headers.get("Content-Length"), self.cfg.max_body_bytes):
+                return result
+
+            if page is not None:
+                page.start(resp.headers.get("Content-Type"))
+            try:
+                body = self._read_body(url, resp, deadline, page)
+            except Exception as e:
+                logger.warning("Read error for %s: %r", url, e)
+                result.error = repr(e)
+                if isinstance(e, FetchDeadlineExceeded):
+                    result.abort = "deadline"
+                return result
+            if body is None:
+                result.abort = "size"
+                return result
 
         logger.debug("Fetched %s (%d bytes, status=%d)",
-                     url, len(resp.content), resp.status_code)
+                     url, len(body), resp.status_code)
+        result.html = decode_body(body, resp.headers.get("Content-Type"))
+        if page is not None:
+            page.finish(result.html)
+            result.page = page
+        if self.cache:
+            self.cache.put(url, resp.headers, result.html)
+        return result
+
+    def fetch_robots(self, url: str) -> FetchResult:
+        """
+        Fetch de robots.txt : mêmes réglages (UA, pool, DNS, timeouts) que
+        les pages, dans la session du thread appelant, mais sans filtre
+        Content-Type, cache HTTP ni Playwright.
+        Le texte (tronqué à ROBOTS_MAX_BYTES) est rendu dans `html`.
+        """
+        deadline = time.monotonic() + self.cfg.fetch_deadline
+        self.pool_stats.count_request()
+        try:
+            with self._thread_session().get(
+                url,
+                timeout=self.cfg.request_timeout,
+                stream=True,
+                verify=self.cfg.tls_verify,
+            ) as resp:
+                result = FetchResult(url, status=resp.status_code)
+                if resp.status_code >= 400:
+                    resp.content
+                    result.retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                    return result
+                buf = bytearray()
+                for chunk in self._iter_chunks(resp):
+                    buf += chunk
+                    if len(buf) >= ROBOTS_MAX_BYTES:
+                        break
+                    if time.monotonic() > deadline:
+                        raise FetchDeadlineExceeded(f"deadline of {self.cfg.fetch_deadline:.1f} s exceeded")
+                result.html = decode_body(bytes(buf[:ROBOTS_MAX_BYTES]), resp.headers.get("Content-Type"))
+                return result
+        except Exception as e:
+            logger.debug("robots.txt request error for %s: %r", url, e)
+            return FetchResult(url, error=repr(e))
+
+    def fetch_sitemap(self, url: str, feed: Callable[[bytes], None]) -> FetchResult:
+        """
+        Fetch d'un sitemap (session du thread appelant) : le corps brut
+        (gzip compris) est passé à `feed` chunk par chunk, sans être gardé
+        en mémoire ; pas de filtre
+        Content-Type, de cache HTTP ni de Playwright. `feed` peut lever
+        une exception pour interrompre le téléchargement.
+        """
+        deadline = time.monotonic() + self.cfg.fetch_deadline
+        self.pool_stats.count_request()
+        try:
+            with self._thread_session().get(
+                url,
+                timeout=self.cfg.request_timeout,
+                stream=True,
+                verify=self.cfg.tls_verify,
+            ) as resp:
+                result = FetchResult(url, status=resp.status_code)
+                if resp.status_code >= 400:
+                    resp.content
+                    return result
+                for chunk in self._iter_chunks(resp):
+                    feed(chunk)
+                    if time.monotonic() > deadline:
+                        raise FetchDeadlineExceeded(f"deadline of {self.cfg.fetch_deadline:.1f} s exceeded")
+                return result
+        except Exception as e:
+            logger.debug("Sitemap request error for %s: %r", url, e)
+            return FetchResult(url, error=repr(e))
+
+    def _read_body(
+        self,
+        url: str,
+        resp: requests.Response,
+        deadline: float,
+        page: Optional["StreamingPage"] = None,
+    ) -> Optional[bytes]:
+        """
+        Lit le corps par chunks en bornant la taille (max_body_bytes, après
+        décompression : None) et le temps total (fetch_deadline : exception).
+        Chaque chunk est passé à `page` dès sa réception.
+        """
+        buf = bytearray()
+        for chunk in self._iter_chunks(resp):
+            buf += chunk
+            if page is not None:
+                page.feed(chunk)
+            if len(buf) > self.cfg.max_body_bytes:
+                logger.info("Body > max_body_bytes=%d for %s, aborting.", self.cfg.max_body_bytes, url)
+                return None
+            if time.monotonic() > deadline:
+                raise FetchDeadlineExceeded(f"deadline of {self.cfg.fetch_deadline:.1f} s exceeded")
+        return bytes(buf)
+
+    @staticmethod
+    def _iter_chunks(resp: requests.Response):
+        raw = resp.raw
+        if not hasattr(raw, "read1"):
+            yield from resp.iter_content(chunk_size=CHUNK_SIZE)
+            return
+        # urllib3 >= 2.3 : read1 rend la main dès que des octets arrivent,
+        # un hôte "goutte à goutte" ne bloque donc pas au-delà de la deadline
+        while True:
+            chunk = raw.read1(CHUNK_SIZE, decode_content=True)
+            if not chunk:
+                return
+            yield chunk
 
-        if self.cfg.politeness_delay > 0:
-            time.sleep(self.cfg.politeness_delay)
-        return resp.text
+    def close(self):
+        if self.cache:
+            self.cache.log_stats()
+        if self._playwright_fetcher is not None:
+            self._playwright_fetcher.close()
+        self.session.close()
+        with self._sessions_lock:
+            for session in self._background_sessions:
+                session.close()
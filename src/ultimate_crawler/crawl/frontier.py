@@ -1,25 +1,42 @@
 # src/ultimate_crawler/crawl/frontier.py
 
+from __future__ import annotations
+
+import os
 from collections import deque
-from typing import Deque, Set, Optional
+from pathlib import Path
+from typing import Deque, Iterator, List, Optional, Tuple
+import logging
+
+from ..config.loader import FrontierConfig
+from .url_store import URLStateStore
+
+logger = logging.getLogger(__name__)
+
+# surcoût mémoire approximatif d'une URL en file (objet str + slot de deque)
+URL_OVERHEAD_BYTES = 57
 
 
 class Frontier:
     """
-    File d'URLs simple (BFS).
-    Plus tard tu pourras ajouter des priorités, scoring, etc.
+    File d'URLs simple (BFS), entièrement en mémoire.
+    Les URLs déjà vues sont suivies par `store` (partagé avec le JobRunner).
     """
 
-    def __init__(self):
+    def __init__(self, store=None):
         self._queue: Deque[str] = deque()
-        self._seen: Set[str] = set()
+        self.store = store if store is not None else URLStateStore()
 
-    def add(self, url: str):
-        if url not in self._seen:
-            self._seen.add(url)
-            self._queue.append(url)
+    def add(self, url: str, priority: float = 0.0) -> bool:
+        """
+        Met `url` en file ; rend False si elle était déjà connue.
+        """
+        if not self.store.add(url):
+            return False
+        self._queue.append(url)
+        return True
 
-    def extend(self, urls):
+    def extend(self, urls, priority: float = 0.0):
         for url in urls:
             self.add(url)
 
@@ -28,5 +45,213 @@ class Frontier:
             return None
         return self._queue.popleft()
 
+    def pop_with_priority(self) -> Optional[Tuple[str, float]]:
+        url = self.pop()
+        return None if url is None else (url, 0.0)
+
+    def items(self) -> Iterator[Tuple[str, float]]:
+        """
+        URLs en file (url, priorité), dans l'ordre de sortie (checkpoint).
+        """
+        for url in self._queue:
+            yield url, 0.0
+
+    def close(self):
+        pass
+
     def __len__(self) -> int:
         return len(self._queue)
+
+
+class DiskFrontier:
+    """
+    File d'URLs BFS qui déborde sur disque au-delà d'un budget mémoire.
+
+    La file est découpée en trois parties, dans l'ordre FIFO :
+      tête (deque en mémoire) -> segments sur disque -> queue (buffer d'écriture)
+    Tant que rien n'a débordé, tout reste dans la tête. Une fois le budget
+    `memory_budget_mb` atteint, les nouvelles URLs vont dans le buffer,
+    écrit en segment (fichier texte, une URL par ligne) toutes les
+    `segment_urls` URLs ; quand la tête est vide, le plus ancien segment
+    est relu en entier puis supprimé. push / pop restent en O(1) amorti.
+
+    Les URLs déjà vues sont suivies par `store` (empreintes 64 bits).
+    """
+
+    def __init__(self, spill_dir: Path, memory_budget_mb: float, segment_urls: int, store=None):
+        self.spill_dir = Path(spill_dir)
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        for stale in self.spill_dir.glob("segment_*.txt"):
+            stale.unlink()
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.segment_urls = max(1, segment_urls)
+
+        self._head: Deque[str] = deque()
+        self._head_bytes = 0
+        self._tail: list[str] = []
+        self._segments: Deque[Path] = deque()
+        self._next_segment = 0
+        self._size = 0
+        self.store = store if store is not None else URLStateStore()
+        self.segments_written = 0
+        logger.info(
+            "DiskFrontier in %s (memory_budget=%.0f MB, segment_urls=%d)",
+            self.spill_dir,
+            memory_budget_mb,
+            self.segment_urls,
+        )
+
+    def add(self, url: str, priority: float = 0.0) -> bool:
+        if "\n" in url or not self.store.add(url):
+            return False
+        self._size += 1
+
+        if not self._segments and not self._tail and self._head_bytes < self.memory_budget:
+            self._head.append(url)
+            self._head_bytes += len(url) + URL_OVERHEAD_BYTES
+            return True
+        self._tail.append(url)
+        if len(self._tail) >= self.segment_urls:
+            self._flush_tail()
+        return True
+
+    def extend(self, urls, priority: float = 0.0):
+        for url in urls:
+            self.add(url)
+
+    def _flush_tail(self):
+        path = self.spill_dir / f"segment_{self._next_segment:08d}.txt"
+        self._next_segment += 1
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self._tail))
+            f.write("\n")
+        self._segments.append(path)
+        self.segments_written += 1
+        logger.debug("Frontier spilled %d URLs to %s", len(self._tail), path)
+        self._tail = []
+
+    def _refill_head(self):
+        if self._segments:
+            path = self._segments.popleft()
+            with open(path, "r", encoding="utf-8") as f:
+                urls = f.read().splitlines()
+            os.remove(path)
+        else:
+            urls, self._tail = self._tail, []
+        self._head.extend(urls)
+        self._head_bytes = sum(len(u) + URL_OVERHEAD_BYTES for u in urls)
+
+    def pop(self) -> Optional[str]:
+        if not self._head:
+            if not self._segments and not self._tail:
+                return None
+            self._refill_head()
+        url = self._head.popleft()
+        self._head_bytes -= len(url) + URL_OVERHEAD_BYTES
+        self._size -= 1
+        return url
+
+    def pop_with_priority(self) -> Optional[Tuple[str, float]]:
+        url = self.pop()
+        return None if url is None else (url, 0.0)
+
+    def items(self) -> Iterator[Tuple[str, float]]:
+        for url in self._head:
+            yield url, 0.0
+        for path in self._segments:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    yield line.rstrip("\n"), 0.0
+        for url in self._tail:
+            yield url, 0.0
+
+    def close(self):
+        for path in self._segments:
+            path.unlink(missing_ok=True)
+        self._segments.clear()
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class BestFirstFrontier:
+    """
+    Frontier "focused crawl" : l'URL de plus forte priorité (0..1) sort
+    en premier.
+
+    Les priorités sont quantifiées en `buckets` niveaux, chacun étant une
+    file FIFO : push en O(1), pop en O(1) amorti (on ne redescend le
+    niveau max qu'une fois les niveaux supérieurs vidés). À priorité
+    égale, l'ordre reste BFS. Une URL déjà vue n'est pas reclassée.
+    """
+
+    def __init__(self, buckets: int = 100, store=None):
+        self.buckets = max(1, buckets)
+        self._queues: List[Deque[str]] = [deque() for _ in range(self.buckets + 1)]
+        self._top = -1
+        self._size = 0
+        self.store = store if store is not None else URLStateStore()
+
+    def _bucket(self, priority: float) -> int:
+        return int(min(1.0, max(0.0, priority)) * self.buckets)
+
+    def add(self, url: str, priority: float = 0.0) -> bool:
+        if not self.store.add(url):
+            return False
+        b = self._bucket(priority)
+        self._queues[b].append(url)
+        self._top = max(self._top, b)
+        self._size += 1
+        return True
+
+    def extend(self, urls, priority: float = 0.0):
+        for url in urls:
+            self.add(url, priority)
+
+    def pop(self) -> Optional[str]:
+        item = self.pop_with_priority()
+        return None if item is None else item[0]
+
+    def pop_with_priority(self) -> Optional[Tuple[str, float]]:
+        """
+        Rend (url, priorité quantifiée) : la priorité suit l'URL jusque
+        dans les files par host du PolitenessScheduler.
+        """
+        while self._top >= 0:
+            q = self._queues[self._top]
+            if q:
+                self._size -= 1
+                return q.popleft(), self._top / self.buckets
+            self._top -= 1
+        return None
+
+    def items(self) -> Iterator[Tuple[str, float]]:
+        for b in range(self._top, -1, -1):
+            for url in self._queues[b]:
+                yield url, b / self.buckets
+
+    def close(self):
+        pass
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def build_frontier(cfg: FrontierConfig, out_dir: Path, store=None):
+    """
+    Frontier selon la config : "memory" (BFS, défaut), "disk" (BFS qui
+    déborde sur disque) ou "best_first" (priorisée, en mémoire).
+    Sans `spill_dir`, les segments vont dans <output.dir>/frontier.
+    L'alternance entre hosts n'est pas du ressort de la frontier : le
+    PolitenessScheduler range les URLs sorties dans une file par host
+    (jusqu'à politeness_lookahead) et sert le host éligible le plus tôt,
+    quel que soit le backend.
+    """
+    if cfg.backend == "memory":
+        return Frontier(store)
+    if cfg.backend == "best_first":
+        return BestFirstFrontier(cfg.priority_buckets, store)
+    if cfg.backend == "disk":
+        spill_dir = Path(cfg.spill_dir) if cfg.spill_dir else Path(out_dir) / "frontier"
+        return DiskFrontier(spill_dir, cfg.memory_budget_mb, cfg.segment_urls, store)
+    raise ValueError(f"Unknown frontier backend: {cfg.backend}")
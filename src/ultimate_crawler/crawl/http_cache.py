@@ -0,0 +1,164 @@
+# src/ultimate_crawler/crawl/http_cache.py
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# une éviction ramène le cache à cette fraction du budget (pas une éviction par put)
+EVICT_TO = 0.9
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: str
+
+
+class HTTPCache:
+    """
+    Cache HTTP persistant pour la revalidation (ETag / Last-Modified).
+    Une entrée par URL : data/cache/http/<ab>/<sha1(url)>.json.gz
+    contenant les validateurs et le corps décodé.
+
+    Au fetch suivant on envoie If-None-Match / If-Modified-Since ;
+    sur un 304 le fetcher sert le corps en cache.
+    Les réponses sans validateur ne sont pas stockées (rien à revalider).
+
+    Taille bornée à `max_mb` : au-delà, les entrées les plus anciennes
+    (date d'écriture, rafraîchie à chaque 304) sont supprimées jusqu'à
+    EVICT_TO du budget. Le total est compté par process depuis un scan du
+    répertoire à l'ouverture ; l'éviction rescanne le répertoire, elle
+    voit donc aussi les entrées écrites par d'autres process (shards).
+    """
+
+    def __init__(self, base_dir: Path, max_mb: float = 1024.0):
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._nbytes = sum(size for _, size, _ in self._entries())
+        logger.info(
+            "HTTPCache enabled in %s (%.1f MB used, max %.0f MB)",
+            self.base_dir,
+            self._nbytes / (1024 * 1024),
+            max_mb,
+        )
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        # (mtime, taille, chemin) de chaque entrée
+        entries = []
+        for sub in os.scandir(self.base_dir):
+            if not sub.is_dir():
+                continue
+            for e in os.scandir(sub.path):
+                if e.name.endswith(".json.gz"):
+                    try:
+                        st = e.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, e.path))
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * EVICT_TO)
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        self._nbytes = total
+        self.evictions += removed
+        logger.info("HTTPCache: evicted %d oldest entries, %.1f MB left", removed, total / (1024 * 1024))
+
+    def _path(self, url: str) -> Path:
+        h = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return self.base_dir / h[:2] / f"{h}.json.gz"
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        path = self._path(url)
+        if not path.is_file():
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = CachedResponse(**json.load(f))
+        except Exception as e:
+            logger.debug("Unreadable cache entry for %s: %r", url, e)
+            return None
+        # collision de hash très improbable, mais on vérifie quand même
+        return entry if entry.url == url else None
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CachedResponse]) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def not_modified(self, entry: CachedResponse) -> str:
+        self.hits += 1
+        logger.debug("HTTP 304 for %s, serving cached body.", entry.url)
+        # entrée encore utile : évincée après celles qui ne sont plus revalidées
+        try:
+            os.utime(self._path(entry.url))
+        except OSError:
+            pass
+        return entry.body
+
+    def put(self, url: str, headers: Mapping[str, str], body: str):
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        path = self._path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".tmp{os.getpid()}")
+        entry = CachedResponse(url=url, etag=etag, last_modified=last_modified, body=body)
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(asdict(entry), f, ensure_ascii=False)
+        size = tmp.stat().st_size
+        try:
+            old = path.stat().st_size
+        except FileNotFoundError:
+            old = 0
+        # écriture atomique : un crash ne laisse jamais d'entrée tronquée
+        os.replace(tmp, path)
+        with self._lock:
+            self.stores += 1
+            self._nbytes += size - old
+            if self._nbytes > self.max_bytes:
+                self._evict()
+
+    def log_stats(self):
+        logger.info(
+            "HTTPCache: %d pages served from cache (304), %d entries stored, %d evicted",
+            self.hits,
+            self.stores,
+            self.evictions,
+        )
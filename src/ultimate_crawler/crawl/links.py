@@ -1,13 +1,44 @@
 # src/ultimate_crawler/crawl/links.py
 
-from typing import List, Set
-from urllib.parse import urljoin, urlparse
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from urllib.parse import unquote, urljoin, urlparse
 
-from bs4 import BeautifulSoup
+from lxml.html import HtmlElement
 import logging
 
+from .parser import parse_html
+
 logger = logging.getLogger(__name__)
 
+MAX_ANCHOR_CHARS = 200
+MAX_CONTEXT_CHARS = 300
+
+
+@dataclass
+class Link:
+    url: str
+    anchor: str = ""    # texte du (des) <a> pointant vers l'URL
+    context: str = ""   # texte du bloc parent autour du lien
+
+
+def _text(el: HtmlElement, limit: int) -> str:
+    """
+    Texte de `el`, espaces normalisés, coupé à `limit` caractères (on
+    arrête de parcourir le sous-arbre dès que la limite est atteinte).
+    """
+    parts: List[str] = []
+    size = 0
+    for s in el.itertext():
+        s = s.strip()
+        if not s:
+            continue
+        parts.append(s)
+        size += len(s) + 1
+        if size > limit:
+            break
+    return " ".join(" ".join(parts).split())[:limit]
+
 
 def extract_links_same_domain(html: str, base_url: str) -> List[str]:
     """
@@ -16,49 +47,129 @@ def extract_links_same_domain(html: str, base_url: str) -> List[str]:
       - schéma http/https
       - même domaine que base_url
     """
+    return [link.url for link in extract_links_with_anchors(html, base_url)]
+
+
+def extract_links_with_anchors(html: str, base_url: str) -> List[Link]:
+    """
+    Comme extract_links_same_domain, mais rend aussi, par URL, le texte
+    d'ancre et le contexte (texte du parent direct du <a>), utilisés pour
+    prioriser la frontier.
+    """
 
     if not html:
         return []
+    return extract_links_from_tree(parse_html(html), base_url)
 
-    parsed_base = urlparse(base_url)
-    base_domain = parsed_base.netloc
 
-    soup = BeautifulSoup(html, "lxml")
+def extract_links_from_tree(tree: Optional[HtmlElement], base_url: str) -> List[Link]:
+    """
+    Comme extract_links_with_anchors, sur un arbre lxml déjà parsé
+    (parse_html) : permet de partager le parse avec l'extraction de texte.
+    """
+
+    if tree is None:
+        return []
 
-    links: Set[str] = set()
+    collector = LinkCollector(base_url)
+    for a in tree.iter("a"):
+        collector.add(a)
 
-    for a in soup.find_all("a", href=True):
+    logger.debug(
+        "Extracted %d same-domain links from %s",
+        len(collector.links),
+        base_url,
+    )
+
+    return list(collector.links.values())
+
+
+class LinkCollector:
+    """
+    Filtre et dédoublonne les <a> d'une page, un élément à la fois :
+    utilisé sur un arbre complet comme pendant un parse incrémental.
+    """
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.base_domain = urlparse(base_url).netloc
+        self.links: Dict[str, Link] = {}
+
+    def add(self, a: HtmlElement) -> Optional[Link]:
+        """
+        Prend en compte le lien `a` ; rend le Link s'il pointe vers une
+        URL pas encore vue dans la page, None sinon.
+        """
         href = a.get("href")
 
         # Skip ancres, mailto, tel, javascript:
         if not href:
-            continue
+            return None
         href = href.strip()
         if href.startswith("#"):
-            continue
+            return None
         if href.startswith("mailto:") or href.startswith("tel:") or href.startswith("javascript:"):
-            continue
+            return None
 
         # Résoudre en URL absolue
-        full_url = urljoin(base_url, href)
-        parsed = urlparse(full_url)
+        try:
+            full_url = urljoin(self.base_url, href)
+            parsed = urlparse(full_url)
+        except ValueError:
+            # href invalide (ex: IPv6 mal formée)
+            return None
 
         # Schéma valide
         if parsed.scheme not in ("http", "https"):
-            continue
+            return None
 
         # Même domaine uniquement (crawl "profond" par site)
-        if parsed.netloc != base_domain:
-            continue
+        if parsed.netloc != self.base_domain:
+            return None
 
         # Normalisation simple (pas de fragment)
         normalized = parsed._replace(fragment="").geturl()
-        links.add(normalized)
 
-    logger.debug(
-        "Extracted %d same-domain links from %s",
-        len(links),
-        base_url,
-    )
+        anchor = _text(a, MAX_ANCHOR_CHARS) or a.get("title", "")
+        link = self.links.get(normalized)
+        if link is None:
+            parent = a.getparent()
+            context = _text(parent, MAX_CONTEXT_CHARS) if parent is not None else ""
+            link = self.links[normalized] = Link(
+                url=normalized,
+                anchor=anchor[:MAX_ANCHOR_CHARS],
+                context=context,
+            )
+            return link
+        if anchor and len(link.anchor) < MAX_ANCHOR_CHARS:
+            # même URL liée plusieurs fois : on cumule les ancres
+            link.anchor = f"{link.anchor} {anchor}".strip()[:MAX_ANCHOR_CHARS]
+        return None
+
+
+class LinkScorer:
+    """
+    Score bon marché (0..1) d'un lien avant de le fetcher : mots-clés du
+    job dans l'ancre et l'URL (poids fort) et dans le contexte (poids
+    faible). Combiné au score de la page parente pour la frontier
+    best-first.
+    """
 
-    return list(links)
+    def __init__(self, keywords: List[str], parent_weight: float = 0.6):
+        # "vin*" (préfixe pour KeywordMatcher) : ici déjà une sous-chaîne
+        self.keywords = [k.lower().rstrip("*") for k in keywords if k.rstrip("*")]
+        self.parent_weight = parent_weight
+
+    def link_score(self, link: Link) -> float:
+        if not self.keywords:
+            return 0.0
+        strong = f"{link.anchor} {unquote(urlparse(link.url).path)}".lower()
+        weak = link.context.lower()
+        hits = 0.0
+        for kw in self.keywords:
+            hits += strong.count(kw) + 0.5 * weak.count(kw)
+        return min(1.0, hits / 2.0)
+
+    def priority(self, link: Link, parent_score: float) -> float:
+        w = self.parent_weight
+        return w * parent_score + (1.0 - w) * self.link_score(link)
@@ -0,0 +1,171 @@
+# src/ultimate_crawler/crawl/page.py
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, List, Optional
+
+from lxml import etree
+from lxml.html import HtmlElement, HtmlElementClassLookup
+import logging
+
+from .fetcher import META_SNIFF_BYTES, body_charset
+from .links import Link, LinkCollector, extract_links_from_tree
+from .parser import html_to_text, parse_html
+
+logger = logging.getLogger(__name__)
+
+_UNSET = object()
+
+
+class Page:
+    """
+    Page fetchée, parsée une seule fois en arbre lxml. Les liens
+    (itération lxml sur les <a>) et le texte (trafilatura) sont extraits
+    de ce même arbre, à la demande, et mis en cache.
+    `depth` : profondeur de la page depuis les seeds (renseignée par le JobRunner).
+    """
+
+    def __init__(self, url: str, html: str):
+        self.url = url
+        self.html = html
+        self.depth = 0
+        self._tree = _UNSET
+        self._links: Optional[List[Link]] = None
+        self._text = _UNSET
+
+    @property
+    def tree(self) -> Optional[HtmlElement]:
+        if self._tree is _UNSET:
+            self._tree = parse_html(self.html)
+        return self._tree
+
+    @property
+    def links_ready(self) -> bool:
+        """
+        Liens déjà extraits (page parsée pendant le fetch, ou links() appelé).
+        """
+        return self._links is not None
+
+    def links(self) -> List[Link]:
+        if self._links is None:
+            self._links = extract_links_from_tree(self.tree, self.url)
+        return self._links
+
+    def text(self) -> Optional[str]:
+        if self._text is _UNSET:
+            tree = self.tree
+            self._text = html_to_text(tree, url=self.url) if tree is not None else None
+        return self._text
+
+
+def _pull_parser(encoding: str) -> etree.HTMLPullParser:
+    # mêmes options que le parseur de trafilatura, éléments lxml.html
+    parser = etree.HTMLPullParser(
+        events=("end",),
+        tag="a",
+        encoding=encoding,
+        remove_comments=True,
+        remove_pis=True,
+        collect_ids=False,
+        default_doctype=False,
+    )
+    parser.set_element_class_lookup(HtmlElementClassLookup())
+    return parser
+
+
+class StreamingPage(Page):
+    """
+    Page parsée au fil du téléchargement : le fetcher passe chaque chunk
+    reçu à feed() (le parse recouvre l'attente réseau) et l'arbre est
+    complet à finish(), sans second parse.
+
+    Chaque lien est extrait dès que son </a> est lu. Avec
+    `publish_links`, les liens sont aussi gardés de côté et rendus par
+    drain_links() : le JobRunner les envoie en frontier dès la fin du
+    fetch, une fois la page acceptée, sans attendre le pipeline ; leur
+    contexte est le texte du parent reçu au moment de l'extraction.
+
+    feed() / finish() tournent dans le thread du fetcher (thread de parse
+    pour l'AsyncFetcher), drain_links() dans celui du JobRunner (deque :
+    append / popleft thread-safe).
+    Si le parse incrémental échoue, la page est reparsée depuis `html`.
+    """
+
+    def __init__(self, url: str, publish_links: bool = False):
+        super().__init__(url, "")
+        self.publish_links = publish_links
+        self._content_type: Optional[str] = None
+        self._head = bytearray()
+        self._parser: Optional[etree.HTMLPullParser] = None
+        self._broken = False
+        self._collector = LinkCollector(url)
+        self._fresh: Deque[Link] = deque()
+
+    def start(self, content_type: Optional[str]):
+        self._content_type = content_type
+
+    def feed(self, chunk: bytes):
+        if self._broken:
+            return
+        if self._parser is None:
+            # on attend d'avoir de quoi lire un éventuel <meta charset>
+            self._head += chunk
+            if len(self._head) < META_SNIFF_BYTES:
+                return
+            chunk = bytes(self._head)
+            self._head = bytearray()
+            self._open(chunk)
+        try:
+            self._parser.feed(chunk)
+            self._read_events()
+        except Exception as e:
+            logger.debug("Incremental parse failed for %s, will reparse: %r", self.url, e)
+            self._broken = True
+
+    def finish(self, html: str):
+        """
+        Fin du corps : ferme le parseur et garde l'arbre complet.
+        """
+        self.html = html
+        if self._broken:
+            return
+        try:
+            if self._parser is None:
+                # corps plus court que META_SNIFF_BYTES
+                head = bytes(self._head)
+                self._open(head)
+                self._parser.feed(head)
+            root = self._parser.close()
+            self._read_events()
+        except Exception as e:
+            logger.debug("Incremental parse failed for %s, will reparse: %r", self.url, e)
+            self._broken = True
+            return
+        if root is not None and len(root):
+            self._tree = root
+            self._links = list(self._collector.links.values())
+
+    def drain_links(self) -> List[Link]:
+        """
+        Liens découverts depuis le dernier appel (publish_links).
+        """
+        out: List[Link] = []
+        while True:
+            try:
+                out.append(self._fresh.popleft())
+            except IndexError:
+                return out
+
+    def _open(self, head: bytes):
+        charset = body_charset(head, self._content_type) or "utf-8"
+        try:
+            self._parser = _pull_parser(charset)
+        except LookupError:
+            self._parser = _pull_parser("utf-8")
+
+    def _read_events(self):
+        for _, a in self._parser.read_events():
+            link = self._collector.add(a)
+            if link is not None and self.publish_links:
+                self._fresh.append(link)
@@ -4,9 +4,11 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Optional
+from typing import Optional, Union
 
 import trafilatura
+from lxml.html import HtmlElement
+from trafilatura.utils import load_html
 
 logger = logging.getLogger(__name__)
 
@@ -53,12 +55,25 @@ def clean_extracted_text(text: str) -> str:
     return cleaned
 
 
-def html_to_text(html: str, url: Optional[str] = None) -> Optional[str]:
+def parse_html(html: str) -> Optional[HtmlElement]:
+    """
+    Parse la page en arbre lxml avec le parseur de trafilatura (même
+    arbre que celui qu'il construirait lui-même), None si ce n'est pas
+    du HTML exploitable.
+    """
+    if not html:
+        return None
+    return load_html(html)
+
+
+def html_to_text(html: Union[str, HtmlElement, None], url: Optional[str] = None) -> Optional[str]:
     """
     Wrapper autour trafilatura.extract pour obtenir un texte "article"
     puis appliquer un nettoyage maison pour virer le bruit (JSON, blobs encodés).
+    `html` peut être un arbre déjà parsé (parse_html) : trafilatura
+    travaille alors sur une copie, sans reparser.
     """
-    if not html:
+    if html is None or (isinstance(html, str) and not html):
         return None
 
     # extraction principale
@@ -2,18 +2,56 @@
 
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+import itertools
+import threading
+from concurrent.futures import Future
+from typing import List, Optional
+from urllib.parse import urlparse
 import logging
-import time
 
 from ..config.loader import CrawlerConfig
+from .fetcher import accept_status
 
 logger = logging.getLogger(__name__)
 
+# Types de ressources inutiles pour extraire le texte d'une page
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+# Trackers / pubs courants (match sur le host et ses sous-domaines)
+BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "facebook.net",
+    "connect.facebook.com",
+    "hotjar.com",
+    "criteo.com",
+    "criteo.net",
+    "taboola.com",
+    "outbrain.com",
+    "scorecardresearch.com",
+    "quantserve.com",
+    "adnxs.com",
+)
+
+
+def is_blocked_host(host: str) -> bool:
+    host = host.lower()
+    return any(host == h or host.endswith("." + h) for h in BLOCKED_HOSTS)
+
 
 class PlaywrightFetcher:
     """
     Fetcher basé sur Playwright pour rendre du JS.
+
+    Un seul Chromium est lancé pour toute la durée du job, avec un pool de
+    contexts réutilisés ; jusqu'à `playwright_max_pages` pages sont chargées
+    en parallèle. On attend les événements load / networkidle (borné par
+    `playwright_idle_timeout`) plutôt qu'un sleep fixe, et on peut bloquer
+    images, polices, médias et trackers.
+
     Nécessite:
       pip install playwright
       playwright install
@@ -22,27 +60,97 @@ class PlaywrightFetcher:
     def __init__(self, cfg: CrawlerConfig):
         self.cfg = cfg
         try:
-            from playwright.sync_api import sync_playwright  # type: ignore
+            from playwright.async_api import async_playwright  # type: ignore
         except ImportError:
             raise RuntimeError(
                 "playwright is not installed. Run `pip install playwright` + `playwright install`."
             )
-        self._sync_playwright = sync_playwright
-        logger.info("PlaywrightFetcher initialized.")
+        self._async_playwright = async_playwright
+
+        # l'API async de Playwright tourne dans sa propre boucle / thread
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="playwright-fetcher",
+            daemon=True,
+        )
+        self._thread.start()
+        self._run(self._start()).result()
+        logger.info(
+            "PlaywrightFetcher initialized (contexts=%d, max_pages=%d, block_resources=%s).",
+            cfg.playwright_contexts,
+            cfg.playwright_max_pages,
+            cfg.playwright_block_resources,
+        )
+
+    def _run(self, coro) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def _start(self):
+        self._pw = await self._async_playwright().start()
+        self._browser = await self._pw.chromium.launch(headless=True)
+        self._contexts: List = []
+        for _ in range(max(1, self.cfg.playwright_contexts)):
+            ctx = await self._browser.new_context(user_agent=self.cfg.user_agent)
+            if self.cfg.playwright_block_resources:
+                await ctx.route("**/*", self._route)
+            self._contexts.append(ctx)
+        self._next_context = itertools.cycle(self._contexts)
+        self._pages = asyncio.Semaphore(max(1, self.cfg.playwright_max_pages))
+
+    @staticmethod
+    async def _route(route):
+        request = route.request
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or is_blocked_host(
+            urlparse(request.url).netloc
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def submit(self, url: str) -> "Future[Optional[str]]":
+        return self._run(self._fetch(url))
 
     def fetch(self, url: str) -> Optional[str]:
+        return self.submit(url).result()
+
+    async def _fetch(self, url: str) -> Optional[str]:
         logger.debug("Playwright fetching URL: %s", url)
-        with self._sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page(user_agent=self.cfg.user_agent)
+        async with self._pages:
+            page = await next(self._next_context).new_page()
             try:
-                page.goto(url, timeout=self.cfg.request_timeout * 1000)
-                # wait a bit for JS
-                time.sleep(2.0)
-                content = page.content()
+                resp = await page.goto(
+                    url,
+                    wait_until="load",
+                    timeout=self.cfg.request_timeout * 1000,
+                )
+                if resp is not None and not accept_status(url, resp.status):
+                    return None
+                try:
+                    await page.wait_for_load_state(
+                        "networkidle",
+                        timeout=self.cfg.playwright_idle_timeout * 1000,
+                    )
+                except Exception:
+                    # page "bavarde" (polling, websockets) : on garde le DOM actuel
+                    logger.debug("networkidle not reached for %s, using current DOM", url)
+                return await page.content()
             except Exception as e:
                 logger.warning("Playwright error for %s: %r", url, e)
-                content = None
+                return None
             finally:
-                browser.close()
-        return content
+                await page.close()
+
+    async def _stop(self):
+        for ctx in self._contexts:
+            await ctx.close()
+        await self._browser.close()
+        await self._pw.stop()
+
+    def close(self):
+        if self._loop.is_closed():
+            return
+        self._run(self._stop()).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
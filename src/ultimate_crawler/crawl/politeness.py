@@ -0,0 +1,163 @@
+# src/ultimate_crawler/crawl/politeness.py
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+
+class PolitenessScheduler:
+    """
+    Politesse par host (netloc) au lieu d'un sleep global.
+
+    - les URLs en attente sont rangées dans une file par host, ordonnée
+      par priorité (frontier best-first) puis par ordre d'arrivée ;
+    - un tas (heap) de (heure_autorisée, host) donne le host éligible
+      le plus tôt en O(log n) : ces files par host sont les back queues
+      de Mercator, les domaines sont entrelacés ici et pas dans la
+      frontier ;
+    - un host qui a atteint sa limite de requêtes en vol sort du tas et y
+      revient au release(), avec heure_autorisée = fin du fetch + delay.
+
+    Par défaut (limite = 1) un site ne voit jamais plus d'une requête à la
+    fois, ni deux requêtes espacées de moins de `delay` secondes. La limite
+    par host peut être fournie par `concurrency` (contrôle AIMD) ; au-delà
+    de 1, `delay` espace alors les débuts de requêtes. Un délai propre à un
+    host (Crawl-delay de robots.txt) remplace `delay` via set_delay().
+    """
+
+    def __init__(
+        self,
+        delay: float,
+        clock: Callable[[], float] = time.monotonic,
+        concurrency: Optional[Callable[[str], int]] = None,
+    ):
+        self.delay = delay
+        self._clock = clock
+        self._concurrency = concurrency or (lambda host: 1)
+        self._queues: Dict[str, List[Tuple[float, int, str]]] = {}
+        self._seq = itertools.count()
+        self._next_allowed: Dict[str, float] = {}
+        self._delays: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._scheduled: Set[str] = set()
+        self._in_flight: Dict[str, int] = defaultdict(int)
+        self._size = 0
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlparse(url).netloc
+
+    def set_delay(self, host: str, delay: float):
+        self._delays[host] = delay
+
+    def delay_for(self, host: str) -> float:
+        return self._delays.get(host, self.delay)
+
+    def _schedule(self, host: str):
+        if (
+            host in self._scheduled
+            or host not in self._queues
+            or self._in_flight[host] >= self._concurrency(host)
+        ):
+            return
+        self._scheduled.add(host)
+        heapq.heappush(self._heap, (self._next_allowed.get(host, 0.0), host))
+
+    def push(self, url: str, priority: float = 0.0, front: bool = False):
+        """
+        Met `url` en attente ; `front=True` la place en tête de la file de
+        son host (retry : elle repart avant les URLs jamais tentées).
+        """
+        host = self.host_of(url)
+        q = self._queues.get(host)
+        if q is None:
+            q = self._queues[host] = []
+        key = float("-inf") if front else -priority
+        heapq.heappush(q, (key, next(self._seq), url))
+        self._size += 1
+        self._schedule(host)
+
+    def pop(self) -> Optional[str]:
+        """
+        Rend une URL dont le host est éligible maintenant (le plus ancien
+        en premier), ou None si aucun host n'est prêt.
+        Le fetch est compté en vol pour ce host jusqu'au release().
+        """
+        now = self._clock()
+        while self._heap and self._heap[0][0] <= now:
+            ready_at, host = heapq.heappop(self._heap)
+            allowed = self._next_allowed.get(host, 0.0)
+            if allowed > ready_at:
+                # host repoussé (Retry-After, circuit ouvert...) depuis son entrée dans le tas
+                heapq.heappush(self._heap, (allowed, host))
+                continue
+            self._scheduled.discard(host)
+            q = self._queues.get(host)
+            if q is None:
+                # host vidé par drop_host()
+                continue
+
+            url = heapq.heappop(q)[2]
+            if not q:
+                del self._queues[host]
+            self._size -= 1
+            self._in_flight[host] += 1
+            if self._in_flight[host] < self._concurrency(host):
+                # plusieurs requêtes en vol autorisées : on espace leurs débuts
+                self._next_allowed[host] = now + self.delay_for(host)
+                self._schedule(host)
+            return url
+        return None
+
+    def release(self, url: str, delay: Optional[float] = None):
+        """
+        Fin du fetch de `url` : le host redevient éligible après `delay`
+        secondes (délai du host par défaut).
+        """
+        host = self.host_of(url)
+        if self._in_flight[host] > 0:
+            self._in_flight[host] -= 1
+        d = self.delay_for(host) if delay is None else delay
+        self._next_allowed[host] = max(self._next_allowed.get(host, 0.0), self._clock() + d)
+        self._schedule(host)
+
+    def drop_host(self, host: str) -> List[str]:
+        """
+        Retire (et rend) toutes les URLs en attente pour `host`.
+        """
+        q = self._queues.pop(host, None)
+        if not q:
+            return []
+        self._size -= len(q)
+        return [url for _, _, url in sorted(q)]
+
+    def pending(self) -> Iterator[Tuple[str, float]]:
+        """
+        URLs en attente (url, priorité), tous hosts confondus (checkpoint).
+        Un retry (en tête de file) est rendu avec la priorité maximale.
+        """
+        for q in self._queues.values():
+            for key, _, url in sorted(q):
+                yield url, min(1.0, -key)
+
+    def wait_time(self) -> Optional[float]:
+        """
+        Secondes avant que le prochain host en attente soit éligible
+        (0 si un host est déjà prêt, None si aucun host n'est en attente
+        hors fetchs en cours).
+        """
+        while self._heap and self._heap[0][1] not in self._queues:
+            # host vidé par drop_host()
+            _, host = heapq.heappop(self._heap)
+            self._scheduled.discard(host)
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - self._clock())
+
+    def __len__(self) -> int:
+        return self._size
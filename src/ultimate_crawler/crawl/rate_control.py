@@ -0,0 +1,150 @@
+# src/ultimate_crawler/crawl/rate_control.py
+
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+import logging
+
+from .fetcher import FetchResult
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HostState:
+    limit: int = 1                # requêtes en vol autorisées (AIMD)
+    successes: int = 0            # succès depuis le dernier ajustement
+    failures: int = 0             # échecs transitoires consécutifs
+    open_until: float = 0.0       # circuit ouvert jusqu'à cette heure
+    opens: int = 0                # nb d'ouvertures consécutives du circuit
+    dead: bool = False            # circuit ouvert trop souvent : host abandonné
+
+
+@dataclass
+class Decision:
+    retry: bool = False            # remettre l'URL en file
+    delay: Optional[float] = None  # délai avant la prochaine requête vers le host (None = politesse)
+    drop_host: bool = False        # abandonner les URLs en attente du host
+
+
+class HostRateController:
+    """
+    Contrôle de débit adaptatif par domaine :
+
+    - concurrence AIMD : +1 requête en vol après `increase_every` succès
+      (jusqu'à `max_per_host`), division par 2 sur 429 / 503 ;
+    - Retry-After respecté, erreurs transitoires (connexion, timeout,
+      429 / 5xx) réessayées avec un backoff exponentiel "jittered" (au
+      plus `max_retries` fois par URL) ; les fetchs abandonnés (deadline,
+      taille) ne sont pas réessayés ;
+    - circuit breaker : après `failure_threshold` échecs consécutifs, le
+      host est mis en pause `open_seconds` (ses URLs restent parquées dans
+      le PolitenessScheduler) puis testé par une seule requête ; au bout de
+      `max_opens` ouvertures consécutives, ses URLs sont abandonnées.
+    """
+
+    def __init__(
+        self,
+        max_per_host: int = 1,
+        increase_every: int = 10,
+        max_retries: int = 2,
+        backoff_base: float = 2.0,
+        failure_threshold: int = 5,
+        open_seconds: float = 300.0,
+        max_opens: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_per_host = max(1, max_per_host)
+        self.increase_every = increase_every
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.max_opens = max_opens
+        self._clock = clock
+        self._hosts: Dict[str, HostState] = {}
+        self._attempts: Dict[str, int] = {}
+
+    def _state(self, host: str) -> HostState:
+        st = self._hosts.get(host)
+        if st is None:
+            st = self._hosts[host] = HostState()
+        return st
+
+    def concurrency(self, host: str) -> int:
+        st = self._hosts.get(host)
+        if st is None:
+            return 1
+        if st.open_until:
+            # circuit ouvert ou semi-ouvert : une seule requête de test
+            return 1
+        return st.limit
+
+    def on_result(self, host: str, result: FetchResult) -> Decision:
+        st = self._state(host)
+
+        if result.abort is not None:
+            # abandon volontaire (deadline, taille) : ni succès ni échec du host, pas de nouvel essai
+            self._attempts.pop(result.url, None)
+            return Decision()
+
+        if not result.transient:
+            self._attempts.pop(result.url, None)
+            if st.open_until:
+                logger.info("Circuit closed for %s", host)
+            st.failures = 0
+            st.opens = 0
+            st.open_until = 0.0
+            st.successes += 1
+            if st.successes >= self.increase_every and st.limit < self.max_per_host:
+                st.limit += 1
+                st.successes = 0
+                logger.debug("AIMD: %s concurrency -> %d", host, st.limit)
+            return Decision()
+
+        st.successes = 0
+        st.failures += 1
+        if result.throttled and st.limit > 1:
+            st.limit = max(1, st.limit // 2)
+            logger.info("AIMD: %s throttled (HTTP %s), concurrency -> %d", host, result.status, st.limit)
+
+        attempt = self._attempts.get(result.url, 0) + 1
+        retry = attempt <= self.max_retries
+        if retry:
+            self._attempts[result.url] = attempt
+        else:
+            self._attempts.pop(result.url, None)
+            logger.info("Giving up on %s after %d retries (%s)", result.url, self.max_retries,
+                        result.error or f"HTTP {result.status}")
+
+        backoff = self.backoff_base * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+        delay = max(backoff, result.retry_after or 0.0)
+
+        now = self._clock()
+        if st.open_until > now:
+            # requête partie avant l'ouverture du circuit : on attend la fin de la pause
+            delay = max(delay, st.open_until - now)
+        elif st.open_until or st.failures >= self.failure_threshold:
+            # seuil atteint, ou échec de la requête de test (semi-ouvert)
+            st.opens += 1
+            if st.opens >= self.max_opens:
+                st.dead = True
+                logger.warning("Circuit opened %d times for %s, dropping its queued URLs", st.opens, host)
+                return Decision(retry=False, delay=self.open_seconds, drop_host=True)
+            st.open_until = now + self.open_seconds
+            delay = max(delay, self.open_seconds)
+            logger.warning(
+                "Circuit open for %s (%d consecutive failures), parking its URLs for %.0f s",
+                host,
+                st.failures,
+                self.open_seconds,
+            )
+
+        return Decision(retry=retry, delay=delay)
+
+    def is_dead(self, host: str) -> bool:
+        st = self._hosts.get(host)
+        return st is not None and st.dead
@@ -1,39 +1,236 @@
 # src/ultimate_crawler/crawl/robots.py
 
-from typing import Dict
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
 from urllib.parse import urlparse
 from urllib import robotparser
+import logging
+
+from ..config.loader import CrawlerConfig
+from .fetcher import FetchResult
+
+logger = logging.getLogger(__name__)
+
+# robots.txt en erreur (5xx, réseau) : on retente plus tôt
+ROBOTS_ERROR_TTL = 600.0
+
+
+@dataclass
+class RobotsEntry:
+    base: str                  # scheme://netloc
+    fetched_at: float          # time.time() du fetch (partagé entre process)
+    status: Optional[int]      # None = erreur réseau
+    text: str = ""
+
+    def build_parser(self) -> robotparser.RobotFileParser:
+        rp = robotparser.RobotFileParser(f"{self.base}/robots.txt")
+        if self.status is None:
+            # si impossible de lire, on crée un parser qui autorise tout
+            rp.allow_all = True
+        elif self.status in (401, 403) or self.status == 429 or self.status >= 500:
+            # accès refusé ou serveur indisponible : rien n'est autorisé (RFC 9309)
+            rp.disallow_all = True
+        elif self.status >= 400:
+            rp.allow_all = True
+        else:
+            rp.parse(self.text.splitlines())
+        return rp
+
+    @property
+    def failed(self) -> bool:
+        return self.status is None or self.status == 429 or self.status >= 500
 
 
 class RobotsManager:
     """
-    Gestion de robots.txt par domaine.
-    Pour l'instant, cache en mémoire seulement.
+    Gestion de robots.txt par domaine (scheme://netloc).
+
+    - robots.txt est récupéré en tâche de fond (`prefetch`) dès qu'un
+      domaine est découvert, via le même fetcher que les pages (UA,
+      timeouts, pool de connexions, cache DNS) ;
+    - les entrées sont gardées en mémoire et, si `robots_cache_dir` est
+      défini, sur disque (un JSON par domaine, partagé entre les shards
+      de run_distributed_job) avec un TTL de `robots_cache_ttl` ;
+    - Crawl-delay et Sitemap: sont exposés pour le scheduler.
+
+    `allowed()` reste utilisable seul : il fetch robots.txt de façon
+    synchrone si le domaine n'est pas encore connu.
     """
 
-    def __init__(self, user_agent: str):
-        self.user_agent = user_agent
+    def __init__(self, cfg: CrawlerConfig, fetch: Callable[[str], FetchResult]):
+        self.user_agent = cfg.user_agent
+        self.ttl = cfg.robots_cache_ttl
+        self._fetch = fetch
+        self._dir = Path(cfg.robots_cache_dir) if cfg.robots_cache_dir else None
+        if self._dir is not None:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            logger.info("Robots cache enabled in %s", self._dir)
+
         self.parsers: Dict[str, robotparser.RobotFileParser] = {}
+        self._entries: Dict[str, RobotsEntry] = {}
+        self._pending: Dict[str, Future] = {}
+        self._ready: List[str] = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, cfg.robots_prefetch_workers),
+            thread_name_prefix="robots",
+        )
+        self.disk_hits = 0
+        self.fetched = 0
 
-    def _get_parser(self, url: str) -> robotparser.RobotFileParser:
+    @staticmethod
+    def base_of(url: str) -> str:
         parsed = urlparse(url)
-        base = f"{parsed.scheme}://{parsed.netloc}"
-        if base in self.parsers:
-            return self.parsers[base]
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def _path(self, base: str) -> Path:
+        h = hashlib.sha1(base.encode("utf-8")).hexdigest()
+        return self._dir / f"{h}.json"
+
+    def _ttl(self, entry: RobotsEntry) -> float:
+        return min(self.ttl, ROBOTS_ERROR_TTL) if entry.failed else self.ttl
+
+    def _fresh(self, entry: RobotsEntry) -> bool:
+        return time.time() - entry.fetched_at < self._ttl(entry)
 
-        robots_url = f"{base}/robots.txt"
-        rp = robotparser.RobotFileParser()
+    def _load(self, base: str) -> Optional[RobotsEntry]:
+        if self._dir is None:
+            return None
+        path = self._path(base)
+        if not path.is_file():
+            return None
         try:
-            rp.set_url(robots_url)
-            rp.read()
-        except Exception:
-            # si impossible de lire, on crée un parser qui autorise tout
-            rp = robotparser.RobotFileParser()
-            rp.parse(["User-agent: *", "Allow: /"])
+            with open(path, "r", encoding="utf-8") as f:
+                entry = RobotsEntry(**json.load(f))
+        except Exception as e:
+            logger.debug("Unreadable robots cache entry for %s: %r", base, e)
+            return None
+        if entry.base != base or not self._fresh(entry):
+            return None
+        return entry
 
-        self.parsers[base] = rp
-        return rp
+    def _store(self, entry: RobotsEntry):
+        if self._dir is None:
+            return
+        path = self._path(entry.base)
+        tmp = path.with_suffix(f".tmp{os.getpid()}.{threading.get_ident()}")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(asdict(entry), f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _resolve(self, base: str) -> RobotsEntry:
+        """
+        Entrée à jour pour `base` : disque si frais, sinon fetch réseau.
+        Appelé depuis les threads de prefetch.
+        """
+        entry = self._load(base)
+        if entry is not None:
+            self.disk_hits += 1
+            return entry
+
+        result = self._fetch(f"{base}/robots.txt")
+        if result.error:
+            logger.info("robots.txt unreachable for %s (%s), allowing all for now", base, result.error)
+        elif result.status is not None and result.status >= 400:
+            logger.debug("robots.txt for %s: HTTP %d", base, result.status)
+        entry = RobotsEntry(
+            base=base,
+            fetched_at=time.time(),
+            status=None if result.error else result.status,
+            text=result.html or "",
+        )
+        self.fetched += 1
+        try:
+            self._store(entry)
+        except OSError as e:
+            logger.warning("Could not store robots.txt for %s: %r", base, e)
+        return entry
+
+    def _install(self, base: str, entry: RobotsEntry):
+        rp = entry.build_parser()
+        with self._lock:
+            self._entries[base] = entry
+            self.parsers[base] = rp
+
+    def _done(self, base: str, fut: Future):
+        try:
+            entry = fut.result()
+        except Exception as e:
+            logger.warning("robots.txt prefetch failed for %s: %r", base, e)
+            entry = RobotsEntry(base=base, fetched_at=time.time(), status=None)
+        self._install(base, entry)
+        with self._lock:
+            self._pending.pop(base, None)
+            self._ready.append(base)
+
+    def prefetch(self, url: str) -> bool:
+        """
+        Lance en tâche de fond le fetch de robots.txt du domaine de `url`
+        s'il est inconnu ou expiré. Rend True si le domaine est prêt
+        (une entrée expirée reste utilisée pendant son rafraîchissement).
+        """
+        base = self.base_of(url)
+        with self._lock:
+            entry = self._entries.get(base)
+            if entry is not None and self._fresh(entry):
+                return True
+            if base in self._pending:
+                return entry is not None
+            fut = self._executor.submit(self._resolve, base)
+            self._pending[base] = fut
+        fut.add_done_callback(lambda f: self._done(base, f))
+        return entry is not None
+
+    def drain_ready(self) -> List[str]:
+        """
+        Domaines (scheme://netloc) dont robots.txt est arrivé depuis le
+        dernier appel.
+        """
+        with self._lock:
+            ready, self._ready = self._ready, []
+        return ready
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def _get_parser(self, url: str) -> robotparser.RobotFileParser:
+        base = self.base_of(url)
+        with self._lock:
+            rp = self.parsers.get(base)
+        if rp is not None:
+            self.prefetch(url)  # rafraîchit en fond si expiré
+            return rp
+        self._install(base, self._resolve(base))
+        return self.parsers[base]
 
     def allowed(self, url: str) -> bool:
         parser = self._get_parser(url)
         return parser.can_fetch(self.user_agent, url)
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        """
+        Crawl-delay (secondes) pour notre User-Agent, ou None.
+        """
+        delay = self._get_parser(url).crawl_delay(self.user_agent)
+        return float(delay) if delay is not None else None
+
+    def sitemaps(self, url: str) -> List[str]:
+        return list(self._get_parser(url).site_maps() or [])
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logger.info(
+            "Robots: %d robots.txt fetched, %d served from disk cache",
+            self.fetched,
+            self.disk_hits,
+        )
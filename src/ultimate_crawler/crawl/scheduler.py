@@ -1,24 +1,103 @@
 # src/ultimate_crawler/crawl/scheduler.py
 
-from typing import Iterable, List
+import math
+from array import array
+from typing import Dict, Iterable, List, Optional
 from urllib.parse import urlparse
 from collections import defaultdict
 
+from .url_store import _byte_chunks, url_fingerprint
+
 
 class Scheduler:
     """
     Scheduler minimal :
     - limite le nombre de pages par domaine
-    - peut être enrichi plus tard pour gérer la priorité, profondeur, etc.
+    - compte les fetchs en vol (mode async) dans cette limite
+    - admission des liens découverts selon le budget : les URLs en
+      attente (frontier, files par host, attente de robots.txt) sont
+      comptées par domaine et plafonnées à `queue_slack` fois le budget
+      restant ; au-delà, le lien est refusé avant d'entrer en frontier
+    - profondeur max depuis les seeds (`max_depth`, None = illimitée)
+
+    Cycle d'une URL : enqueue (entrée en file) -> dequeue (fetch lancé
+    ou URL écartée) -> finish (page traitée, rend sa profondeur).
+    Les profondeurs ne sont gardées (empreinte 64 bits -> profondeur)
+    que pour les URLs en cours et seulement si max_depth est défini.
     """
 
-    def __init__(self, max_pages_per_domain: int):
+    def __init__(self, max_pages_per_domain: int, max_depth: Optional[int] = None, queue_slack: float = 2.0):
         self.max_pages_per_domain = max_pages_per_domain
+        self.max_depth = max_depth
+        self.queue_slack = queue_slack
         self.domain_counts = defaultdict(int)
+        self.in_flight = defaultdict(int)
+        self.enqueued = defaultdict(int)
+        self._depths: Dict[int, int] = {}
+        self.refused_budget = 0
+        self.refused_depth = 0
 
     def can_crawl(self, url: str) -> bool:
         domain = urlparse(url).netloc
-        return self.domain_counts[domain] < self.max_pages_per_domain
+        return self.domain_counts[domain] + self.in_flight[domain] < self.max_pages_per_domain
+
+    def can_enqueue(self, url: str, depth: int = 0) -> bool:
+        """
+        True si un lien vers `url`, à la profondeur `depth`, peut encore
+        servir : profondeur autorisée et place dans le budget du domaine.
+        """
+        if self.max_depth is not None and depth > self.max_depth:
+            self.refused_depth += 1
+            return False
+        domain = urlparse(url).netloc
+        remaining = self.max_pages_per_domain - self.domain_counts[domain] - self.in_flight[domain]
+        if self.enqueued[domain] >= math.ceil(remaining * self.queue_slack):
+            self.refused_budget += 1
+            return False
+        return True
+
+    def enqueue(self, url: str, depth: int = 0):
+        domain = urlparse(url).netloc
+        self.enqueued[domain] += 1
+        if self.max_depth is not None and depth:
+            self._depths[url_fingerprint(url)] = depth
+
+    def requeue(self, url: str):
+        """
+        URL remise en file après un échec transitoire (sa profondeur est gardée).
+        """
+        domain = urlparse(url).netloc
+        self.enqueued[domain] += 1
+
+    def dequeue(self, url: str, discard: bool = False):
+        """
+        L'URL sort de l'attente : fetch lancé, ou écartée (`discard`).
+        """
+        domain = urlparse(url).netloc
+        self.enqueued[domain] = max(0, self.enqueued[domain] - 1)
+        if discard and self._depths:
+            self._depths.pop(url_fingerprint(url), None)
+
+    def depth(self, url: str) -> int:
+        if not self._depths:
+            return 0
+        return self._depths.get(url_fingerprint(url), 0)
+
+    def finish(self, url: str) -> int:
+        """
+        Fetch terminé : rend la profondeur de l'URL (0 pour une seed).
+        """
+        if not self._depths:
+            return 0
+        return self._depths.pop(url_fingerprint(url), 0)
+
+    def reserve(self, url: str):
+        domain = urlparse(url).netloc
+        self.in_flight[domain] += 1
+
+    def release(self, url: str):
+        domain = urlparse(url).netloc
+        self.in_flight[domain] -= 1
 
     def mark_crawled(self, url: str):
         domain = urlparse(url).netloc
@@ -30,3 +109,16 @@ class Scheduler:
             if self.can_crawl(url):
                 allowed.append(url)
         return allowed
+
+    def save(self, ckpt, name: str):
+        keys = array("Q", self._depths.keys())
+        depths = array("I", self._depths.values())
+        ckpt.section(f"{name}.depth_keys", _byte_chunks(keys))
+        ckpt.section(f"{name}.depths", _byte_chunks(depths))
+
+    def load(self, ckpt, name: str):
+        if f"{name}.depth_keys" not in ckpt:
+            return
+        keys = array("Q", ckpt.bytes(f"{name}.depth_keys"))
+        depths = array("I", ckpt.bytes(f"{name}.depths"))
+        self._depths = dict(zip(keys, depths))
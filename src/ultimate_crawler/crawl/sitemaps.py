@@ -0,0 +1,297 @@
+# src/ultimate_crawler/crawl/sitemaps.py
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+import logging
+
+from lxml import etree
+
+from ..config.loader import CrawlerConfig
+from .fetcher import FetchResult
+
+logger = logging.getLogger(__name__)
+
+# emplacements essayés quand robots.txt ne déclare aucun sitemap
+WELL_KNOWN_SITEMAPS = ["/sitemap.xml", "/sitemap_index.xml"]
+
+# taille max d'un sitemap décompressé (limite du protocole : 50 Mo)
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+class SitemapTooLarge(ValueError):
+    pass
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[float]:
+    """
+    <lastmod> (W3C Datetime : "2024-05-01", "2024-05-01T10:00:00+02:00",
+    "...Z") en timestamp, None si absent ou illisible.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            dt = datetime.fromisoformat(value[:10])
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class SitemapParser:
+    """
+    Parse incrémental (XMLPullParser) d'un sitemap <urlset> ou d'un index
+    <sitemapindex>, gzip ou non, alimenté chunk par chunk.
+    Chaque <url> / <sitemap> est rendu via les callbacks puis retiré de
+    l'arbre : la mémoire reste bornée quelle que soit la taille du fichier.
+    """
+
+    def __init__(
+        self,
+        on_url: Callable[[str, Optional[str]], None],
+        on_sitemap: Callable[[str], None],
+        max_bytes: int = SITEMAP_MAX_BYTES,
+    ):
+        self.on_url = on_url
+        self.on_sitemap = on_sitemap
+        self.max_bytes = max_bytes
+        self._size = 0
+        self._gunzip: Optional["zlib._Decompress"] = None
+        self._started = False
+        # pas d'entités externes ni de réseau (XXE)
+        self._parser = etree.XMLPullParser(
+            events=("end",),
+            resolve_entities=False,
+            no_network=True,
+            recover=True,
+        )
+
+    def feed(self, chunk: bytes):
+        if not self._started:
+            self._started = True
+            if chunk[:2] == GZIP_MAGIC:
+                self._gunzip = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self._gunzip is not None:
+            chunk = self._gunzip.decompress(chunk, self.max_bytes - self._size + 1)
+        self._size += len(chunk)
+        if self._size > self.max_bytes:
+            raise SitemapTooLarge(f"sitemap larger than {self.max_bytes} bytes")
+        self._parser.feed(chunk)
+        self._read_events()
+
+    def close(self):
+        try:
+            self._parser.close()
+        except etree.XMLSyntaxError:
+            pass
+        self._read_events()
+
+    def _read_events(self):
+        for _, el in self._parser.read_events():
+            if not isinstance(el.tag, str):
+                continue
+            name = etree.QName(el).localname
+            if name not in ("url", "sitemap"):
+                continue
+            loc = lastmod = None
+            for child in el:
+                if not isinstance(child.tag, str):
+                    continue
+                child_name = etree.QName(child).localname
+                if child_name == "loc":
+                    loc = (child.text or "").strip()
+                elif child_name == "lastmod":
+                    lastmod = child.text
+            if loc:
+                if name == "url":
+                    self.on_url(loc, lastmod)
+                else:
+                    self.on_sitemap(loc)
+            # libère l'entrée et celles qui la précèdent
+            el.clear()
+            parent = el.getparent()
+            if parent is not None:
+                while el.getprevious() is not None:
+                    del parent[0]
+
+
+class SitemapManager:
+    """
+    Découverte d'URLs par les sitemaps, domaine par domaine, en tâche de
+    fond (même principe que RobotsManager).
+
+    - sitemaps déclarés dans robots.txt (Sitemap:), sinon emplacements
+      connus (WELL_KNOWN_SITEMAPS) ; les index sont suivis, dans la
+      limite de `sitemap_max_files` fichiers par domaine ;
+    - parse en flux (SitemapParser), gzip compris ;
+    - seules les URLs du domaine sont gardées, avec une priorité de
+      fraîcheur tirée de <lastmod> (demi-vie `sitemap_half_life_days`) ;
+    - par domaine, seules les `max_urls` URLs les plus prioritaires
+      sont gardées (tas borné) : inutile de garder plus que ce que le
+      budget du domaine permettra de crawler ;
+    - les fichiers d'un domaine sont lus l'un après l'autre, espacés du
+      délai de politesse du host (politeness_delay ou Crawl-delay) passé
+      à discover().
+
+    Le JobRunner récupère les URLs d'un domaine, triées par priorité
+    décroissante, via `drain_ready()`.
+    """
+
+    def __init__(
+        self,
+        cfg: CrawlerConfig,
+        fetch: Callable[[str, Callable[[bytes], None]], FetchResult],
+        max_urls: int,
+    ):
+        self._fetch = fetch
+        self.max_files = cfg.sitemap_max_files
+        self.half_life = cfg.sitemap_half_life_days * 86400.0
+        self.max_urls = max(1, max_urls)
+        self._seen: Set[str] = set()
+        self._pending: Dict[str, Future] = {}
+        self._ready: List[Tuple[str, List[Tuple[str, float]]]] = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, cfg.sitemap_workers),
+            thread_name_prefix="sitemaps",
+        )
+        self._closed = threading.Event()
+        self.files_fetched = 0
+        self.urls_found = 0
+
+    def freshness(self, lastmod: Optional[str], now: float) -> float:
+        """
+        Priorité 0..1 : 1 pour une page modifiée à l'instant, 0.5 après
+        une demi-vie ; 0 sans <lastmod>.
+        """
+        ts = parse_lastmod(lastmod)
+        if ts is None:
+            return 0.0
+        age = max(0.0, now - ts)
+        return 0.5 ** (age / self.half_life)
+
+    def started(self, base: str) -> bool:
+        with self._lock:
+            return base in self._seen
+
+    def discover(self, base: str, declared: List[str], delay: float = 0.0):
+        """
+        Lance la découverte des sitemaps de `base` (scheme://netloc) si ce
+        n'est pas déjà fait. `declared` : sitemaps listés dans robots.txt,
+        `delay` : écart minimal (s) entre deux fichiers de ce domaine.
+        """
+        with self._lock:
+            if base in self._seen:
+                return
+            self._seen.add(base)
+            fut = self._executor.submit(self._collect, base, list(declared), delay)
+            self._pending[base] = fut
+        fut.add_done_callback(lambda f: self._done(base, f))
+
+    def _collect(self, base: str, declared: List[str], delay: float) -> List[Tuple[str, float]]:
+        """
+        Parcourt les sitemaps de `base` ; appelé depuis les threads de fond.
+        """
+        netloc = urlparse(base).netloc
+        now = time.time()
+        top: List[Tuple[float, int, str]] = []
+        seq = itertools.count()
+        found = 0
+
+        fallback = [] if declared else [base + path for path in WELL_KNOWN_SITEMAPS]
+        queue: Deque[str] = deque(declared or [fallback.pop(0)])
+
+        def on_url(loc: str, lastmod: Optional[str]):
+            nonlocal found
+            if urlparse(loc).netloc != netloc:
+                return
+            found += 1
+            item = (self.freshness(lastmod, now), next(seq), loc)
+            if len(top) < self.max_urls:
+                heapq.heappush(top, item)
+            elif item[0] > top[0][0]:
+                heapq.heapreplace(top, item)
+
+        def on_sitemap(loc: str):
+            nonlocal found
+            found += 1
+            queue.append(loc)
+
+        visited: Set[str] = set()
+        last_done: Optional[float] = None
+        while queue and len(visited) < self.max_files:
+            url = queue.popleft()
+            if url in visited:
+                continue
+            visited.add(url)
+            # même espacement que les pages du host (fin du fetch + delay)
+            if last_done is not None:
+                wait = last_done + delay - time.monotonic()
+                if wait > 0 and self._closed.wait(wait):
+                    break
+            parser = SitemapParser(on_url, on_sitemap)
+            result = self._fetch(url, parser.feed)
+            last_done = time.monotonic()
+            parser.close()
+            self.files_fetched += 1
+            if result.error:
+                logger.debug("Sitemap %s: %s", url, result.error)
+            elif result.status is not None and result.status >= 400:
+                logger.debug("Sitemap %s: HTTP %d", url, result.status)
+            # emplacement connu absent ou vide : on essaie le suivant
+            if not found and not queue and fallback:
+                queue.append(fallback.pop(0))
+
+        self.urls_found += len(top)
+        if top:
+            logger.info("Sitemaps: %d URLs from %d files for %s", len(top), len(visited), base)
+        # priorité décroissante, ordre du fichier à priorité égale
+        return [(url, prio) for prio, _, url in sorted(top, key=lambda t: (-t[0], t[1]))]
+
+    def _done(self, base: str, fut: Future):
+        try:
+            entries = fut.result()
+        except Exception as e:
+            logger.warning("Sitemap discovery failed for %s: %r", base, e)
+            entries = []
+        with self._lock:
+            self._pending.pop(base, None)
+            if entries:
+                self._ready.append((base, entries))
+
+    def drain_ready(self) -> List[Tuple[str, List[Tuple[str, float]]]]:
+        """
+        (domaine, [(url, priorité)...]) terminés depuis le dernier appel.
+        """
+        with self._lock:
+            ready, self._ready = self._ready, []
+        return ready
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def close(self):
+        self._closed.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logger.info(
+            "Sitemaps: %d files fetched, %d URLs kept",
+            self.files_fetched,
+            self.urls_found,
+        )
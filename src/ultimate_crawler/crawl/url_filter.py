@@ -0,0 +1,174 @@
+# src/ultimate_crawler/crawl/url_filter.py
+
+from __future__ import annotations
+
+import mimetypes
+import re
+from collections import Counter
+from hashlib import blake2b
+from typing import Dict, Optional, Set
+from urllib.parse import parse_qsl, urlsplit
+import logging
+
+from ..config.loader import URLFilterConfig
+
+logger = logging.getLogger(__name__)
+
+# extensions jamais HTML, rejetées sans autre examen
+BLOCKED_EXTENSIONS = [
+    # images
+    "jpg", "jpeg", "png", "gif", "webp", "avif", "bmp", "tif", "tiff", "svg", "ico", "heic",
+    # audio / vidéo
+    "mp3", "mp4", "m4a", "m4v", "wav", "ogg", "oga", "ogv", "flac", "avi", "mov", "wmv", "mkv", "webm", "flv",
+    # documents
+    "pdf", "doc", "docx", "xls", "xlsx", "ppt", "pptx", "odt", "ods", "odp", "rtf", "epub", "csv",
+    # archives / binaires
+    "zip", "gz", "tgz", "bz2", "xz", "rar", "7z", "tar", "exe", "msi", "dmg", "apk", "iso", "bin", "deb", "rpm",
+    # ressources web
+    "css", "js", "mjs", "json", "map", "woff", "woff2", "ttf", "otf", "eot", "xml", "rss", "atom",
+]
+
+# extensions de pages dynamiques : HTML en pratique, quel que soit le type deviné
+PAGE_EXTENSIONS = {
+    "html", "htm", "xhtml", "shtml", "php", "php3", "php5", "asp", "aspx", "jsp", "jspx",
+    "cfm", "cgi", "pl", "do", "action",
+}
+
+HTML_TYPES = {"text/html", "application/xhtml+xml"}
+
+# pièges connus (insensible à la casse, sur chemin + requête)
+TRAP_PATTERNS = [
+    # identifiants de session dans l'URL : une URL différente par visite
+    r"[;?&](?:jsessionid|phpsessid|sessionid|sessid|session_id|sid|oscsid|zenid|cfid|cftoken)=",
+    # calendriers : navigation infinie de mois en mois. Pas de règle sur
+    # les paramètres de date (?year=, ?annee=) : ce sont aussi des facettes
+    # légitimes (millésimes) ; leurs suites infinies restent bornées par
+    # le budget du domaine (max_pages_per_domain, queue_slack) et max_depth
+    r"/(?:calendar|calendrier|kalender|calendario)(?:[/?.]|$)",
+    # actions (panier, réponse à un commentaire, partage, impression)
+    r"[?&](?:add-to-cart|add_to_cart|add-to-wishlist|replytocom|share|print)=",
+]
+
+_DIGITS = re.compile(r"\d+")
+
+# MimeTypes sans fichiers système : mêmes devinettes sur toutes les machines
+_MIME = mimetypes.MimeTypes()
+
+
+def _combination_key(query: str) -> int:
+    """
+    Empreinte 64 bits (blake2b, stable d'un process à l'autre) du jeu de
+    paramètres : noms et valeurs triés, chiffres des valeurs normalisés.
+    """
+    pairs = sorted((k, _DIGITS.sub("0", v)) for k, v in parse_qsl(query, keep_blank_values=True))
+    canon = "&".join(f"{k}={v}" for k, v in pairs)
+    return int.from_bytes(blake2b(canon.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class URLFilter:
+    """
+    Filtre d'URLs appliqué avant l'entrée en frontier, pour ne pas
+    gaspiller de fetchs sur des ressources qui ne seront jamais gardées :
+
+    - binaires : extension connue (BLOCKED_EXTENSIONS) ou type MIME
+      deviné depuis l'extension qui n'est pas du HTML ;
+    - pièges à crawler : URL trop longue, chemin trop profond, segment
+      répété (/a/b/a/b/a/b), identifiants de session, calendriers,
+      actions (TRAP_PATTERNS, complétés par `extra_trap_patterns`) ;
+    - espaces de paramètres infinis (facettes, tris, filtres combinés,
+      navigation par date) :
+      au plus `max_query_combinations` jeux de paramètres distincts par
+      gabarit de chemin (host + chemin, chiffres normalisés). Un jeu de
+      paramètres est compté avec ses valeurs, chiffres normalisés eux
+      aussi : ?product_id=1 et ?product_id=2 (pages adressées par
+      identifiant) sont un seul jeu, ?couleur=rouge et ?couleur=blanc
+      deux. Les jeux vus sont sauvés dans le checkpoint (save / load).
+
+    Les expressions sont compilées une fois ; le test d'une URL ne fait
+    qu'un urlsplit et quelques recherches.
+    """
+
+    def __init__(self, cfg: URLFilterConfig):
+        self.enabled = cfg.enabled
+        self.max_url_length = cfg.max_url_length
+        self.max_path_segments = cfg.max_path_segments
+        self.max_segment_repeats = cfg.max_segment_repeats
+        self.max_query_combinations = cfg.max_query_combinations
+
+        extensions = {e.lower().lstrip(".") for e in BLOCKED_EXTENSIONS + list(cfg.extra_blocked_extensions)}
+        self._blocked_ext = re.compile(
+            r"\.(?:" + "|".join(sorted(map(re.escape, extensions))) + r")$",
+            re.IGNORECASE,
+        )
+        self._traps = re.compile(
+            "|".join(f"(?:{p})" for p in TRAP_PATTERNS + list(cfg.extra_trap_patterns)),
+            re.IGNORECASE,
+        )
+        # gabarit de chemin -> empreintes des jeux de paramètres vus
+        self._combinations: Dict[str, Set[int]] = {}
+        self.rejected: Counter = Counter()
+
+    def reason(self, url: str) -> Optional[str]:
+        """
+        Motif de rejet de `url` ("extension", "mime", "trap", "length",
+        "depth", "repetition", "params"), ou None si elle est acceptée.
+        """
+        if not self.enabled:
+            return None
+        if len(url) > self.max_url_length:
+            return "length"
+
+        parts = urlsplit(url)
+        path = parts.path
+        last = path.rpartition("/")[2]
+        if "." in last:
+            if self._blocked_ext.search(last):
+                return "extension"
+            ext = last.rpartition(".")[2].lower()
+            if ext not in PAGE_EXTENSIONS:
+                mime = _MIME.guess_type(last)[0]
+                if mime is not None and mime not in HTML_TYPES:
+                    return "mime"
+
+        query = parts.query
+        if self._traps.search(path + ("?" + query if query else "")):
+            return "trap"
+
+        segments = [s for s in path.split("/") if s]
+        if len(segments) > self.max_path_segments:
+            return "depth"
+        if len(segments) > self.max_segment_repeats:
+            counts = Counter(segments)
+            if counts.most_common(1)[0][1] > self.max_segment_repeats:
+                return "repetition"
+
+        if query:
+            template = parts.netloc.lower() + _DIGITS.sub("0", path)
+            combo = _combination_key(query)
+            seen = self._combinations.setdefault(template, set())
+            if combo not in seen:
+                if len(seen) >= self.max_query_combinations:
+                    return "params"
+                seen.add(combo)
+        return None
+
+    def allowed(self, url: str) -> bool:
+        why = self.reason(url)
+        if why is None:
+            return True
+        self.rejected[why] += 1
+        logger.debug("URL filtered (%s): %s", why, url)
+        return False
+
+    def save(self, ckpt, name: str):
+        ckpt.json(f"{name}.combinations", {t: sorted(s) for t, s in self._combinations.items()})
+
+    def load(self, ckpt, name: str):
+        if f"{name}.combinations" not in ckpt:
+            return
+        self._combinations = {t: set(s) for t, s in ckpt.json(f"{name}.combinations").items()}
+
+    def summary(self) -> str:
+        if not self.rejected:
+            return "none"
+        return ", ".join(f"{why}={n}" for why, n in self.rejected.most_common())
@@ -0,0 +1,256 @@
+# src/ultimate_crawler/crawl/url_store.py
+
+from __future__ import annotations
+
+import math
+from array import array
+from hashlib import blake2b
+from typing import Iterator, List
+import logging
+
+from ..config.loader import FrontierConfig
+
+logger = logging.getLogger(__name__)
+
+# états d'une URL
+UNSEEN = 0
+QUEUED = 1    # découverte, en file
+FETCHED = 2   # sortie de la frontier pour être fetchée
+
+# taille des blocs écrits dans un checkpoint (multiple de 8)
+SNAPSHOT_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+def _byte_chunks(buf) -> Iterator[bytes]:
+    view = memoryview(buf).cast("B")
+    for i in range(0, len(view), SNAPSHOT_CHUNK_BYTES):
+        yield bytes(view[i:i + SNAPSHOT_CHUNK_BYTES])
+
+
+def url_fingerprint(url: str) -> int:
+    """
+    Empreinte 64 bits d'une URL (blake2b) : 8 octets au lieu de la chaîne.
+    """
+    return int.from_bytes(blake2b(url.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class URLStateStore:
+    """
+    État des URLs vues (file / fetchée), partagé par la frontier et le
+    JobRunner, sous forme d'empreintes 64 bits dans une table de hachage
+    à adressage ouvert (sondage linéaire) :
+      - clés : array('Q'), 8 octets par case ;
+      - états : bytearray, 1 octet par case (0 = case vide).
+    9 octets par case et facteur de charge entre max_load / 2 et
+    max_load : 13 à 26 octets par URL, contre 170+ pour un str dans un set.
+    Collision d'empreintes (~n² / 2^65) : l'URL est vue comme déjà connue.
+    """
+
+    def __init__(self, initial_capacity: int = 1 << 16, max_load: float = 0.7):
+        cap = 1 << max(4, math.ceil(math.log2(max(16, initial_capacity))))
+        self.max_load = max_load
+        self._alloc(cap)
+        self._len = 0
+
+    def _alloc(self, cap: int):
+        self._keys = array("Q", [0]) * cap
+        self._states = bytearray(cap)
+        self._mask = cap - 1
+        self._limit = int(cap * self.max_load)
+
+    def _slot(self, fp: int) -> int:
+        keys, states, mask = self._keys, self._states, self._mask
+        i = fp & mask
+        while states[i] and keys[i] != fp:
+            i = (i + 1) & mask
+        return i
+
+    def _grow(self):
+        old_keys, old_states = self._keys, self._states
+        self._alloc(len(old_keys) * 2)
+        keys, states, mask = self._keys, self._states, self._mask
+        for j, st in enumerate(old_states):
+            if st:
+                fp = old_keys[j]
+                i = fp & mask
+                while states[i]:
+                    i = (i + 1) & mask
+                keys[i] = fp
+                states[i] = st
+        logger.debug("URLStateStore grown to %d slots (%d URLs)", len(keys), self._len)
+
+    def state(self, url: str) -> int:
+        return self._states[self._slot(url_fingerprint(url))]
+
+    def add(self, url: str) -> bool:
+        """
+        Marque `url` comme en file ; rend False si elle était déjà connue.
+        """
+        fp = url_fingerprint(url)
+        i = self._slot(fp)
+        if self._states[i]:
+            return False
+        self._keys[i] = fp
+        self._states[i] = QUEUED
+        self._len += 1
+        if self._len > self._limit:
+            self._grow()
+        return True
+
+    def mark_fetched(self, url: str) -> bool:
+        """
+        Marque `url` comme fetchée ; rend False si elle l'était déjà.
+        """
+        fp = url_fingerprint(url)
+        i = self._slot(fp)
+        st = self._states[i]
+        if st == FETCHED:
+            return False
+        self._keys[i] = fp
+        self._states[i] = FETCHED
+        if not st:
+            self._len += 1
+            if self._len > self._limit:
+                self._grow()
+        return True
+
+    def is_fetched(self, url: str) -> bool:
+        return self.state(url) == FETCHED
+
+    def __contains__(self, url: str) -> bool:
+        return self.state(url) != UNSEEN
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def nbytes(self) -> int:
+        return self._keys.itemsize * len(self._keys) + len(self._states)
+
+    def save(self, ckpt, name: str):
+        ckpt.json(f"{name}.meta", {"kind": "hash", "slots": len(self._keys), "len": self._len})
+        ckpt.section(f"{name}.keys", _byte_chunks(self._keys))
+        ckpt.section(f"{name}.states", _byte_chunks(self._states))
+
+    def load(self, ckpt, name: str):
+        meta = ckpt.json(f"{name}.meta")
+        if meta["kind"] != "hash":
+            raise ValueError(f"Checkpoint has a {meta['kind']!r} URL store, config asks for 'hash'")
+        keys = array("Q")
+        for chunk in ckpt.chunks(f"{name}.keys"):
+            keys.frombytes(chunk)
+        states = bytearray(ckpt.bytes(f"{name}.states"))
+        if len(keys) != meta["slots"] or len(states) != meta["slots"]:
+            raise ValueError("Corrupted URL store in checkpoint")
+        self._keys, self._states = keys, states
+        self._mask = len(keys) - 1
+        self._limit = int(len(keys) * self.max_load)
+        self._len = meta["len"]
+
+
+class BloomURLStore:
+    """
+    Variante probabiliste de URLStateStore : deux filtres de Bloom (vues,
+    fetchées) dimensionnés pour `capacity` URLs avec un taux de faux
+    positifs `fp_rate` (~1,2 octet par URL et par filtre à 1 %).
+    Un faux positif fait sauter une URL jamais vue ; au-delà de
+    `capacity`, le taux réel se dégrade.
+    """
+
+    def __init__(self, capacity: int, fp_rate: float):
+        self.capacity = max(1, capacity)
+        self.fp_rate = fp_rate
+        self._m = max(8, math.ceil(-self.capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self._k = max(1, round(self._m / self.capacity * math.log(2)))
+        self._seen = bytearray((self._m + 7) // 8)
+        self._fetched = bytearray((self._m + 7) // 8)
+        self._len = 0
+        logger.info(
+            "BloomURLStore: capacity=%d, fp_rate=%g, %d hashes, %.1f MB",
+            self.capacity,
+            fp_rate,
+            self._k,
+            self.nbytes / (1024 * 1024),
+        )
+
+    def _positions(self, url: str) -> List[int]:
+        # double hachage (Kirsch-Mitzenmacher) à partir des deux moitiés de l'empreinte
+        fp = url_fingerprint(url)
+        h1, h2 = fp & 0xFFFFFFFF, (fp >> 32) | 1
+        m = self._m
+        return [(h1 + i * h2) % m for i in range(self._k)]
+
+    @staticmethod
+    def _test(bits: bytearray, positions: List[int]) -> bool:
+        for p in positions:
+            if not bits[p >> 3] & (1 << (p & 7)):
+                return False
+        return True
+
+    @staticmethod
+    def _set(bits: bytearray, positions: List[int]):
+        for p in positions:
+            bits[p >> 3] |= 1 << (p & 7)
+
+    def state(self, url: str) -> int:
+        pos = self._positions(url)
+        if self._test(self._fetched, pos):
+            return FETCHED
+        return QUEUED if self._test(self._seen, pos) else UNSEEN
+
+    def add(self, url: str) -> bool:
+        pos = self._positions(url)
+        if self._test(self._seen, pos):
+            return False
+        self._set(self._seen, pos)
+        self._len += 1
+        return True
+
+    def mark_fetched(self, url: str) -> bool:
+        pos = self._positions(url)
+        if self._test(self._fetched, pos):
+            return False
+        if not self._test(self._seen, pos):
+            self._set(self._seen, pos)
+            self._len += 1
+        self._set(self._fetched, pos)
+        return True
+
+    def is_fetched(self, url: str) -> bool:
+        return self._test(self._fetched, self._positions(url))
+
+    def __contains__(self, url: str) -> bool:
+        return self._test(self._seen, self._positions(url))
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._seen) + len(self._fetched)
+
+    def save(self, ckpt, name: str):
+        ckpt.json(f"{name}.meta", {"kind": "bloom", "m": self._m, "k": self._k, "len": self._len})
+        ckpt.section(f"{name}.seen", _byte_chunks(self._seen))
+        ckpt.section(f"{name}.fetched", _byte_chunks(self._fetched))
+
+    def load(self, ckpt, name: str):
+        meta = ckpt.json(f"{name}.meta")
+        if meta["kind"] != "bloom":
+            raise ValueError(f"Checkpoint has a {meta['kind']!r} URL store, config asks for 'bloom'")
+        if (meta["m"], meta["k"]) != (self._m, self._k):
+            raise ValueError("Bloom filter size changed since the checkpoint (bloom_capacity / bloom_fp_rate)")
+        self._seen = bytearray(ckpt.bytes(f"{name}.seen"))
+        self._fetched = bytearray(ckpt.bytes(f"{name}.fetched"))
+        self._len = meta["len"]
+
+
+def build_url_store(cfg: FrontierConfig):
+    """
+    Store d'URLs vues selon la config : "hash" (exact, défaut) ou "bloom".
+    """
+    if cfg.seen_store == "hash":
+        return URLStateStore()
+    if cfg.seen_store == "bloom":
+        return BloomURLStore(cfg.bloom_capacity, cfg.bloom_fp_rate)
+    raise ValueError(f"Unknown seen store: {cfg.seen_store}")
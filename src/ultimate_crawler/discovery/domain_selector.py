@@ -38,7 +38,7 @@ def build_seed_urls(cfg: JobConfig) -> List[str]:
     engine = DummySearchEngine()
     for lang in cfg.languages:
         for kw in cfg.keywords:
-            query = f"{kw}"
+            query = kw.rstrip("*")
             results: List[SearchResult] = engine.search(query, lang, num_results=20)
             for r in results:
                 domain = normalize_domain(r.url)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import multiprocessing as mp
+import os
 from pathlib import Path
 from typing import List
 import logging
@@ -14,14 +15,14 @@ from ..core.job_runner import JobRunner
 logger = logging.getLogger(__name__)
 
 
-def _run_shard(job_cfg: JobConfig, shard_id: int, seeds: List[str]) -> None:
+def _run_shard(job_cfg: JobConfig, shard_id: int, seeds: List[str], resume: bool = False) -> None:
     # On clone un output dir spécifique par shard
     shard_dir = Path(job_cfg.output.dir) / f"shard_{shard_id}"
     shard_cfg = job_cfg
     shard_cfg.output.dir = shard_dir  # type: ignore[attr-defined]
 
     logger.info("Shard %d: %d seeds -> %s", shard_id, len(seeds), shard_dir)
-    runner = JobRunner(shard_cfg)
+    runner = JobRunner(shard_cfg, resume=resume)
     runner.run(seeds)
 
 
@@ -35,7 +36,7 @@ def _split_list(xs: List[str], n: int) -> List[List[str]]:
     return out
 
 
-def run_distributed_job(job_cfg: JobConfig, num_workers: int) -> None:
+def run_distributed_job(job_cfg: JobConfig, num_workers: int, resume: bool = False) -> None:
     seeds = build_seed_urls(job_cfg)
     if not seeds:
         logger.warning("No seeds for distributed job.")
@@ -49,6 +50,10 @@ def run_distributed_job(job_cfg: JobConfig, num_workers: int) -> None:
         [len(s) for s in shards],
     )
 
+    # les cœurs sont partagés entre les shards (pools de parse du pipeline)
+    if job_cfg.pipeline.enabled and job_cfg.pipeline.parse_processes is None:
+        job_cfg.pipeline.parse_processes = max(0, ((os.cpu_count() or 1) - len(shards)) // len(shards))
+
     ctx = mp.get_context("spawn")
     procs: List[mp.Process] = []
 
@@ -57,7 +62,7 @@ def run_distributed_job(job_cfg: JobConfig, num_workers: int) -> None:
             continue
         p = ctx.Process(
             target=_run_shard,
-            args=(job_cfg, shard_id, shard_seeds),
+            args=(job_cfg, shard_id, shard_seeds, resume),
             daemon=False,
         )
         p.start()
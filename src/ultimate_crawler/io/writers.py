@@ -1,19 +1,31 @@
 # src/ultimate_crawler/io/writers.py
 
+import os
 from pathlib import Path
+from typing import Optional
 
 
 class RotatingJSONLWriter:
     """
     Implémentation simple : pour l'instant, pas de rotation,
     mais interface prête pour l'ajouter plus tard.
+
+    `resume_offset` (reprise sur checkpoint) : le fichier existant est
+    tronqué à cet offset puis complété, ce qui retire les lignes écrites
+    après le dernier checkpoint (leurs pages seront refetchées).
     """
 
-    def __init__(self, path: Path, max_bytes: int = 2_000_000_000):
+    def __init__(self, path: Path, max_bytes: int = 2_000_000_000, resume_offset: Optional[int] = None):
         self.base_path = path
         self.max_bytes = max_bytes
         self.current_path = self.base_path
-        self._f = self.current_path.open("w", encoding="utf-8")
+        if resume_offset is not None and self.current_path.exists():
+            os.truncate(self.current_path, resume_offset)
+            self._f = self.current_path.open("a", encoding="utf-8", newline="")
+            self._offset = resume_offset
+        else:
+            self._f = self.current_path.open("w", encoding="utf-8", newline="")
+            self._offset = 0
         self._written_bytes = 0
 
     def write(self, s: str):
@@ -21,11 +33,21 @@ class RotatingJSONLWriter:
         if self._written_bytes + len(b) > self.max_bytes:
             # rotation (base.jsonl.1, .2, etc.) si besoin
             self._f.close()
-            self._f = self.current_path.open("a", encoding="utf-8")
+            self._f = self.current_path.open("a", encoding="utf-8", newline="")
             self._written_bytes = 0
 
         self._f.write(s)
         self._written_bytes += len(b)
+        self._offset += len(b)
+
+    def sync(self) -> int:
+        """
+        Force l'écriture sur disque et rend l'offset (octets) du fichier,
+        à enregistrer dans le checkpoint.
+        """
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        return self._offset
 
     def close(self):
         if not self._f.closed:
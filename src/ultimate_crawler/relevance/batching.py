@@ -0,0 +1,99 @@
+# src/ultimate_crawler/relevance/batching.py
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Regroupe les appels concurrents à score(text) en batchs : un thread
+    dédié collecte les textes jusqu'à `batch_size` ou jusqu'à `max_wait`
+    secondes après le premier, appelle `fn` une seule fois sur le batch
+    (un seul encode, produits matriciels pleins) puis rend son score à
+    chaque appelant.
+
+    Les appelants (threads du stage de score) restent bloqués pendant
+    ce temps : il en faut au moins `batch_size` pour remplir un batch.
+    `fn` n'est appelée que depuis le thread du batcher.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[List[str]], List[float]],
+        batch_size: int = 32,
+        max_wait: float = 0.01,
+        name: str = "batcher",
+    ):
+        self.fn = fn
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait
+        self.batches = 0
+        self.items = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def score(self, text: str) -> float:
+        fut: Future = Future()
+        self._queue.put((text, fut))
+        return fut.result()
+
+    def _loop(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._run(batch)
+            if stop:
+                return
+
+    def _run(self, batch: List[Tuple[str, Future]]):
+        try:
+            scores = self.fn([text for text, _ in batch])
+        except Exception as e:
+            for _, fut in batch:
+                fut.set_exception(e)
+            return
+        self.batches += 1
+        self.items += len(batch)
+        for (_, fut), score in zip(batch, scores):
+            fut.set_result(score)
+
+    @property
+    def mean_batch(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._thread.join()
+        if self.batches:
+            logger.info(
+                "MicroBatcher %s: %d documents in %d batches (mean size %.1f)",
+                self._thread.name,
+                self.items,
+                self.batches,
+                self.mean_batch,
+            )
@@ -0,0 +1,141 @@
+# src/ultimate_crawler/relevance/cascade.py
+
+from __future__ import annotations
+
+import math
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+import logging
+
+from .batching import MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CascadeStage:
+    """
+    Un étage de la cascade : `score_batch` note une liste de textes.
+    Bande de confiance : score < `reject_below` -> rejet, score >=
+    `accept_at` -> acceptation, entre les deux (ou None) -> étage suivant.
+    """
+    name: str
+    score_batch: Callable[[List[str]], List[float]]
+    reject_below: Optional[float] = None
+    accept_at: Optional[float] = None
+
+
+class CascadeRelevanceFilter:
+    """
+    Scoreurs en cascade, du moins cher au plus cher (ex : mots-clés ->
+    ClfDoc -> embedding). Chaque étage rend une décision anticipée sur
+    les documents hors de sa bande de confiance ; seuls les documents
+    indécis passent à l'étage suivant. Le dernier étage tranche sur le
+    seuil de pertinence (ses bandes sont ignorées).
+
+    Score rendu :
+      - sortie anticipée : le score de l'étage, ramené du bon côté du
+        seuil (acceptée >= seuil, rejetée < seuil) ;
+      - dernier étage : si l'embedding et ClfDoc ont tous deux noté le
+        document, alpha * embedding + (1 - alpha) * clfdoc (comme
+        HybridRelevanceFilter), sinon le score du dernier étage.
+
+    `exits` compte les sorties par étage (<étage>:accept / <étage>:reject,
+    <étage>:final pour le dernier). Avec `batch_size` > 1, les appels
+    concurrents à score() passent la cascade ensemble (MicroBatcher) :
+    un appel par étage et par batch, sur les seuls survivants.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[CascadeStage],
+        threshold: float,
+        alpha: float = 0.5,
+        batch_size: int = 1,
+        max_wait: float = 0.01,
+        closers: Sequence[Callable[[], None]] = (),
+    ):
+        if not stages:
+            raise ValueError("Cascade relevance filter needs at least one stage.")
+        self.stages = list(stages)
+        self.threshold = threshold
+        self.alpha = alpha
+        self.exits: Counter = Counter()
+        self._closers = list(closers)
+        self._lock = threading.Lock()
+        self.batch_size = max(1, batch_size)
+        self._batcher: Optional[MicroBatcher] = None
+        if self.batch_size > 1:
+            self._batcher = MicroBatcher(self.score_batch, self.batch_size, max_wait, name="cascade-batcher")
+        logger.info(
+            "CascadeRelevanceFilter initialized: %s (threshold=%.2f)",
+            " -> ".join(
+                f"{s.name}[{s.reject_below}, {s.accept_at}]" if i < len(self.stages) - 1 else s.name
+                for i, s in enumerate(self.stages)
+            ),
+            threshold,
+        )
+
+    def score(self, text: str) -> float:
+        if self._batcher is not None:
+            return self._batcher.score(text)
+        return self.score_batch([text])[0]
+
+    def _final(self, seen: Dict[str, float], last: float) -> float:
+        if "embedding" in seen and "clfdoc" in seen:
+            return self.alpha * seen["embedding"] + (1.0 - self.alpha) * seen["clfdoc"]
+        return last
+
+    def score_batch(self, texts: List[str]) -> List[float]:
+        scores = [0.0] * len(texts)
+        seen: List[Dict[str, float]] = [{} for _ in texts]
+        pending = list(range(len(texts)))
+        exits: Counter = Counter()
+        below = math.nextafter(self.threshold, -math.inf)
+
+        for pos, stage in enumerate(self.stages):
+            if not pending:
+                break
+            stage_scores = stage.score_batch([texts[i] for i in pending])
+            last = pos == len(self.stages) - 1
+            undecided = []
+            for i, s in zip(pending, stage_scores):
+                seen[i][stage.name] = s
+                if last:
+                    scores[i] = self._final(seen[i], s)
+                    exits[f"{stage.name}:final"] += 1
+                elif stage.reject_below is not None and s < stage.reject_below:
+                    scores[i] = min(s, below)
+                    exits[f"{stage.name}:reject"] += 1
+                elif stage.accept_at is not None and s >= stage.accept_at:
+                    scores[i] = max(s, self.threshold)
+                    exits[f"{stage.name}:accept"] += 1
+                else:
+                    undecided.append(i)
+            pending = undecided
+
+        logger.debug("Cascade exits for %d texts: %s", len(texts), dict(exits))
+        with self._lock:
+            self.exits.update(exits)
+        return scores
+
+    def summary(self) -> str:
+        with self._lock:
+            total = sum(self.exits.values())
+            if not total:
+                return "none"
+            parts = []
+            for stage in self.stages:
+                for kind in ("accept", "reject", "final"):
+                    n = self.exits.get(f"{stage.name}:{kind}", 0)
+                    if n:
+                        parts.append(f"{stage.name}:{kind}={n} ({100.0 * n / total:.1f}%)")
+            return ", ".join(parts)
+
+    def close(self):
+        if self._batcher is not None:
+            self._batcher.close()
+        for close in self._closers:
+            close()
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from typing import List, Optional
 import logging
 
+from .batching import MicroBatcher
 from .embedding_model import EmbeddingRelevanceModel
 from .clfdoc_model import ClfDocModel
 
@@ -14,6 +16,8 @@ class HybridRelevanceFilter:
     """
     Combine un score d'embedding (similarité) et un score ClfDoc (P(wine|text)).
     score_final = alpha * embedding + (1 - alpha) * clfdoc
+    Avec `batch_size` > 1, les appels concurrents à score() sont notés
+    ensemble (MicroBatcher) : un encode et un predict_proba par batch.
     """
 
     def __init__(
@@ -21,10 +25,16 @@ class HybridRelevanceFilter:
         emb_model: EmbeddingRelevanceModel,
         clfdoc_model: ClfDocModel,
         alpha: float = 0.5,
+        batch_size: int = 1,
+        max_wait: float = 0.01,
     ):
         self.emb_model = emb_model
         self.clfdoc_model = clfdoc_model
         self.alpha = alpha
+        self.batch_size = max(1, batch_size)
+        self._batcher: Optional[MicroBatcher] = None
+        if self.batch_size > 1:
+            self._batcher = MicroBatcher(self.score_batch, self.batch_size, max_wait, name="hybrid-batcher")
         logger.info(
             "HybridRelevanceFilter initialized with alpha=%.2f (embedding) / %.2f (clfdoc)",
             alpha,
@@ -32,6 +42,8 @@ class HybridRelevanceFilter:
         )
 
     def score(self, text: str) -> float:
+        if self._batcher is not None:
+            return self._batcher.score(text)
         se = self.emb_model.score(text)
         sc = self.clfdoc_model.score(text)
         final = self.alpha * se + (1.0 - self.alpha) * sc
@@ -42,3 +54,13 @@ class HybridRelevanceFilter:
             final,
         )
         return final
+
+    def score_batch(self, texts: List[str]) -> List[float]:
+        emb = self.emb_model.score_batch(texts)
+        clf = self.clfdoc_model.score_batch(texts)
+        return [self.alpha * se + (1.0 - self.alpha) * sc for se, sc in zip(emb, clf)]
+
+    def close(self):
+        if self._batcher is not None:
+            self._batcher.close()
+        self.emb_model.close()
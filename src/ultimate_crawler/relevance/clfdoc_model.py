@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 import logging
 
 import joblib
@@ -50,14 +50,25 @@ class ClfDocModel:
         """
         if not text:
             return 0.0
+        return self.score_batch([text])[0]
 
-        X = self.vectorizer.transform([text])
+    def score_batch(self, texts: List[str]) -> List[float]:
+        """
+        Comme score(), pour plusieurs textes : une seule vectorisation et
+        un seul appel au modèle (0.0 pour un texte vide).
+        """
+        scores = [0.0] * len(texts)
+        idx = [i for i, text in enumerate(texts) if text]
+        if not idx:
+            return scores
+
+        X = self.vectorizer.transform([texts[i] for i in idx])
 
         # cas standard : modèle probabiliste
         if hasattr(self.model, "predict_proba") and self.classes_ is not None:
-            proba = self.model.predict_proba(X)[0]
+            proba = self.model.predict_proba(X)
             try:
-                idx = self.classes_.index(self.cfg.positive_label)
+                col = proba[:, self.classes_.index(self.cfg.positive_label)]
             except ValueError:
                 # label absent => on prend la plus haute proba
                 logger.warning(
@@ -65,15 +76,16 @@ class ClfDocModel:
                     self.cfg.positive_label,
                     self.classes_,
                 )
-                return float(np.max(proba))
-            return float(proba[idx])
-
+                col = np.max(proba, axis=1)
         # fallback : décision binaire de type SVM
-        if hasattr(self.model, "decision_function"):
-            df = self.model.decision_function(X)[0]
+        elif hasattr(self.model, "decision_function"):
+            df = np.ravel(self.model.decision_function(X))
             # squashing -> [0,1] via logistic
-            s = float(1.0 / (1.0 + np.exp(-df)))
-            return s
+            col = 1.0 / (1.0 + np.exp(-df))
+        else:
+            logger.warning("Model has no predict_proba or decision_function, returning 0.5.")
+            col = np.full(len(idx), 0.5)
 
-        logger.warning("Model has no predict_proba or decision_function, returning 0.5.")
-        return 0.5
+        for i, s in zip(idx, col):
+            scores[i] = float(s)
+        return scores
@@ -0,0 +1,298 @@
+# src/ultimate_crawler/relevance/embedding_cache.py
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import struct
+import threading
+from collections import OrderedDict
+from hashlib import blake2b
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import logging
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou, un seul process doit écrire
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# une entrée d'index : empreinte du snippet, segment, ligne
+INDEX_RECORD = struct.Struct("<QII")
+
+# taille visée d'un segment (l'éviction se fait segment par segment)
+SEGMENT_BYTES = 64 * 1024 * 1024
+
+
+def _slug(model_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", model_name).strip("_") or "model"
+
+
+class EmbeddingCache:
+    """
+    Cache persistant d'embeddings, partagé entre runs, par modèle
+    (<cache_dir>/<modèle>/) et indexé par une empreinte 64 bits
+    (blake2b) du nom du modèle et du snippet normalisé.
+
+    - vecteurs en float16, dans des segments append-only
+      (seg_000001.f16...) relus par memmap ;
+    - index append-only (index.bin : empreinte, segment, ligne), rechargé
+      en mémoire à l'ouverture ; les enregistrements incomplets (crash)
+      sont ignorés ;
+    - LRU en mémoire devant les segments (`lru_entries` vecteurs) ;
+    - au-delà de `max_mb`, les segments les plus anciens sont supprimés
+      (et l'index réécrit sans leurs entrées).
+
+    Un seul process écrit (verrou sur le répertoire) : les autres (shards)
+    lisent le cache tel qu'il était à leur ouverture, sans y ajouter.
+    Les vecteurs rendus sont toujours passés par float16, qu'ils
+    viennent du cache ou du modèle : un score ne dépend pas d'un hit.
+    """
+
+    def __init__(self, cache_dir: str, model_name: str, max_mb: float = 2048.0, lru_entries: int = 10_000):
+        self.model_name = model_name
+        self.dir = Path(cache_dir) / _slug(model_name)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.lru_entries = max(0, lru_entries)
+        self._lru: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._index: Dict[int, int] = {}  # empreinte -> segment << 32 | ligne
+        self._maps: Dict[int, np.memmap] = {}
+        self._segments: List[int] = []
+        self._lock = threading.Lock()
+        self.dim: Optional[int] = None
+        self.rows_per_segment = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._lock_file = open(self.dir / "lock", "a+b")
+        self.read_only = False
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                self.read_only = True
+                logger.info("Embedding cache %s is used by another process, opening it read-only", self.dir)
+
+        meta_path = self.dir / "meta.json"
+        if meta_path.is_file():
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            self.dim = meta["dim"]
+            self.rows_per_segment = meta["rows_per_segment"]
+        self._segments = sorted(
+            int(p.stem.split("_")[1]) for p in self.dir.glob("seg_*.f16")
+        )
+        self._load_index()
+
+        self._index_f = None
+        self._seg_f = None
+        self._active_rows = 0
+        if not self.read_only:
+            self._index_f = open(self.dir / "index.bin", "ab")
+        logger.info(
+            "Embedding cache %s: %d vectors in %d segments (%.1f MB)%s",
+            self.dir,
+            len(self._index),
+            len(self._segments),
+            self.nbytes / (1024 * 1024),
+            " [read-only]" if self.read_only else "",
+        )
+
+    # ------------------------------------------------------------------
+    # fichiers
+
+    def _seg_path(self, seg: int) -> Path:
+        return self.dir / f"seg_{seg:06d}.f16"
+
+    @property
+    def _row_bytes(self) -> int:
+        return (self.dim or 0) * 2
+
+    def _seg_rows(self, seg: int) -> int:
+        try:
+            return self._seg_path(seg).stat().st_size // self._row_bytes
+        except FileNotFoundError:
+            return 0
+
+    @property
+    def nbytes(self) -> int:
+        total = 0
+        for seg in self._segments:
+            try:
+                total += self._seg_path(seg).stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def _load_index(self):
+        path = self.dir / "index.bin"
+        if not path.is_file() or self.dim is None:
+            return
+        rows = {seg: self._seg_rows(seg) for seg in self._segments}
+        data = path.read_bytes()
+        usable = len(data) - len(data) % INDEX_RECORD.size
+        for fp, seg, row in INDEX_RECORD.iter_unpack(data[:usable]):
+            # ligne jamais écrite (crash) ou segment évincé
+            if row < rows.get(seg, 0):
+                self._index[fp] = seg << 32 | row
+        if usable != len(data) and not self.read_only:
+            os.truncate(path, usable)
+
+    def _write_meta(self):
+        tmp = self.dir / f"meta.json.tmp{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"model": self.model_name, "dim": self.dim, "dtype": "float16",
+                 "rows_per_segment": self.rows_per_segment},
+                f,
+            )
+        os.replace(tmp, self.dir / "meta.json")
+
+    def _map(self, seg: int) -> Optional[np.memmap]:
+        m = self._maps.get(seg)
+        if m is None or (seg == self._active_segment and len(m) < self._active_rows):
+            rows = self._seg_rows(seg)
+            if rows == 0:
+                return None
+            m = np.memmap(self._seg_path(seg), dtype=np.float16, mode="r", shape=(rows, self.dim))
+            self._maps[seg] = m
+        return m
+
+    @property
+    def _active_segment(self) -> int:
+        return self._segments[-1] if self._segments else 0
+
+    def _roll(self):
+        """
+        Ouvre un nouveau segment, puis évince les plus anciens si la
+        taille max est dépassée.
+        """
+        if self._seg_f is not None:
+            self._seg_f.close()
+        seg = self._active_segment + 1
+        self._segments.append(seg)
+        self._seg_f = open(self._seg_path(seg), "ab")
+        self._active_rows = 0
+        self._evict()
+
+    def _evict(self):
+        evicted = []
+        while len(self._segments) > 1 and self.nbytes + self.rows_per_segment * self._row_bytes > self.max_bytes:
+            seg = self._segments.pop(0)
+            self._maps.pop(seg, None)
+            self._seg_path(seg).unlink(missing_ok=True)
+            evicted.append(seg)
+        if not evicted:
+            return
+        gone = set(evicted)
+        self._index = {fp: loc for fp, loc in self._index.items() if loc >> 32 not in gone}
+        # index compacté, réécrit de façon atomique
+        self._index_f.close()
+        tmp = self.dir / f"index.bin.tmp{os.getpid()}"
+        with open(tmp, "wb") as f:
+            for fp, loc in self._index.items():
+                f.write(INDEX_RECORD.pack(fp, loc >> 32, loc & 0xFFFFFFFF))
+        os.replace(tmp, self.dir / "index.bin")
+        self._index_f = open(self.dir / "index.bin", "ab")
+        logger.info("Embedding cache: evicted %d segments, %d vectors left", len(evicted), len(self._index))
+
+    # ------------------------------------------------------------------
+    # API
+
+    def key(self, snippet: str) -> int:
+        h = blake2b(digest_size=8)
+        h.update(self.model_name.encode("utf-8"))
+        h.update(b"\0")
+        h.update(snippet.encode("utf-8"))
+        return int.from_bytes(h.digest(), "little")
+
+    def _remember(self, fp: int, vec: np.ndarray):
+        if not self.lru_entries:
+            return
+        self._lru[fp] = vec
+        self._lru.move_to_end(fp)
+        if len(self._lru) > self.lru_entries:
+            self._lru.popitem(last=False)
+
+    def get_many(self, keys: Sequence[int]) -> List[Optional[np.ndarray]]:
+        """
+        Vecteurs (float32) des empreintes `keys`, None pour les absents.
+        """
+        out: List[Optional[np.ndarray]] = []
+        with self._lock:
+            for fp in keys:
+                vec = self._lru.get(fp)
+                if vec is not None:
+                    self._lru.move_to_end(fp)
+                else:
+                    loc = self._index.get(fp)
+                    if loc is not None:
+                        m = self._map(loc >> 32)
+                        row = loc & 0xFFFFFFFF
+                        if m is not None and row < len(m):
+                            vec = np.asarray(m[row], dtype=np.float32)
+                            self._remember(fp, vec)
+                if vec is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                out.append(vec)
+        return out
+
+    def put_many(self, keys: Sequence[int], vecs: np.ndarray) -> np.ndarray:
+        """
+        Ajoute les vecteurs au cache et les rend tels qu'ils seront relus
+        (arrondis en float16, en float32).
+        """
+        half = np.asarray(vecs, dtype=np.float16)
+        rounded = half.astype(np.float32)
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(half.shape[1])
+                self.rows_per_segment = max(1024, min(SEGMENT_BYTES, self.max_bytes // 4) // self._row_bytes)
+                if not self.read_only:
+                    self._write_meta()
+            elif half.shape[1] != self.dim:
+                raise ValueError(f"Embedding dim {half.shape[1]} != {self.dim} in cache {self.dir}")
+
+            for fp, row_vec, vec in zip(keys, half, rounded):
+                self._remember(fp, vec)
+                if self.read_only or fp in self._index:
+                    continue
+                if self._seg_f is None or self._active_rows >= self.rows_per_segment:
+                    self._roll()
+                self._seg_f.write(row_vec.tobytes())
+                self._index[fp] = self._active_segment << 32 | self._active_rows
+                self._index_f.write(INDEX_RECORD.pack(fp, self._active_segment, self._active_rows))
+                self._active_rows += 1
+            if not self.read_only and self._seg_f is not None:
+                # données avant index : une entrée d'index pointe toujours sur une ligne écrite
+                self._seg_f.flush()
+                self._index_f.flush()
+        return rounded
+
+    def close(self):
+        with self._lock:
+            if self._seg_f is not None:
+                self._seg_f.close()
+                self._seg_f = None
+            if self._index_f is not None:
+                self._index_f.close()
+                self._index_f = None
+            self._maps.clear()
+        self._lock_file.close()
+        total = self.hits + self.misses
+        if total:
+            logger.info(
+                "Embedding cache: %d hits / %d lookups (%.1f%%), %d vectors stored",
+                self.hits,
+                total,
+                100.0 * self.hits / total,
+                len(self._index),
+            )
@@ -1,15 +1,34 @@
 # src/ultimate_crawler/relevance/embedding_filter.py
 
+from typing import List, Optional
+
+from .batching import MicroBatcher
 from .embedding_model import EmbeddingRelevanceModel
 
 
 class EmbeddingRelevanceFilter:
     """
     Filtre de pertinence basé sur similarité cosinus via EmbeddingRelevanceModel.
+    Avec `batch_size` > 1, les appels concurrents à score() sont encodés
+    ensemble (MicroBatcher).
     """
 
-    def __init__(self, model: EmbeddingRelevanceModel):
+    def __init__(self, model: EmbeddingRelevanceModel, batch_size: int = 1, max_wait: float = 0.01):
         self.model = model
+        self.batch_size = max(1, batch_size)
+        self._batcher: Optional[MicroBatcher] = None
+        if self.batch_size > 1:
+            self._batcher = MicroBatcher(model.score_batch, self.batch_size, max_wait, name="embedding-batcher")
 
     def score(self, text: str) -> float:
+        if self._batcher is not None:
+            return self._batcher.score(text)
         return self.model.score(text)
+
+    def score_batch(self, texts: List[str]) -> List[float]:
+        return self.model.score_batch(texts)
+
+    def close(self):
+        if self._batcher is not None:
+            self._batcher.close()
+        self.model.close()
@@ -1,33 +1,100 @@
 # src/ultimate_crawler/relevance/embedding_model.py
 
-from typing import List
+from typing import List, Optional
 import numpy as np
-from sentence_transformers import SentenceTransformer
 import logging
 
+from .embedding_cache import EmbeddingCache
+
 logger = logging.getLogger(__name__)
 
 
+def snippet_of(text: str) -> str:
+    """
+    Partie du texte encodée : 3000 premiers caractères, espaces
+    normalisés (ce que verrait le tokenizer, et la clé du cache).
+    """
+    return " ".join(text[:3000].split())
+
+
 class EmbeddingRelevanceModel:
     """
     Wrap de SentenceTransformer pour calcul de similarité
     texte <-> requête mots-clés.
+    Avec un EmbeddingCache, seuls les snippets jamais vus sont encodés :
+    les vecteurs des documents ne dépendent pas des mots-clés, un
+    changement de requête ou de seuil ne réencode rien.
+    `encoder` : autre backend avec la même méthode encode() (ex :
+    OnnxSentenceEncoder) ; par défaut SentenceTransformer (torch).
     """
 
-    def __init__(self, model_name: str, keywords: List[str]):
+    def __init__(
+        self,
+        model_name: str,
+        keywords: List[str],
+        cache: Optional[EmbeddingCache] = None,
+        encoder=None,
+    ):
         if not model_name:
             raise ValueError("embedding_model_name must be set in config for embedding mode.")
-        logger.info("Loading SentenceTransformer model: %s", model_name)
-        self.model = SentenceTransformer(model_name)
-        query = " ".join(keywords)
+        if encoder is None:
+            # import ici : torch n'est chargé que pour ce backend
+            from sentence_transformers import SentenceTransformer
+
+            logger.info("Loading SentenceTransformer model: %s", model_name)
+            encoder = SentenceTransformer(model_name)
+        self.model = encoder
+        self.cache = cache
+        query = " ".join(k.rstrip("*") for k in keywords)
         logger.info("Building query embedding from keywords=%s", keywords)
         self.query_vec = self.model.encode(query, normalize_embeddings=True)
 
     def score(self, text: str) -> float:
         if not text:
             return 0.0
-        snippet = text[:3000]
-        vec = self.model.encode(snippet, normalize_embeddings=True)
-        sim = float(np.dot(self.query_vec, vec))
+        sim = self.score_batch([text])[0]
         logger.debug("Embedding similarity score=%f", sim)
         return sim
+
+    def score_batch(self, texts: List[str]) -> List[float]:
+        """
+        Comme score(), pour plusieurs textes encodés en un seul appel
+        (0.0 pour un texte vide).
+        """
+        scores = [0.0] * len(texts)
+        idx = [i for i, text in enumerate(texts) if text]
+        if not idx:
+            return scores
+        vecs = self.embed([snippet_of(texts[i]) for i in idx])
+        sims = vecs @ self.query_vec
+        for i, sim in zip(idx, sims):
+            scores[i] = float(sim)
+        logger.debug("Embedding similarity scores for %d texts", len(idx))
+        return scores
+
+    def _encode(self, snippets: List[str]) -> np.ndarray:
+        return np.asarray(self.model.encode(snippets, batch_size=len(snippets), normalize_embeddings=True))
+
+    def embed(self, snippets: List[str]) -> np.ndarray:
+        """
+        Vecteurs normalisés des snippets, depuis le cache si possible ;
+        les manquants sont encodés en un seul appel puis mis en cache.
+        """
+        if self.cache is None:
+            return self._encode(snippets)
+        keys = [self.cache.key(s) for s in snippets]
+        found = self.cache.get_many(keys)
+        # doublons dans le batch : encodés une fois
+        missing = {}
+        for key, snippet, vec in zip(keys, snippets, found):
+            if vec is None:
+                missing.setdefault(key, snippet)
+        if missing:
+            fresh = self.cache.put_many(list(missing), self._encode(list(missing.values())))
+            by_key = dict(zip(missing, fresh))
+            found = [by_key[key] if vec is None else vec for key, vec in zip(keys, found)]
+        return np.vstack(found)
+
+    def close(self):
+        if self.cache is not None:
+            self.cache.close()
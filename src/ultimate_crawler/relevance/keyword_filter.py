@@ -1,34 +1,54 @@
 # src/ultimate_crawler/relevance/keyword_filter.py
 
-from typing import List
+from typing import Dict, List
 import logging
 
+from .keyword_matcher import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
+# longueur minimale (caractères) pour la normalisation : une occurrence
+# dans un texte court ne donne pas un score plein
+MIN_NORM_CHARS = 1000
+
 
 class KeywordRelevanceFilter:
     """
-    Filtre basique par mots-clés :
-    score = nb_occurrences_normalisées (0..1)
+    Filtre basique par mots-clés (KeywordMatcher : frontières de mots
+    selon l'écriture, pluriels en -s ; une regex par mot-clé jusqu'à
+    REGEX_MAX_KEYWORDS mots-clés, donc un passage par mot-clé, puis un
+    automate d'Aho-Corasick en un seul passage au-delà) :
+    score = occurrences pour 1000 caractères / `saturation`, borné à 1
+    (texte compté pour au moins MIN_NORM_CHARS caractères).
     """
 
-    def __init__(self, keywords: List[str]):
-        self.keywords = [k.lower() for k in keywords]
-        logger.info("KeywordRelevanceFilter initialized with keywords=%s", self.keywords)
-
-    def score(self, text: str) -> float:
+    def __init__(self, keywords: List[str], saturation: float = 5.7):
+        self.matcher = KeywordMatcher(keywords)
+        self.keywords = self.matcher.keywords
+        self.saturation = saturation
+        logger.info(
+            "KeywordRelevanceFilter initialized with %d keywords (%s engine), saturation=%.1f/1000 chars",
+            len(self.keywords),
+            self.matcher.engine,
+            saturation,
+        )
+
+    def counts(self, text: str) -> Dict[str, int]:
+        return self.matcher.counts(text)
+
+    def density(self, text: str) -> float:
+        """
+        Occurrences pour 1000 caractères.
+        """
         if not text:
             return 0.0
-        t = text.lower()
-        total_len = len(t)
-        if total_len == 0:
-            return 0.0
-
-        count = 0
-        for kw in self.keywords:
-            c = t.count(kw)
-            count += c
+        return 1000.0 * sum(self.matcher.count_ids(text)) / max(len(text), MIN_NORM_CHARS)
 
-        score = min(1.0, count / 10.0)
-        logger.debug("Keyword score=%f (count=%d)", score, count)
+    def score(self, text: str) -> float:
+        density = self.density(text)
+        score = min(1.0, density / self.saturation)
+        logger.debug("Keyword score=%f (%.2f/1000 chars)", score, density)
         return score
+
+    def score_batch(self, texts: List[str]) -> List[float]:
+        return [self.score(text) for text in texts]
@@ -0,0 +1,198 @@
+# src/ultimate_crawler/relevance/keyword_matcher.py
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# écritures sans espaces entre les mots : pas de frontière de mot exigée
+_UNSPACED_RANGES = (
+    (0x0E00, 0x0EFF),    # thaï, lao
+    (0x1000, 0x109F),    # birman
+    (0x1780, 0x17FF),    # khmer
+    (0x3040, 0x30FF),    # hiragana, katakana
+    (0x31F0, 0x31FF),    # katakana (extensions)
+    (0x3400, 0x4DBF),    # han (ext. A)
+    (0x4E00, 0x9FFF),    # han
+    (0xF900, 0xFAFF),    # han (compatibilité)
+    (0xFF66, 0xFF9F),    # katakana demi-chasse
+    (0x20000, 0x3FFFF),  # han (ext. B et suivantes)
+)
+
+
+# en dessous : une regex par mot-clé (recherche littérale en C), au-delà : l'automate
+REGEX_MAX_KEYWORDS = 64
+
+# caractère de mot d'une écriture à espaces, pour les regex (même règle que _is_word_char)
+_WORD_CHAR_RE = "[^\\W" + "".join(
+    f"\\U{lo:08x}-\\U{hi:08x}" for lo, hi in _UNSPACED_RANGES
+) + "]"
+
+
+def is_unspaced(ch: str) -> bool:
+    cp = ord(ch)
+    for lo, hi in _UNSPACED_RANGES:
+        if lo <= cp <= hi:
+            return True
+    return False
+
+
+def _is_word_char(ch: str) -> bool:
+    # lettre / chiffre d'une écriture à espaces : colle au mot-clé
+    return (ch.isalnum() or ch == "_") and not is_unspaced(ch)
+
+
+class KeywordMatcher:
+    """
+    Comptage de mots-clés (insensible à la casse) par un automate
+    d'Aho-Corasick, qui fait un seul passage sur le texte quel que soit
+    le nombre de mots-clés, ou par une regex par mot-clé (voir `engine`).
+
+    Frontières selon l'écriture, de chaque côté du mot-clé :
+      - bord en écriture à espaces (latin, cyrillique, grec, arabe,
+        hangul...) : le caractère voisin ne doit pas être une lettre ou
+        un chiffre d'une écriture à espaces ("vin" ne trouve ni "vinyl"
+        ni "divine", mais trouve "vin," et "(vin)") ;
+      - bord en écriture sans espaces (han, kana, thaï...) : aucune
+        contrainte (葡萄酒 est trouvé dans 这款葡萄酒很好).
+    Avec `plurals`, un "s" final est toléré avant la frontière droite :
+    "vin" trouve "vins", "wine" "wines", "vino" "vinos" (pluriels
+    fr / en / es), sans trouver "vinyl" ni "wineries".
+    Un mot-clé terminé par "*" est un préfixe : pas de frontière à droite
+    ("vin*" trouve "vins", "vinification").
+    Les occurrences qui se chevauchent sont toutes comptées, chacune
+    pour son mot-clé.
+
+    `engine` : "automaton", "regex" (une regex compilée par mot-clé,
+    commençant par le littéral : recherche rapide en C, meilleure sur
+    quelques mots-clés, mais un passage sur le texte par mot-clé) ou
+    "auto" (regex jusqu'à REGEX_MAX_KEYWORDS mots-clés, automate
+    au-delà : "auto" n'est donc un seul passage qu'au-delà de ce seuil).
+    Mêmes comptes dans les deux cas.
+    """
+
+    def __init__(self, keywords: Sequence[str], engine: str = "auto", plurals: bool = True):
+        if engine not in ("auto", "automaton", "regex"):
+            raise ValueError(f"Unknown keyword matcher engine: {engine}")
+        self.keywords: List[str] = []
+        self.plurals = plurals
+        # par motif : (mot-clé, longueur, frontière gauche, frontière droite)
+        self._patterns: List[Tuple[int, int, bool, bool]] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self._words: List[Tuple[int, str, bool, bool]] = []
+
+        index: Dict[str, int] = {}
+        for raw in keywords:
+            kw = raw.strip().lower()
+            prefix = kw.endswith("*")
+            word = kw.rstrip("*").strip()
+            if not word:
+                continue
+            if kw not in index:
+                index[kw] = len(self.keywords)
+                self.keywords.append(kw)
+            self._add(word, index[kw], _is_word_char(word[0]), _is_word_char(word[-1]) and not prefix)
+        self._build()
+
+        if engine == "auto":
+            engine = "regex" if len(self._patterns) <= REGEX_MAX_KEYWORDS else "automaton"
+        self.engine = engine
+        self._regexes: Optional[List[Tuple[int, "re.Pattern[str]"]]] = None
+        if engine == "regex":
+            self._regexes = [
+                (kw_id, self._compile(word, left, right, plurals))
+                for kw_id, word, left, right in self._words
+            ]
+
+    def _add(self, word: str, kw_id: int, left: bool, right: bool):
+        state = 0
+        for ch in word:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] += (len(self._patterns),)
+        self._patterns.append((kw_id, len(word), left, right))
+        self._words.append((kw_id, word, left, right))
+
+    @staticmethod
+    def _compile(word: str, left: bool, right: bool, plurals: bool) -> "re.Pattern[str]":
+        lit = re.escape(word)
+        # frontière gauche vérifiée après le littéral (lookbehind sur
+        # caractère + mot) : la regex commence par le littéral
+        rx = lit + (f"(?<!{_WORD_CHAR_RE}{lit})" if left else "")
+        if right:
+            rx += ("s?" if plurals else "") + f"(?!{_WORD_CHAR_RE})"
+        if any(word[:k] == word[-k:] for k in range(1, len(word))):
+            # le mot-clé peut chevaucher sa propre occurrence : recherche à chaque position
+            rx = f"(?=({rx}))"
+        return re.compile(rx)
+
+    def _build(self):
+        # liens d'échec en largeur ; sorties fusionnées le long des liens
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    @property
+    def states(self) -> int:
+        return len(self._goto)
+
+    def count_ids(self, text: str) -> List[int]:
+        """
+        Nombre d'occurrences de chaque mot-clé (dans l'ordre de
+        `keywords`) dans le texte mis en minuscules.
+        """
+        counts = [0] * len(self.keywords)
+        if not text or not self.keywords:
+            return counts
+        t = text.lower()
+        if self._regexes is not None:
+            for kw_id, rx in self._regexes:
+                counts[kw_id] += len(rx.findall(t))
+            return counts
+        n = len(t)
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self._patterns
+        plurals = self.plurals
+        root = goto[0]
+        state = 0
+        for i, ch in enumerate(t):
+            if state:
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+            else:
+                state = root.get(ch, 0)
+            if not state or not out[state]:
+                continue
+            for pid in out[state]:
+                kw_id, length, left, right = patterns[pid]
+                start = i - length + 1
+                if left and start > 0 and _is_word_char(t[start - 1]):
+                    continue
+                if right and i + 1 < n and _is_word_char(t[i + 1]):
+                    # pluriel : un "s" final, puis la frontière
+                    if not (plurals and t[i + 1] == "s" and (i + 2 == n or not _is_word_char(t[i + 2]))):
+                        continue
+                counts[kw_id] += 1
+        return counts
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """
+        Occurrences par mot-clé (seulement ceux présents).
+        """
+        return {kw: c for kw, c in zip(self.keywords, self.count_ids(text)) if c}
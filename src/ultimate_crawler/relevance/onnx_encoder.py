@@ -0,0 +1,140 @@
+# src/ultimate_crawler/relevance/onnx_encoder.py
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import List, Union
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# fichiers écrits par scripts/export_onnx_embedding.py à côté du modèle
+ENCODER_CONFIG = "encoder_config.json"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+class OnnxSentenceEncoder:
+    """
+    Encodeur de phrases sur ONNX Runtime (CPU), sans torch : même
+    interface encode() que SentenceTransformer pour ce qu'en utilise
+    EmbeddingRelevanceModel.
+
+    Le modèle est celui exporté (et quantifié en int8 dynamique) par
+    scripts/export_onnx_embedding.py : transformer -> last_hidden_state,
+    le mean pooling et la normalisation sont faits ici, comme dans le
+    modèle sentence-transformers d'origine.
+
+    Padding par paliers : les textes sont triés par nombre de tokens et
+    regroupés par palier (longueur arrondie au multiple de `pad_bucket`),
+    chaque batch est paddé à son palier : peu de tokens de padding, et
+    peu de formes d'entrée différentes pour le runtime.
+
+    `parity` : cosinus torch / ONNX mesurés par le script d'export
+    (encoder_config.json), None pour un modèle exporté autrement.
+    """
+
+    def __init__(self, model_path: str, threads: int = 0, pad_bucket: int = 16):
+        try:
+            import onnxruntime as ort  # type: ignore
+        except ImportError:
+            raise RuntimeError("onnxruntime is not installed. Run `pip install onnxruntime`.")
+        try:
+            from tokenizers import Tokenizer  # type: ignore
+        except ImportError:
+            raise RuntimeError("tokenizers is not installed. Run `pip install tokenizers`.")
+
+        path = Path(model_path)
+        model_dir = path.parent
+        with open(model_dir / ENCODER_CONFIG, "r", encoding="utf-8") as f:
+            enc_cfg = json.load(f)
+        if enc_cfg.get("pooling", "mean") != "mean":
+            raise ValueError(f"Unsupported pooling {enc_cfg['pooling']!r} in {model_dir / ENCODER_CONFIG}")
+        self.max_seq_length = int(enc_cfg["max_seq_length"])
+        self.pad_bucket = max(1, pad_bucket)
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.no_padding()
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            opts.intra_op_num_threads = threads
+            opts.inter_op_num_threads = 1
+        logger.info(
+            "Loading ONNX encoder %s (threads=%s, max_seq_length=%d, pad_bucket=%d)",
+            path,
+            threads or "auto",
+            self.max_seq_length,
+            self.pad_bucket,
+        )
+        self.session = ort.InferenceSession(os.fspath(path), sess_options=opts, providers=["CPUExecutionProvider"])
+        self._inputs = {i.name for i in self.session.get_inputs()}
+
+        # parité avec torch mesurée à l'export (cosinus des vecteurs)
+        self.parity = enc_cfg.get("parity", {}).get(path.name)
+        if self.parity is None:
+            logger.warning(
+                "No torch parity recorded for %s: check it with scripts/bench_onnx_embedding.py before use.", path
+            )
+        elif not self.parity.get("ok", False):
+            logger.warning("ONNX encoder %s failed its parity check at export: %s", path, self.parity)
+        else:
+            logger.info("ONNX encoder parity vs torch: %s", self.parity)
+
+    def _padded_length(self, n: int) -> int:
+        b = self.pad_bucket
+        return min(self.max_seq_length, -(-n // b) * b)
+
+    def _run(self, encodings) -> np.ndarray:
+        length = self._padded_length(max(len(e.ids) for e in encodings))
+        ids = np.zeros((len(encodings), length), dtype=np.int64)
+        mask = np.zeros((len(encodings), length), dtype=np.int64)
+        for row, enc in enumerate(encodings):
+            n = len(enc.ids)
+            ids[row, :n] = enc.ids
+            mask[row, :n] = enc.attention_mask
+        feeds = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self._inputs:
+            feeds["token_type_ids"] = np.zeros_like(ids)
+        hidden = self.session.run(None, feeds)[0]
+        # mean pooling sur les tokens réels
+        m = mask[:, :, None].astype(hidden.dtype)
+        return (hidden * m).sum(axis=1) / np.clip(m.sum(axis=1), 1e-9, None)
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        normalize_embeddings: bool = False,
+    ) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        batch_size = max(1, batch_size)
+
+        encodings = self.tokenizer.encode_batch(texts)
+        lengths = [self._padded_length(len(e.ids)) for e in encodings]
+        order = sorted(range(len(texts)), key=lengths.__getitem__)
+        # un batch = un palier de longueur, au plus batch_size textes
+        batches: List[List[int]] = []
+        for i in order:
+            if not batches or len(batches[-1]) >= batch_size or lengths[batches[-1][0]] != lengths[i]:
+                batches.append([])
+            batches[-1].append(i)
+
+        out = None
+        for idx in batches:
+            vecs = self._run([encodings[i] for i in idx])
+            if out is None:
+                out = np.empty((len(texts), vecs.shape[1]), dtype=np.float32)
+            out[idx] = vecs
+
+        if normalize_embeddings:
+            out /= np.clip(np.linalg.norm(out, axis=1, keepdims=True), 1e-12, None)
+        return out[0] if single else out
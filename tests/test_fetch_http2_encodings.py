@@ -0,0 +1,221 @@
+# tests/test_fetch_http2_encodings.py
+#
+# HTTP/2 (ALPN) et corps compressés brotli / zstd, du réseau jusqu'à
+# decode_body, pour les deux moteurs de fetch.
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import http.server
+import shutil
+import socket
+import subprocess
+import threading
+
+import pytest
+
+from ultimate_crawler.config.loader import CrawlerConfig
+from ultimate_crawler.crawl.fetcher import Fetcher
+
+brotli = pytest.importorskip("brotli")
+zstandard = pytest.importorskip("zstandard")
+
+HTML = "<html><head><title>Vin</title></head><body>" + "<p>Le vin de Bordeaux, élevé en fût de chêne.</p>" * 200 + "</body></html>"
+
+ENCODERS = {
+    "br": brotli.compress,
+    "zstd": lambda raw: zstandard.ZstdCompressor().compress(raw),
+}
+
+
+def make_cfg(**overrides) -> CrawlerConfig:
+    cfg = CrawlerConfig(
+        user_agent="UltimateScraper-tests",
+        request_timeout=10,
+        obey_robots_txt=False,
+        politeness_delay=0.0,
+    )
+    for key, value in overrides.items():
+        setattr(cfg, key, value)
+    return cfg
+
+
+def encoded_response(accept_encoding: str, path: str):
+    """
+    (corps, Content-Encoding) : le corps est compressé avec l'encodage
+    demandé par le chemin (/br, /zstd), s'il est annoncé par le client.
+    """
+    raw = HTML.encode("utf-8")
+    encoding = path.strip("/")
+    if encoding not in ENCODERS or encoding not in accept_encoding:
+        return raw, "identity"
+    return ENCODERS[encoding](raw), encoding
+
+
+# ---------------------------------------------------------------------------
+# moteur sync (requests / urllib3)
+
+
+class _EncodingHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body, encoding = encoded_response(self.headers.get("Accept-Encoding", ""), self.path)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def http1_server():
+    srv = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _EncodingHandler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.mark.parametrize("encoding", sorted(ENCODERS))
+def test_sync_fetcher_decodes_encoded_body(http1_server, encoding):
+    fetcher = Fetcher(make_cfg())
+    try:
+        assert encoding in fetcher.session.headers["Accept-Encoding"]
+        result = fetcher.fetch_result(f"{http1_server}/{encoding}")
+    finally:
+        fetcher.close()
+    assert result.status == 200
+    assert result.html == HTML
+
+
+# ---------------------------------------------------------------------------
+# moteur async (httpx)
+
+httpx = pytest.importorskip("httpx")
+
+
+@pytest.mark.parametrize("encoding", sorted(ENCODERS))
+def test_async_fetcher_decodes_encoded_body(monkeypatch, encoding):
+    from ultimate_crawler.crawl.async_fetcher import AsyncFetcher
+
+    seen = {}
+
+    def handler(request):
+        seen["accept_encoding"] = request.headers.get("Accept-Encoding", "")
+        body, content_encoding = encoded_response(seen["accept_encoding"], request.url.path)
+        return httpx.Response(
+            200,
+            headers={"Content-Type": "text/html; charset=utf-8", "Content-Encoding": content_encoding},
+            content=body,
+        )
+
+    monkeypatch.setattr(
+        httpx, "AsyncClient", functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(handler))
+    )
+    fetcher = AsyncFetcher(make_cfg())
+    try:
+        result = fetcher.fetch_result(f"http://mock.test/{encoding}")
+    finally:
+        fetcher.close()
+    assert encoding in seen["accept_encoding"]
+    assert result.status == 200
+    assert result.html == HTML
+
+
+async def _asgi_app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    headers = dict(scope["headers"])
+    body, encoding = encoded_response(headers.get(b"accept-encoding", b"").decode(), scope["path"])
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+            (b"content-type", b"text/html; charset=utf-8"),
+            (b"content-encoding", encoding.encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def h2_server(tmp_path):
+    """
+    Serveur HTTPS local (hypercorn, certificat autosigné) qui annonce h2
+    en ALPN.
+    """
+    pytest.importorskip("h2")
+    hypercorn_asyncio = pytest.importorskip("hypercorn.asyncio")
+    from hypercorn.config import Config
+
+    openssl = shutil.which("openssl")
+    if openssl is None:
+        pytest.skip("openssl is not installed")
+    cert, key = tmp_path / "cert.pem", tmp_path / "key.pem"
+    subprocess.run(
+        [openssl, "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-keyout", str(key), "-out", str(cert)],
+        check=True,
+        capture_output=True,
+    )
+
+    port = _free_port()
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.certfile, config.keyfile = str(cert), str(key)
+    config.alpn_protocols = ["h2", "http/1.1"]
+    config.accesslog = config.errorlog = None
+
+    loop = asyncio.new_event_loop()
+    started, stop = threading.Event(), None
+
+    def run():
+        nonlocal stop
+        asyncio.set_event_loop(loop)
+        stop = asyncio.Event()
+        loop.call_soon(started.set)
+        loop.run_until_complete(hypercorn_asyncio.serve(_asgi_app, config, shutdown_trigger=stop.wait))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait(10)
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            break
+        except OSError:
+            threading.Event().wait(0.05)
+    yield f"https://127.0.0.1:{port}"
+    loop.call_soon_threadsafe(stop.set)
+    thread.join(10)
+    loop.close()
+
+
+@pytest.mark.parametrize("encoding", sorted(ENCODERS))
+def test_async_fetcher_negotiates_http2(h2_server, encoding):
+    from ultimate_crawler.crawl.async_fetcher import AsyncFetcher
+
+    fetcher = AsyncFetcher(make_cfg(http2=True, tls_verify=False))
+    try:
+        results = [fetcher.fetch_result(f"{h2_server}/{encoding}") for _ in range(2)]
+        stats = fetcher.pool_stats
+    finally:
+        fetcher.close()
+    for result in results:
+        assert result.error is None
+        assert result.http_version == "HTTP/2"
+        assert result.html == HTML
+    # les deux requêtes passent par la même connexion
+    assert (stats.requests, stats.connections_opened) == (2, 1)